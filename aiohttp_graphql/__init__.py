@@ -1,17 +1,32 @@
 """aiohttp GraphQL view package."""
 
+import asyncio
 import json
+import sys
 from collections import Mapping
+from concurrent.futures import Executor
+from functools import partial
+from hashlib import sha1
 from inspect import isawaitable
-from typing import Any, Awaitable, Dict, Iterable, List, Optional, Type, Union, cast
-
-from aiohttp.web import Application, Request, Response
+from time import perf_counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
-try:
-    import graphene
-    from graphene import Schema as GrapheneSchema
-except ImportError:  # pragma: no cover
-    graphene = None
+from aiohttp.web import Application, Request, Response, StreamResponse
 
 from graphql import (
     DocumentNode,
@@ -21,6 +36,7 @@ from graphql import (
     GraphQLFieldResolver,
     GraphQLSchema,
     GraphQLTypeResolver,
+    OperationDefinitionNode,
     OperationType,
     execute,
     get_operation_ast,
@@ -28,12 +44,32 @@ from graphql import (
     validate,
     validate_schema,
 )
-from graphql.execution import Middleware
+from graphql.execution import Middleware, MiddlewareManager
 from graphql.pyutils import AwaitableOrValue
+from graphql.validation import ASTValidationRule, specified_rules
 
 from mypy_extensions import TypedDict
 
+from .cache import CachedDocument, DocumentCache, ResponseCache
+from .cache_control import CacheControlPolicy
+from .compression import ResponseCompression
+from .dataloader import DataLoader
+from .error import HttpQueryError
+from .incremental import (
+    close_incremental_results,
+    experimental_execute_incrementally,
+    is_incremental_results,
+    supports_incremental_delivery,
+    write_multipart_response,
+)
+from .limits import ConcurrencyLimiter
+from .metrics import GraphQLMetrics
+from .persisted import PersistedQueryStore, QueryAllowlist, query_hash
+from .subscriptions import GraphQLEventStreamHandler, GraphQLTransportWSHandler
+from .timeout import ExecutionDeadline, is_timed_out
 from .tools import GraphQLTool
+from .tracing import ApolloTracer, TraceCallback
+from .validation import CostModel, max_aliases_rule, max_cost_rule, max_depth_rule
 
 
 ResultDataSuccessType = TypedDict(
@@ -42,6 +78,32 @@ ResultDataSuccessType = TypedDict(
 ResultDataFailType = TypedDict("ResultDataFailType", {"errors": List[Dict[str, Any]]})
 ResultDataType = Union[ResultDataSuccessType, ResultDataFailType]
 
+T = TypeVar("T")
+
+CACHE_POLICY_KEY = "aiohttp_graphql.cache_policy"
+
+# document, operation, variables, operation name, tracer and start time of a
+# validated operation
+PreparedOperation = Tuple[
+    DocumentNode,
+    Optional[OperationDefinitionNode],
+    Dict[str, Any],
+    Optional[str],
+    Optional[ApolloTracer],
+    float,
+]
+
+
+def extend_middleware(middleware: Middleware, extra: List[Any]) -> Middleware:
+    """Return the middleware of an operation, with extra middleware outermost."""
+    if not extra:
+        return middleware
+    if middleware is None:
+        return extra
+    if isinstance(middleware, MiddlewareManager):
+        return MiddlewareManager(*middleware.middlewares, *extra)
+    return [*middleware, *extra]
+
 
 class GraphQLView:
     """GraphQL aiohttp view."""
@@ -57,6 +119,43 @@ class GraphQLView:
         pretty: bool = False,
         subscriptions: bool = False,
         tool: Optional[GraphQLTool] = None,
+        document_cache: Optional[DocumentCache] = None,
+        persisted_queries: Optional[PersistedQueryStore] = None,
+        allowlist: Optional[QueryAllowlist] = None,
+        allowlist_only: bool = False,
+        batch: bool = False,
+        max_batch_size: Optional[int] = None,
+        json_loads: Callable[[Union[str, bytes]], Any] = json.loads,
+        json_dumps: Optional[Callable[[Any], Union[str, bytes]]] = None,
+        stream: bool = False,
+        stream_chunk_size: int = 65536,
+        stream_list_chunk_size: int = 1000,
+        keep_alive: Optional[float] = 12.0,
+        connection_init_wait_timeout: float = 3.0,
+        sse: bool = False,
+        sse_heartbeat: Optional[float] = 12.0,
+        sse_queue_size: int = 16,
+        incremental: bool = False,
+        executor: Optional[Executor] = None,
+        executor_concurrency: Optional[int] = None,
+        loaders: Optional[Dict[str, Callable[[], DataLoader]]] = None,
+        max_depth: Optional[int] = None,
+        max_aliases: Optional[int] = None,
+        max_cost: Optional[int] = None,
+        cost_model: Optional[CostModel] = None,
+        execution_timeout: Optional[float] = None,
+        operation_timeouts: Optional[Dict[str, float]] = None,
+        limiter: Optional[ConcurrencyLimiter] = None,
+        mutation_limiter: Optional[ConcurrencyLimiter] = None,
+        etag: bool = False,
+        cache_control: Optional[CacheControlPolicy] = None,
+        response_cache: Optional[ResponseCache] = None,
+        tracing: bool = False,
+        on_trace: Optional[TraceCallback] = None,
+        metrics: Optional[GraphQLMetrics] = None,
+        compression: Optional[ResponseCompression] = None,
+        max_body_size: Optional[int] = None,
+        max_query_length: Optional[int] = None,
     ):  # noqa: D403
         """
         GraphQL init.
@@ -66,20 +165,262 @@ class GraphQLView:
         :param root_value:
         :param context:
         :param middleware:
+        :param document_cache: cache of parsed documents, disabled by default
+        :param persisted_queries: store enabling automatic persisted queries
+        :param allowlist: trusted operations, compiled once for the schema
+        :param allowlist_only: whether to reject operations not in the allowlist
+        :param batch: whether to accept a list of operations in a POST request
+        :param max_batch_size: maximum number of operations in a batch
+        :param json_loads: JSON decoder of the request parameters and bodies
+        :param json_dumps: compact JSON encoder of the responses, returning
+            either str or bytes
+        :param stream: whether to stream responses with chunked transfer encoding
+        :param stream_chunk_size: bytes buffered before each streamed write
+        :param stream_list_chunk_size: list items encoded at a time when streaming
+        :param subscriptions: whether to serve subscriptions over WebSocket
+        :param keep_alive: interval between WebSocket pings, in seconds
+        :param connection_init_wait_timeout: time allowed for a WebSocket client
+            to initialise the connection, in seconds
+        :param sse: whether to stream operations as Server-Sent Events to clients
+            accepting text/event-stream
+        :param sse_heartbeat: interval between Server-Sent Events heartbeats
+        :param sse_queue_size: maximum number of results waiting to be sent to
+            a Server-Sent Events client
+        :param incremental: whether to deliver results deferred or streamed
+            with @defer and @stream as multipart/mixed responses
+        :param executor: executor running synchronous operations off the event
+            loop, usually a ThreadPoolExecutor since documents and contexts are
+            not picklable
+        :param executor_concurrency: maximum number of operations submitted to
+            the executor at once
+        :param loaders: factories of the DataLoaders created for each request,
+            available as context["loaders"] under the same names
+        :param max_depth: maximum nesting depth of the fields of an operation
+        :param max_aliases: maximum number of aliased fields of an operation
+        :param max_cost: maximum cost of an operation, estimated by cost_model
+        :param cost_model: model computing the cost of the validated documents
+        :param execution_timeout: time allowed for executing an operation, in
+            seconds
+        :param operation_timeouts: execution timeouts overridden by operation name
+        :param limiter: limiter admitting the execution of operations
+        :param mutation_limiter: limiter admitting the execution of mutations,
+            instead of limiter
+        :param etag: whether the responses to GET queries get an ETag, and 304
+            responses when they match If-None-Match
+        :param cache_control: policy of the Cache-Control header of the
+            responses to GET queries
+        :param response_cache: cache of the encoded responses to GET queries
+        :param tracing: whether the timings of the phases and resolvers of
+            operations are returned in extensions.tracing, in the Apollo
+            tracing format
+        :param on_trace: callback receiving the trace of each operation,
+            possibly returning an awaitable
+        :param metrics: metrics of the view, served by GraphQLView.attach
+        :param compression: compression of the response bodies, negotiated with
+            Accept-Encoding
+        :param max_body_size: maximum size of the POST request bodies, in bytes
+        :param max_query_length: maximum length of the queries, in characters
         """
         self.schema = schema
         self.asynchronous = asynchronous
-        self.root_value = root_value
+        self.root_value: Any = root_value
         self.context = context
-        self.middleware = middleware
+        self.middleware: Middleware = middleware
         self.max_age = max_age
         self.pretty = pretty
         self.subscriptions = subscriptions
         self.tool = tool
+        self.document_cache = document_cache
+        self.persisted_queries = persisted_queries
+        self.allowlist = allowlist
+        self.allowlist_only = allowlist_only
+        self.batch = batch
+        self.max_batch_size = max_batch_size
+        self.json_loads: Callable[[Union[str, bytes]], Any] = json_loads
+        self.json_dumps = json_dumps
+        self.stream = stream
+        self.stream_chunk_size = stream_chunk_size
+        self.stream_list_chunk_size = stream_list_chunk_size
+        self.keep_alive = keep_alive
+        self.connection_init_wait_timeout = connection_init_wait_timeout
+        self.sse = sse
+        self.sse_heartbeat = sse_heartbeat
+        self.sse_queue_size = sse_queue_size
+        if incremental and not supports_incremental_delivery():
+            raise ValueError(
+                "Incremental delivery requires a graphql-core version providing "
+                "experimental_execute_incrementally."
+            )
+        self.incremental = incremental
+        self.executor = executor
+        self.executor_concurrency = executor_concurrency
+        self.executor_queue_depth = 0
+        self.executor_in_flight = 0
+        self._executor_semaphore: Optional[asyncio.Semaphore] = None
+        self.loaders = loaders
+        self.max_cost = max_cost
+        self.cost_model = cost_model
+        self.execution_timeout = execution_timeout
+        self.operation_timeouts = operation_timeouts
+        self.execution_timeouts = 0
+        self.limiter = limiter
+        self.mutation_limiter = mutation_limiter
+        self.etag = etag
+        self.cache_control = cache_control
+        self.response_cache = response_cache
+        self.tracing = tracing
+        self.on_trace = on_trace
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.register(self)
+        self.compression = compression
+        self.max_body_size = max_body_size
+        self.max_query_length = max_query_length
+        self.max_depth = max_depth
+        self.max_aliases = max_aliases
+        self.validation_rules: List[Type[ASTValidationRule]] = []
+        if max_depth is not None:
+            self.validation_rules.append(max_depth_rule(max_depth))
+        if max_aliases is not None:
+            self.validation_rules.append(max_aliases_rule(max_aliases))
+
+        if self.allowlist is not None:
+            self.allowlist.prepare(self.schema, self.validate_document)
+
+    @property
+    def schema(self) -> GraphQLSchema:
+        """Return the GraphQL schema served by this view."""
+        return self._schema
+
+    @schema.setter
+    def schema(self, schema: GraphQLSchema) -> None:
+        """Replace the schema, discarding any results computed for the old one."""
+        # a graphene schema can only be built once graphene is imported
+        graphene: Any = sys.modules.get("graphene")
+        if graphene is not None and isinstance(schema, graphene.Schema):
+            schema = schema.graphql_schema
+        self._schema = schema
+        self._schema_validation_errors: Optional[List[GraphQLError]] = None
+
+    def get_schema_validation_errors(self) -> List[GraphQLError]:
+        """
+        Return the schema validation errors.
+
+        The schema is validated on first use only, the result is kept until
+        the schema is replaced.
+        """
+        if self._schema_validation_errors is None:
+            self._schema_validation_errors = validate_schema(self.schema)
+        return self._schema_validation_errors
+
+    def parse_document(self, query: str) -> CachedDocument:
+        """Parse a query, skipping the parser for documents already cached."""
+        if self.document_cache is None:
+            return CachedDocument(parse(query))
+
+        cached = self.document_cache.get(query)
+        if cached is None:
+            cached = self.document_cache.put(query, parse(query))
+        return cached
+
+    async def load_persisted_query(
+        self, query: Optional[str], extensions: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Resolve an automatic persisted query.
+
+        A hash sent along with the query text registers the query, a hash sent
+        alone is replaced by the query registered for it.
+        """
+        persisted_query = extensions.get("persistedQuery")
+        if not isinstance(persisted_query, dict):
+            return query
+
+        store = cast(PersistedQueryStore, self.persisted_queries)
+        sha256_hash = persisted_query.get("sha256Hash")
+        if persisted_query.get("version", 1) != 1 or not isinstance(sha256_hash, str):
+            raise HttpQueryError(
+                400,
+                "Unsupported persisted query.",
+                extensions={"code": "PERSISTED_QUERY_NOT_SUPPORTED"},
+            )
+
+        if query:
+            if query_hash(query) != sha256_hash.lower():
+                raise HttpQueryError(
+                    400,
+                    "Provided sha256Hash does not match query.",
+                    extensions={"code": "INVALID_PERSISTED_QUERY"},
+                )
+            await store.put(sha256_hash.lower(), query)
+            return query
+
+        query = await store.get(sha256_hash.lower())
+        if query is None:
+            # clients retry with the full query text on a 200 not found
+            raise HttpQueryError(
+                200,
+                "PersistedQueryNotFound",
+                extensions={"code": "PERSISTED_QUERY_NOT_FOUND"},
+            )
+        return query
+
+    def get_allowlisted_document(
+        self, query: Optional[str], document_id: Optional[str]
+    ) -> Optional[CachedDocument]:
+        """Return the trusted document requested, enforcing allowlist_only."""
+        cached: Optional[CachedDocument] = None
+        if self.allowlist is not None:
+            if document_id:
+                cached = self.allowlist.get(document_id)
+                if cached is None:
+                    raise HttpQueryError(400, "Unknown document id.")
+            elif query:
+                cached = self.allowlist.get_by_query(query)
+            if cached is None and query and self.allowlist_only:
+                raise HttpQueryError(403, "Query is not in the allowlist.")
+        return cached
 
-        if graphene:
-            if isinstance(self.schema, GrapheneSchema):
-                self.schema = self.schema.graphql_schema
+    @property
+    def validation_key(self) -> Hashable:
+        """
+        Return the key of the outcomes of validating documents.
+
+        Views with other schemas, limits or Cache-Control policies have other
+        keys, so they do not reuse each other's outcomes when they share a
+        document cache or an allowlist.
+        """
+        return (
+            self.schema,
+            self.max_depth,
+            self.max_aliases,
+            self.max_cost,
+            self.cost_model,
+            self.cache_control,
+        )
+
+    def validate_document(self, cached: CachedDocument) -> List[GraphQLError]:
+        """Validate a document, reusing the outcome stored for the view."""
+        key = self.validation_key
+        errors = cached.get_validation_errors(key)
+        if errors is None:
+            rules = self.validation_rules
+            if self.max_cost is not None or self.cost_model is not None:
+
+                def set_cost(cost: int) -> None:
+                    cached.cost = cost
+
+                rules = rules + [
+                    max_cost_rule(self.max_cost, self.cost_model, set_cost)
+                ]
+            if rules:
+                errors = validate(
+                    self.schema, cached.document, list(specified_rules) + rules
+                )
+            else:
+                errors = validate(self.schema, cached.document)
+            cached.set_validation_errors(key, errors)
+        return errors
 
     def _graphql(
         self,
@@ -88,13 +429,29 @@ class GraphQLView:
         root_value: Any = None,
         context_value: Any = None,
         variable_values: Dict[str, Any] = None,  # type: ignore
-        operation_name: str = None,  # type: ignore
+        operation_name: Optional[str] = None,
         field_resolver: GraphQLFieldResolver = None,  # type: ignore
         type_resolver: GraphQLTypeResolver = None,  # type: ignore
         middleware: Middleware = None,
         execution_context_class: Type[ExecutionContext] = ExecutionContext,
     ) -> AwaitableOrValue[ExecutionResult]:
         # Execute
+        if self.incremental:
+            return cast(
+                AwaitableOrValue[ExecutionResult],
+                experimental_execute_incrementally(
+                    schema,
+                    document,
+                    root_value,
+                    context_value,
+                    variable_values,
+                    operation_name,
+                    field_resolver,
+                    type_resolver,
+                    middleware=middleware,
+                    execution_context_class=execution_context_class,
+                ),
+            )
         return execute(
             schema,
             document,
@@ -108,17 +465,40 @@ class GraphQLView:
             execution_context_class,
         )
 
-    async def __call__(self, request: Request) -> Response:
+    async def __call__(self, request: Request) -> StreamResponse:
         """
         Run the GraphQL query provided.
 
         :param request: aiohttp Request
         :return: aiohttp Response
         """
+        if self.is_websocket(request):
+            return await self.handle(request)
+        metrics = self.metrics
+        if metrics is None:
+            return await self.compress_response(request, await self.handle(request))
+        metrics.in_flight += 1
+        start = perf_counter()
+        try:
+            return await self.compress_response(request, await self.handle(request))
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe_request(perf_counter() - start)
+
+    async def handle(self, request: Request) -> StreamResponse:
+        """Handle a GraphQL request."""
+        if self.is_websocket(request):
+            return await GraphQLTransportWSHandler(
+                self,
+                request,
+                keep_alive=self.keep_alive,
+                connection_init_wait_timeout=self.connection_init_wait_timeout,
+            ).handle()
+
         request_method = request.method.lower()
         try:
-            variables = json.loads(request.query.get("variables", "{}"))
-        except json.decoder.JSONDecodeError:
+            variables = self.json_loads(request.query.get("variables", "{}"))
+        except ValueError:
             return self.error_response("Variables are invalid JSON.")
         operation_name = request.query.get("operationName")
 
@@ -127,11 +507,19 @@ class GraphQLView:
         elif request_method == "post":
             try:
                 data = await self.parse_body(request)
-            except json.decoder.JSONDecodeError:
+            except ValueError:
                 return self.error_response("POST body sent invalid JSON.")
+            except HttpQueryError as error:
+                return self.error_response(error.message, error.status_code)
+            if isinstance(data, list):
+                return await self.run_batch(request, data)
             operation_name = data.get("operationName", operation_name)
         elif request_method == "get":
-            data = {"query": request.query.get("query")}
+            data = {
+                "query": request.query.get("query"),
+                "extensions": request.query.get("extensions"),
+                "documentId": request.query.get("documentId"),
+            }
         else:
             return self.error_response(
                 "GraphQL only supports GET and POST requests.",
@@ -139,104 +527,708 @@ class GraphQLView:
                 headers={"Allow": "GET, POST"},
             )
 
-        is_tool = self.is_tool(request)
+        if self.is_tool(request):
+            tool = cast(GraphQLTool, self.tool)
+            return await tool.render(
+                data.get("query"), self.get_variables(data, variables), operation_name
+            )
 
-        vars_dyn = data.get("variables", {}) or {}
-        variables.update(
-            vars_dyn if isinstance(vars_dyn, dict) else json.loads(vars_dyn)
+        if self.is_event_stream(request):
+            try:
+                variables = self.get_variables(data, variables)
+            except HttpQueryError as error:
+                return self.error_response(error.message, error.status_code)
+            return await GraphQLEventStreamHandler(
+                self,
+                request,
+                heartbeat=self.sse_heartbeat,
+                queue_size=self.sse_queue_size,
+            ).handle(
+                dict(data, variables=variables, operationName=operation_name),
+                self.get_context(request),
+            )
+
+        cache_key = None
+        if request_method == "get" and self.response_cache is not None:
+            cache_key = self.get_response_cache_key(
+                request, data, variables, operation_name
+            )
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                return self.conditional_response(
+                    request,
+                    cached_response.body,
+                    cached_response.etag,
+                    cached_response.cache_control,
+                )
+
+        try:
+            result, invalid = await self.run_operation(
+                request,
+                data,
+                variables,
+                operation_name,
+                self.get_context(request),
+                accept_incremental=self.accepts_incremental(request),
+            )
+        except HttpQueryError as error:
+            if self.metrics is not None:
+                self.metrics.observe_errors([error])
+            return self.error_response(
+                error.message,
+                error.status_code,
+                headers=error.headers,
+                extensions=error.extensions,
+            )
+
+        if self.metrics is not None:
+            with self.metrics.time_phase("encode"):
+                return await self.respond(request, result, invalid, cache_key)
+        return await self.respond(request, result, invalid, cache_key)
+
+    async def respond(
+        self,
+        request: Request,
+        result: ExecutionResult,
+        invalid: bool,
+        cache_key: Hashable = None,
+    ) -> StreamResponse:
+        """Encode the result of an operation into a response."""
+        request_method = request.method.lower()
+        if is_incremental_results(result):
+            return await write_multipart_response(request, result, self.json_encode)
+        if request_method == "get" and self.is_http_cacheable(result, invalid):
+            return self.cacheable_response(request, result, cache_key)
+        if self.stream and not self.is_pretty(request):
+            return await self.stream_response(request, result, invalid=invalid)
+        return self.encode_response(request, result, invalid=invalid)
+
+    async def compress_response(
+        self, request: Request, response: StreamResponse
+    ) -> StreamResponse:
+        """Compress the body of a response, unless it was streamed."""
+        if self.compression is None or not isinstance(response, Response):
+            return response
+        return await self.compression.compress_response(
+            response, request.headers.get("Accept-Encoding", "")
         )
-        query = cast(str, data.get("query"))
+
+    async def run_batch(
+        self, request: Request, batch: List[Dict[str, Any]]
+    ) -> Response:
+        """
+        Run a batch of GraphQL operations sharing the request context.
+
+        The valid operations are admitted by the limiters as a single unit,
+        taking one slot of the mutation limiter when the batch contains a
+        mutation, so a rejected batch is answered with a 503 response before
+        any of its operations runs. Other errors are reported in the results
+        of the operations.
+        """
+        if not self.batch:
+            return self.error_response("Batch GraphQL requests are not enabled.")
+        if not batch:
+            return self.error_response("Received an empty list in the batch request.")
+        if self.max_batch_size is not None and len(batch) > self.max_batch_size:
+            return self.error_response(
+                "Batch requests are limited to {} operations.".format(
+                    self.max_batch_size
+                )
+            )
+
         context = self.get_context(request)
-        invalid = False
 
-        if is_tool:
-            tool = cast(GraphQLTool, self.tool)
-            return await tool.render(query, variables, operation_name)
+        async def prepare(
+            data: Dict[str, Any]
+        ) -> Union[ExecutionResult, PreparedOperation]:
+            if not isinstance(data, dict):
+                error = GraphQLError("Batch items must be objects.")
+                return ExecutionResult(data=None, errors=[error])
+            try:
+                return await self.prepare_request(
+                    request, data, {}, data.get("operationName")
+                )
+            except HttpQueryError as http_error:
+                if self.metrics is not None:
+                    self.metrics.observe_errors([http_error])
+                error = GraphQLError(
+                    http_error.message, extensions=http_error.extensions
+                )
+                return ExecutionResult(data=None, errors=[error])
 
-        if not data.get("query"):
-            return self.encode_response(
-                request,
-                ExecutionResult(
-                    data=None,
-                    errors=[GraphQLError(message="Must provide query string.")],
-                ),
-                invalid=True,
+        async def run(
+            item: Union[ExecutionResult, PreparedOperation]
+        ) -> Tuple[ExecutionResult, bool]:
+            if isinstance(item, ExecutionResult):
+                return item, True
+            return await self.run_prepared(item, context, admitted=True)
+
+        if self.asynchronous:
+            items = await asyncio.gather(*(prepare(data) for data in batch))
+        else:
+            items = [await prepare(data) for data in batch]
+
+        operations = [
+            item[1] for item in items if not isinstance(item, ExecutionResult)
+        ]
+        limiter = None
+        if operations:
+            mutations = [
+                op
+                for op in operations
+                if op is not None and op.operation == OperationType.MUTATION
+            ]
+            limiter = self.get_limiter(mutations[0] if mutations else None)
+        if limiter is not None:
+            try:
+                await limiter.acquire()
+            except HttpQueryError as error:
+                if self.metrics is not None:
+                    self.metrics.observe_errors([error])
+                return self.error_response(
+                    error.message,
+                    error.status_code,
+                    headers=error.headers,
+                    extensions=error.extensions,
+                )
+        try:
+            if self.asynchronous:
+                results = await asyncio.gather(*(run(item) for item in items))
+            else:
+                results = [await run(item) for item in items]
+        finally:
+            if limiter is not None:
+                limiter.release()
+
+        if self.metrics is not None:
+            with self.metrics.time_phase("encode"):
+                return self.encode_batch(request, results)
+        return self.encode_batch(request, results)
+
+    def encode_batch(
+        self, request: Request, results: List[Tuple[ExecutionResult, bool]]
+    ) -> Response:
+        """Construct an aiohttp.Response from the results of a batch."""
+        return self.json_response(
+            self.json_encode(
+                [self.format_result(*result) for result in results],
+                self.is_pretty(request),
+            )
+        )
+
+    def get_variables(
+        self, data: Dict[str, Any], variables: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Merge the variables sent with an operation into the given ones."""
+        vars_dyn = data.get("variables", {}) or {}
+        try:
+            if not isinstance(vars_dyn, dict):
+                vars_dyn = self.json_loads(vars_dyn)
+        except ValueError:
+            raise HttpQueryError(400, "Variables are invalid JSON.")
+        return dict(variables, **vars_dyn)
+
+    async def run_operation(
+        self,
+        request: Request,
+        data: Dict[str, Any],
+        variables: Dict[str, Any],
+        operation_name: Optional[str],
+        context: Any,
+        accept_incremental: bool = False,
+    ) -> Tuple[ExecutionResult, bool]:
+        """
+        Run a single GraphQL operation.
+
+        :param request: aiohttp Request
+        :param data: operation parameters sent by the client
+        :param variables: variables sent outside of the operation parameters
+        :param operation_name: name of the operation to run
+        :param context: context value of the execution
+        :param accept_incremental: whether results may be delivered incrementally
+        :return: execution result and whether the operation was invalid, the
+            result holding the initial and subsequent results when delivered
+            incrementally
+        """
+        prepared = await self.prepare_request(request, data, variables, operation_name)
+        if isinstance(prepared, ExecutionResult):
+            return prepared, True
+        return await self.run_prepared(prepared, context, accept_incremental)
+
+    async def prepare_request(
+        self,
+        request: Request,
+        data: Dict[str, Any],
+        variables: Dict[str, Any],
+        operation_name: Optional[str],
+    ) -> Union[ExecutionResult, PreparedOperation]:
+        """
+        Load, parse and validate a GraphQL operation.
+
+        :return: operation to execute, or the result reporting why it cannot
+            be executed
+        """
+        request_method = request.method.lower()
+        variables = self.get_variables(data, variables)
+        query = await self.load_query(data)
+        cached = self.get_allowlisted_document(query, data.get("documentId"))
+
+        if cached is None and not query:
+            return ExecutionResult(
+                data=None, errors=[GraphQLError(message="Must provide query string.")]
+            )
+
+        start = perf_counter()
+        trace_resolvers = self.tracing or self.on_trace is not None
+        tracer = ApolloTracer() if trace_resolvers or self.metrics else None
+        prepared = await self.offload(
+            self.prepare_operation,
+            request_method,
+            query,
+            cached,
+            operation_name,
+            tracer,
+        )
+        if tracer is not None and self.metrics is not None:
+            self.observe_preparation(tracer)
+        if isinstance(prepared, ExecutionResult):
+            if self.metrics is not None:
+                self.metrics.observe_errors(prepared.errors)
+                self.metrics.observe_operation(operation_name, perf_counter() - start)
+            return prepared
+        cached, op = prepared
+
+        if self.cache_control is not None and request_method == "get":
+            request[CACHE_POLICY_KEY] = self.get_cache_policy(cached, op)
+        return cached.document, op, variables, operation_name, tracer, start
+
+    async def run_prepared(
+        self,
+        prepared: PreparedOperation,
+        context: Any,
+        accept_incremental: bool = False,
+        admitted: bool = False,
+    ) -> Tuple[ExecutionResult, bool]:
+        """
+        Execute an operation returned by prepare_request.
+
+        :param admitted: whether the operation was already admitted by a
+            limiter, such as along with the other operations of a batch
+        :return: execution result and whether the operation was invalid
+        """
+        document, op, variables, operation_name, tracer, start = prepared
+        result = await self.execute_operation(
+            document, op, variables, operation_name, context, tracer, start, admitted
+        )
+
+        if is_incremental_results(result) and not accept_incremental:
+            await close_incremental_results(result)
+            not_accepted = GraphQLError(
+                "Deferred and streamed results are only delivered "
+                "to clients accepting multipart/mixed."
             )
+            return ExecutionResult(data=None, errors=[not_accepted]), True
+
+        return result, op is None
 
+    async def load_query(self, data: Dict[str, Any]) -> Optional[str]:
+        """
+        Return the query of an operation.
+
+        The length of the query sent is checked, and it is loaded from the
+        persisted queries when they are enabled.
+        """
+        query = cast(Optional[str], data.get("query"))
+        if self.max_query_length is not None and query is not None:
+            if len(query) > self.max_query_length:
+                raise HttpQueryError(
+                    413,
+                    "Queries are limited to {} characters.".format(
+                        self.max_query_length
+                    ),
+                )
+
+        if self.persisted_queries is not None:
+            extensions = data.get("extensions") or {}
+            try:
+                if not isinstance(extensions, dict):
+                    extensions = self.json_loads(extensions)
+            except ValueError:
+                raise HttpQueryError(400, "Extensions are invalid JSON.")
+            if not isinstance(extensions, dict):
+                raise HttpQueryError(400, "Extensions must be a JSON object.")
+            query = await self.load_persisted_query(query, extensions)
+        return query
+
+    async def execute_operation(
+        self,
+        document: DocumentNode,
+        op: Optional[OperationDefinitionNode],
+        variables: Dict[str, Any],
+        operation_name: Optional[str],
+        context: Any,
+        tracer: Optional[ApolloTracer] = None,
+        start: Optional[float] = None,
+        admitted: bool = False,
+    ) -> ExecutionResult:
+        """
+        Execute a validated operation once admitted by its limiter.
+
+        :param tracer: tracer of the operation, created here when tracing is
+            enabled and none is given
+        :param start: time the operation started being prepared, for metrics
+        :param admitted: whether the operation was already admitted by a limiter
+        """
+        trace_resolvers = self.tracing or self.on_trace is not None
+        if tracer is None and trace_resolvers:
+            tracer = ApolloTracer()
+        limiter = None if admitted else self.get_limiter(op)
+        if limiter is not None:
+            await limiter.acquire()
+        execution_start = perf_counter()
+        try:
+            result = await self.offload(
+                self.execute_document,
+                document,
+                op,
+                variables,
+                operation_name,
+                context,
+                tracer if trace_resolvers else None,
+            )
+            if isawaitable(result):
+                result = await cast(Awaitable[ExecutionResult], result)
+        finally:
+            if limiter is not None:
+                limiter.release()
+        if isinstance(result, ExecutionResult) and is_timed_out(result.errors):
+            self.execution_timeouts += 1
+        if self.metrics is not None:
+            end = perf_counter()
+            self.metrics.observe_phase("execute", end - execution_start)
+            self.metrics.observe_operation(
+                op.name.value if op is not None and op.name else operation_name,
+                end - (execution_start if start is None else start),
+            )
+            if isinstance(result, ExecutionResult):
+                self.metrics.observe_errors(result.errors)
+        if trace_resolvers and isinstance(result, ExecutionResult):
+            await self.report_trace(result, cast(ApolloTracer, tracer))
+        return cast(ExecutionResult, result)
+
+    def prepare_operation(
+        self,
+        request_method: str,
+        query: Optional[str],
+        cached: Optional[CachedDocument],
+        operation_name: Optional[str],
+        tracer: Optional[ApolloTracer] = None,
+    ) -> Union[
+        ExecutionResult, Tuple[CachedDocument, Optional[OperationDefinitionNode]]
+    ]:
+        """
+        Parse and validate an operation.
+
+        :return: document and operation to execute, or the result reporting
+            why it cannot be executed
+        """
         # Validate Schema
-        schema_validation_errors = validate_schema(self.schema)
+        schema_validation_errors = self.get_schema_validation_errors()
         if schema_validation_errors:  # pragma: no cover
-            return self.encode_response(
-                request,
-                ExecutionResult(data=None, errors=schema_validation_errors),
-                invalid=True,
-            )
+            return ExecutionResult(data=None, errors=schema_validation_errors)
 
         # Parse
         try:
-            document = parse(query)
+            if cached is None:
+                if tracer is not None:
+                    tracer.start_phase("parsing")
+                cached = self.parse_document(cast(str, query))
+                if tracer is not None:
+                    tracer.end_phase("parsing")
+            document = cached.document
             op = get_operation_ast(document, operation_name)
-            if op is None:
-                invalid = True
-            else:
+            if op is not None:
                 if request_method == "get" and op.operation != OperationType.QUERY:
-                    return self.error_response(
+                    raise HttpQueryError(
+                        405,
                         "Can only perform a {} operation from a POST request.".format(
                             op.operation.value
                         ),
-                        405,
                         headers={"Allow": "POST"},
                     )
         except GraphQLError as error:
-            return self.encode_response(
-                request, ExecutionResult(data=None, errors=[error]), invalid=True
-            )
+            return ExecutionResult(data=None, errors=[error])
+        except HttpQueryError:
+            raise
         except Exception as error:  # pragma: no cover
             error = GraphQLError(str(error), original_error=error)
-            return self.encode_response(
-                request, ExecutionResult(data=None, errors=[error]), invalid=True
-            )
+            return ExecutionResult(data=None, errors=[error])
 
         # Validate
-        validation_errors = validate(self.schema, document)
+        if tracer is not None:
+            tracer.start_phase("validation")
+        validation_errors = self.validate_document(cached)
+        if tracer is not None:
+            tracer.end_phase("validation")
         if validation_errors:
-            return self.encode_response(
-                request,
-                ExecutionResult(data=None, errors=validation_errors),
-                invalid=True,
-            )
+            return ExecutionResult(data=None, errors=validation_errors)
+        return cached, op
 
-        if self.asynchronous:
-            result = self._graphql(
-                self.schema,
-                document=document,
-                variable_values=variables,
-                operation_name=operation_name,
-                root_value=self.root_value,
-                context_value=context,
-                middleware=self.middleware,
-            )
-            if isawaitable(result):  # pragma: no branch
-                result = await cast(Awaitable[ExecutionResult], result)
-        else:
-            result = self._graphql(
-                self.schema,
-                document=document,
-                variable_values=variables,
-                operation_name=operation_name,
-                root_value=self.root_value,
-                context_value=context,
-                middleware=self.middleware,
+    def get_cache_policy(
+        self, cached: CachedDocument, op: Optional[OperationDefinitionNode]
+    ) -> Tuple[int, str]:
+        """Return the Cache-Control policy of an operation, stored in its document."""
+        name = op.name.value if op is not None and op.name is not None else None
+        key = self.validation_key
+        policy = cached.get_cache_policy(key, name)
+        if policy is None:
+            policy = cast(CacheControlPolicy, self.cache_control).get_policy(
+                self.schema, cached.document, op
             )
+            cached.set_cache_policy(key, name, policy)
+        return policy
 
-        return self.encode_response(
-            request, cast(ExecutionResult, result), invalid=invalid
+    def execute_document(
+        self,
+        document: DocumentNode,
+        op: Optional[OperationDefinitionNode],
+        variables: Dict[str, Any],
+        operation_name: Optional[str],
+        context: Any,
+        tracer: Optional[ApolloTracer] = None,
+    ) -> AwaitableOrValue[ExecutionResult]:
+        """
+        Execute a validated operation.
+
+        The execution result is awaitable when resolvers are asynchronous.
+        """
+        extra: List[Any] = []
+        timeout = self.get_execution_timeout(
+            op.name.value if op is not None and op.name else operation_name
+        )
+        if timeout is not None:
+            extra.append(ExecutionDeadline(timeout))
+        if tracer is not None:
+            extra.append(tracer)
+        middleware = extend_middleware(self.middleware, extra)
+
+        return self._graphql(
+            self.schema,
+            document=document,
+            variable_values=variables,
+            operation_name=operation_name,
+            root_value=self.root_value,
+            context_value=context,
+            middleware=middleware,
         )
 
+    def observe_preparation(self, tracer: ApolloTracer) -> None:
+        """Observe the durations of the parsing and validation of an operation."""
+        metrics = cast(GraphQLMetrics, self.metrics)
+        for phase, name in (("parsing", "parse"), ("validation", "validate")):
+            timing = tracer.phases.get(phase)
+            if timing is not None and "duration" in timing:
+                metrics.observe_phase(name, timing["duration"] / 1e9)
+
+    async def report_trace(self, result: ExecutionResult, tracer: ApolloTracer) -> None:
+        """Add the trace of an operation to its result and pass it to on_trace."""
+        trace = tracer.finish()
+        if self.tracing:
+            result.extensions = dict(result.extensions or {}, tracing=trace)
+        if self.on_trace is not None:
+            reported = self.on_trace(trace)
+            if reported is not None:
+                await reported
+
+    def get_execution_timeout(self, operation_name: Optional[str]) -> Optional[float]:
+        """Return the time allowed for executing an operation, in seconds."""
+        if self.operation_timeouts and operation_name in self.operation_timeouts:
+            return self.operation_timeouts[operation_name]
+        return self.execution_timeout
+
+    def get_limiter(
+        self, op: Optional[OperationDefinitionNode]
+    ) -> Optional[ConcurrencyLimiter]:
+        """Return the limiter admitting the execution of an operation."""
+        if op is not None and op.operation == OperationType.MUTATION:
+            if self.mutation_limiter is not None:
+                return self.mutation_limiter
+        return self.limiter
+
+    async def offload(self, func: Callable[..., T], *args: Any) -> T:
+        """Call a function, in the executor when operations are synchronous."""
+        if self.executor is not None and not self.asynchronous:
+            return await self.run_in_executor(func, *args)
+        return func(*args)
+
+    async def run_in_executor(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a function in the executor, within the concurrency limit."""
+        if self.executor_concurrency and self._executor_semaphore is None:
+            self._executor_semaphore = asyncio.Semaphore(self.executor_concurrency)
+        semaphore = self._executor_semaphore
+
+        if semaphore is not None:
+            self.executor_queue_depth += 1
+            try:
+                await semaphore.acquire()
+            finally:
+                self.executor_queue_depth -= 1
+
+        self.executor_in_flight += 1
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self.executor, partial(func, *args))
+        finally:
+            self.executor_in_flight -= 1
+            if semaphore is not None:
+                semaphore.release()
+
+    def is_http_cacheable(self, result: ExecutionResult, invalid: bool) -> bool:
+        """Return whether the response to a GET query gets HTTP caching headers."""
+        if not self.etag and self.cache_control is None and self.response_cache is None:
+            return False
+        return not invalid and not result.errors
+
+    def get_response_cache_key(
+        self,
+        request: Request,
+        data: Dict[str, Any],
+        variables: Dict[str, Any],
+        operation_name: Optional[str],
+    ) -> Hashable:
+        """Return the key of the response to a GET query in the response cache."""
+        return (
+            data.get("query"),
+            data.get("documentId"),
+            data.get("extensions"),
+            json.dumps(variables, sort_keys=True),
+            operation_name,
+            self.is_pretty(request),
+        )
+
+    def cacheable_response(
+        self, request: Request, result: ExecutionResult, cache_key: Hashable = None
+    ) -> Response:
+        """Construct a response with an ETag and Cache-Control, and cache it."""
+        body = self.json_encode(self.format_result(result), self.is_pretty(request))
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        etag = '"{}"'.format(sha1(body).hexdigest())
+
+        cache_control = max_age = None
+        scope = "PUBLIC"
+        if CACHE_POLICY_KEY in request:
+            max_age, scope = request[CACHE_POLICY_KEY]
+            cache_control = CacheControlPolicy.header(max_age, scope)
+
+        if self.response_cache is not None and cache_key is not None:
+            if scope == "PUBLIC":
+                self.response_cache.put(
+                    cache_key, body, etag, cache_control, ttl=max_age
+                )
+
+        return self.conditional_response(request, body, etag, cache_control)
+
+    def conditional_response(
+        self,
+        request: Request,
+        body: bytes,
+        etag: str,
+        cache_control: Optional[str] = None,
+    ) -> Response:
+        """Construct a response, or a 304 when the client has the same body."""
+        headers = {"ETag": etag}
+        if cache_control is not None:
+            headers["Cache-Control"] = cache_control
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            if "*" in tags or etag in tags or "W/" + etag in tags:
+                return Response(status=304, headers=headers)
+
+        return self.json_response(body, headers=headers)
+
     def encode_response(
         self, request: Request, result: ExecutionResult, invalid: bool = False
     ) -> Response:
         """Construct an aiohttp.Response from an execution result."""
+        status_code = 200 if not invalid else 400
+
+        return self.json_response(
+            self.json_encode(
+                self.format_result(result, invalid), self.is_pretty(request)
+            ),
+            status_code,
+        )
+
+    async def stream_response(
+        self, request: Request, result: ExecutionResult, invalid: bool = False
+    ) -> StreamResponse:
+        """Stream an execution result, encoding it incrementally."""
+        response = StreamResponse(status=200 if not invalid else 400)
+        response.content_type = "application/json"
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+
+        buffer = bytearray()
+        for piece in self.iter_encode(self.format_result(result, invalid)):
+            buffer += piece
+            if len(buffer) >= self.stream_chunk_size:
+                await response.write(bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await response.write(bytes(buffer))
+
+        await response.write_eof()
+        return response
+
+    def iter_encode(self, response: Dict[str, Any]) -> Iterator[bytes]:
+        """
+        Encode a response piece by piece.
+
+        Fields of the data are encoded one at a time, and lists found in the
+        top-level fields are encoded in chunks of stream_list_chunk_size items.
+        """
+
+        def encode(value: Any) -> bytes:
+            encoded = self.json_encode(value)
+            return encoded.encode("utf-8") if isinstance(encoded, str) else encoded
+
+        yield b"{"
+        for index, (key, value) in enumerate(response.items()):
+            if index:
+                yield b","
+            yield encode(key) + b":"
+            if key != "data" or not isinstance(value, dict):
+                yield encode(value)
+                continue
+
+            yield b"{"
+            for field_index, (field, field_value) in enumerate(value.items()):
+                if field_index:
+                    yield b","
+                yield encode(field) + b":"
+                if not isinstance(field_value, list):
+                    yield encode(field_value)
+                    continue
+
+                yield b"["
+                size = self.stream_list_chunk_size
+                for start in range(0, len(field_value), size):
+                    if start:
+                        yield b","
+                    end = start + size
+                    # strip the brackets of the chunk encoded as a list
+                    yield encode(field_value[start:end])[1:-1]
+                yield b"]"
+            yield b"}"
+        yield b"}"
+
+    def format_result(
+        self, result: ExecutionResult, invalid: bool = False
+    ) -> Dict[str, Any]:
+        """Format an execution result as a GraphQL response."""
         if result.errors:
             response: ResultDataType = cast(
                 ResultDataFailType,
@@ -248,32 +1240,50 @@ class GraphQLView:
             if result.data is None and invalid:
                 del response["data"]  # type: ignore
             for error in response["errors"]:  # type: ignore
-                if error["locations"] is None:
-                    del error["locations"]
-                if error["path"] is None:
-                    del error["path"]
+                # newer graphql-core versions leave the empty keys out already
+                if error.get("locations") is None:
+                    error.pop("locations", None)
+                if error.get("path") is None:
+                    error.pop("path", None)
         else:
             response = cast(ResultDataSuccessType, {"data": result.data})
 
-        status_code = 200 if not invalid else 400
+        if result.extensions:
+            response["extensions"] = result.extensions  # type: ignore
 
-        return Response(
-            text=self.json_encode(
-                cast(Dict[str, Any], response), self.is_pretty(request)
-            ),
-            status=status_code,
-            content_type="application/json",
-        )
+        return cast(Dict[str, Any], response)
 
     def error_response(
         self,
         message: str,
         status_code: int = 400,
         headers: Optional[Dict[str, str]] = None,
+        extensions: Optional[Dict[str, Any]] = None,
     ) -> Response:
         """Construct an aiohttp.Response from a failed execution."""
+        error: Dict[str, Any] = {"message": message}
+        if extensions:
+            error["extensions"] = extensions
+        return self.json_response(
+            self.json_encode({"errors": [error]}), status_code, headers=headers
+        )
+
+    def json_response(
+        self,
+        payload: Union[str, bytes],
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        """Construct an aiohttp.Response from an encoded JSON payload."""
+        if isinstance(payload, bytes):
+            return Response(
+                body=payload,
+                status=status_code,
+                content_type="application/json",
+                headers=headers,
+            )
         return Response(
-            text=json.dumps({"errors": [{"message": message}]}),
+            text=payload,
             status=status_code,
             content_type="application/json",
             headers=headers,
@@ -290,12 +1300,22 @@ class GraphQLView:
             isinstance(context, Mapping) and "request" not in context
         ):
             context.update({"request": request})  # type: ignore
+        if self.loaders and isinstance(context, Mapping) and "loaders" not in context:
+            context.update(  # type: ignore
+                {"loaders": {name: make() for name, make in self.loaders.items()}}
+            )
         return cast(Mapping, context)
 
-    def json_encode(self, response: Dict[str, Any], pretty: bool = False) -> str:
+    def json_encode(
+        self,
+        response: Union[Dict[str, Any], List[Dict[str, Any]]],
+        pretty: bool = False,
+    ) -> Union[str, bytes]:
         """Convert a response to json."""
         if pretty:
             return json.dumps(response, indent=2)
+        elif self.json_dumps is not None:
+            return self.json_dumps(response)
         else:
             return json.dumps(response, separators=(",", ":"))
 
@@ -303,6 +1323,26 @@ class GraphQLView:
         """Return whether the resulting json should be indented."""
         return any([self.pretty, self.is_tool(request), request.query.get("pretty")])
 
+    def is_websocket(self, request: Request) -> bool:
+        """Determine if the request should be upgraded to a WebSocket."""
+        return all(
+            [
+                self.subscriptions,
+                request.method.lower() == "get",
+                request.headers.get("upgrade", "").lower() == "websocket",
+            ]
+        )
+
+    def accepts_incremental(self, request: Request) -> bool:
+        """Determine if results may be delivered incrementally."""
+        return self.incremental and "multipart/mixed" in request.headers.get(
+            "accept", ""
+        )
+
+    def is_event_stream(self, request: Request) -> bool:
+        """Determine if the request should be answered with Server-Sent Events."""
+        return self.sse and "text/event-stream" in request.headers.get("accept", "")
+
     def is_tool(self, request: Request) -> bool:
         """Determine if the request should respond with a UI tool."""
         return all(
@@ -319,20 +1359,30 @@ class GraphQLView:
             ]
         )
 
-    async def parse_body(self, request: Request) -> Dict[str, Any]:
-        """Parse a POST request body."""
+    async def parse_body(
+        self, request: Request
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Parse a POST request body.
+
+        Bodies sent with a gzip or deflate Content-Encoding are decompressed
+        by aiohttp before they are read.
+        """
         if request.content_type == "application/graphql":
-            r_text = await request.text()
-            return {"query": r_text}
+            body = await self.read_body(request)
+            return {"query": body.decode(request.charset or "utf-8")}
 
         elif request.content_type == "application/json":
-            text = await request.text()
-            return cast(Dict[str, Any], json.loads(text))
+            body = await self.read_body(request)
+            return cast(
+                Union[Dict[str, Any], List[Dict[str, Any]]], self.json_loads(body)
+            )
 
         elif request.content_type in (
             "application/x-www-form-urlencoded",
             "multipart/form-data",
         ):
+            self.check_body_size(request.content_length)
             # TODO: seems like a multidict would be more appropriate
             # than casting it and de-duping variables. Alas, it's what
             # graphql-python wants.
@@ -340,6 +1390,28 @@ class GraphQLView:
 
         return {}
 
+    async def read_body(self, request: Request) -> bytes:
+        """Read a request body, failing as soon as it exceeds max_body_size."""
+        if self.max_body_size is None:
+            return await request.read()
+        self.check_body_size(request.content_length)
+        body = bytearray()
+        async for chunk in request.content.iter_any():
+            body.extend(chunk)
+            self.check_body_size(len(body))
+        return bytes(body)
+
+    def check_body_size(self, size: Optional[int]) -> None:
+        """Reject a request body larger than max_body_size."""
+        if self.max_body_size is not None and size is not None:
+            if size > self.max_body_size:
+                raise HttpQueryError(
+                    413,
+                    "Request bodies are limited to {} bytes.".format(
+                        self.max_body_size
+                    ),
+                )
+
     def process_preflight(self, request: Request) -> Response:
         """
         Preflight request support for apollo-client.
@@ -388,3 +1460,6 @@ class GraphQLView:
         for tool in tools:
             tool.endpoint = route_path
             app.router.add_get(tool.url, tool.view)
+
+        if instance.metrics is not None:
+            app.router.add_get(instance.metrics.url, instance.metrics.view)
@@ -0,0 +1,211 @@
+"""Caches for the GraphQL view."""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from graphql import DocumentNode, GraphQLError
+
+
+class CachedDocument:
+    """
+    A parsed document along with the outcome of its validation.
+
+    The outcome is stored for a validation key, identifying the schema and
+    the rules the document was validated against, so that documents shared
+    by views applying different limits are validated again. The
+    Cache-Control policies of its operations are kept with the outcome.
+    """
+
+    __slots__ = ("document", "key", "validation_errors", "cost", "cache_policies")
+
+    def __init__(self, document: DocumentNode):
+        """
+        Init.
+
+        :param document: parsed document
+        """
+        self.document = document
+        self.key: Optional[Hashable] = None
+        self.validation_errors: Optional[List[GraphQLError]] = None
+        self.cost: Optional[int] = None
+        self.cache_policies: Dict[Optional[str], Tuple[int, str]] = {}
+
+    def get_validation_errors(self, key: Hashable) -> Optional[List[GraphQLError]]:
+        """Return the validation errors found for a validation key, if known."""
+        if self.key != key:
+            return None
+        return self.validation_errors
+
+    def set_validation_errors(self, key: Hashable, errors: List[GraphQLError]) -> None:
+        """Store the outcome of validating the document for a validation key."""
+        self.key = key
+        self.validation_errors = errors
+        self.cache_policies = {}
+
+    def get_cache_policy(
+        self, key: Hashable, operation_name: Optional[str]
+    ) -> Optional[Tuple[int, str]]:
+        """Return the maxAge and scope of an operation, if known."""
+        if self.key != key:
+            return None
+        return self.cache_policies.get(operation_name)
+
+    def set_cache_policy(
+        self, key: Hashable, operation_name: Optional[str], policy: Tuple[int, str]
+    ) -> None:
+        """Store the maxAge and scope of an operation of the validated document."""
+        if self.key == key:
+            self.cache_policies[operation_name] = policy
+
+
+class DocumentCache:
+    """
+    Bounded LRU cache of parsed documents keyed by the query text.
+
+    The cache is locked, as operations offloaded to an executor share it.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        """
+        Init.
+
+        :param max_entries: maximum number of documents kept
+        :param max_bytes: maximum total size of the cached query texts, in bytes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[CachedDocument, int]]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached documents."""
+        return len(self._entries)
+
+    def __contains__(self, query: str) -> bool:
+        """Return whether a query is cached, without touching the counters."""
+        return query in self._entries
+
+    def get(self, query: str) -> Optional[CachedDocument]:
+        """Return the cached document for a query, if any."""
+        with self._lock:
+            entry = self._entries.get(query)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(query)
+            return entry[0]
+
+    def put(self, query: str, document: DocumentNode) -> CachedDocument:
+        """Cache a parsed document, evicting the least recently used ones."""
+        cached = CachedDocument(document)
+        size = len(query.encode("utf-8"))
+        if self.max_bytes is not None and size > self.max_bytes:
+            return cached
+
+        with self._lock:
+            previous = self._entries.pop(query, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+
+            self._entries[query] = (cached, size)
+            self.total_bytes += size
+
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.total_bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+        return cached
+
+    def clear(self) -> None:
+        """Remove all the cached documents."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+class CachedResponse:
+    """An encoded response along with its validators."""
+
+    __slots__ = ("body", "etag", "cache_control", "expires")
+
+    def __init__(
+        self, body: bytes, etag: str, cache_control: Optional[str], expires: float
+    ):
+        """
+        Init.
+
+        :param body: encoded response body
+        :param etag: entity tag of the body
+        :param cache_control: Cache-Control header of the response
+        :param expires: monotonic time the response expires at
+        """
+        self.body = body
+        self.etag = etag
+        self.cache_control = cache_control
+        self.expires = expires
+
+
+class ResponseCache:
+    """Bounded LRU cache of encoded responses expiring after a TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        """
+        Init.
+
+        :param max_entries: maximum number of responses kept
+        :param ttl: time responses are kept for, in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """Return the cached response for a key, unless expired."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires <= time.monotonic():
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(
+        self,
+        key: Hashable,
+        body: bytes,
+        etag: str,
+        cache_control: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Cache a response for the TTL, or a shorter one, evicting the oldest."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._entries[key] = CachedResponse(
+            body, etag, cache_control, time.monotonic() + ttl
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all the cached responses."""
+        self._entries.clear()
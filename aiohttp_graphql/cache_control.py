@@ -0,0 +1,183 @@
+"""Cache-Control policy of the responses to GET queries."""
+
+from typing import Dict, Optional, Tuple
+
+from graphql import (
+    DocumentNode,
+    EnumValueNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLInterfaceType,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    IntValueNode,
+    Node,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    get_named_type,
+    is_composite_type,
+)
+
+CACHE_CONTROL_DIRECTIVE = "cacheControl"
+
+Hint = Tuple[Optional[int], bool]
+
+
+def get_cache_hint(node: Optional[Node]) -> Tuple[Optional[int], Optional[str]]:
+    """Return the maxAge and scope of the @cacheControl directive of a node."""
+    max_age: Optional[int] = None
+    scope: Optional[str] = None
+    for directive in getattr(node, "directives", None) or ():
+        if directive.name.value != CACHE_CONTROL_DIRECTIVE:
+            continue
+        for argument in directive.arguments or ():
+            value = argument.value
+            if argument.name.value == "maxAge" and isinstance(value, IntValueNode):
+                max_age = int(value.value)
+            elif argument.name.value == "scope" and isinstance(value, EnumValueNode):
+                scope = value.value
+    return max_age, scope
+
+
+class CacheControlPolicy:
+    """
+    Policy computing the Cache-Control header of the responses to queries.
+
+    Hints are read from the @cacheControl(maxAge: Int, scope: CacheControlScope)
+    directives of the schema SDL, set on fields or on the types they return.
+    Root fields and fields returning composite types without a hint get
+    default_max_age, while scalar fields inherit the hint of their parent. A
+    query is cacheable for the smallest maxAge of its fields, and private when
+    any of them is.
+    """
+
+    def __init__(
+        self, default_max_age: int = 0, scope: str = "PUBLIC", use_hints: bool = True
+    ):
+        """
+        Init.
+
+        :param default_max_age: maxAge of the fields without a hint, in seconds
+        :param scope: scope of the queries without a PRIVATE hint
+        :param use_hints: whether @cacheControl hints are read from the schema
+        """
+        self.default_max_age = default_max_age
+        self.scope = scope.upper()
+        self.use_hints = use_hints
+
+    def get_policy(
+        self,
+        schema: GraphQLSchema,
+        document: DocumentNode,
+        operation: Optional[OperationDefinitionNode],
+    ) -> Tuple[int, str]:
+        """Return the maxAge and scope of the response to an operation."""
+        if not self.use_hints or operation is None:
+            return self.default_max_age, self.scope
+        fragments = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+        max_age, private = self.visit(
+            schema, operation.selection_set, schema.query_type, fragments, {}, True
+        )
+        return (
+            self.default_max_age if max_age is None else max_age,
+            "PRIVATE" if private else self.scope,
+        )
+
+    def visit(
+        self,
+        schema: GraphQLSchema,
+        selection_set: Optional[SelectionSetNode],
+        parent_type: Optional[GraphQLNamedType],
+        fragments: Dict[str, FragmentDefinitionNode],
+        memo: Dict[Tuple[str, bool], Hint],
+        is_root: bool = False,
+    ) -> Hint:
+        """
+        Return the smallest maxAge of a selection set and whether it is private.
+
+        :param memo: hints of the fragments of the document, by name and
+            whether they are spread on the root type, filled as they are
+            computed
+        """
+        max_ages = []
+        private = False
+
+        def merge(hint: Hint) -> None:
+            nonlocal private
+            if hint[0] is not None:
+                max_ages.append(hint[0])
+            private = private or hint[1]
+
+        for selection in selection_set.selections if selection_set else ():
+            if isinstance(selection, FieldNode):
+                if not isinstance(
+                    parent_type, (GraphQLObjectType, GraphQLInterfaceType)
+                ):
+                    continue
+                field = parent_type.fields.get(selection.name.value)
+                if field is None:
+                    continue
+                field_type = get_named_type(field.type)
+                max_age, scope = get_cache_hint(field.ast_node)
+                type_max_age, type_scope = (
+                    get_cache_hint(field_type.ast_node)
+                    if is_composite_type(field_type)
+                    else (None, None)
+                )
+                if max_age is None:
+                    max_age = type_max_age
+                if max_age is None and (is_root or is_composite_type(field_type)):
+                    max_age = self.default_max_age
+                merge((max_age, "PRIVATE" in (scope, type_scope)))
+                merge(
+                    self.visit(
+                        schema, selection.selection_set, field_type, fragments, memo
+                    )
+                )
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition is not None:
+                    fragment_type = schema.get_type(selection.type_condition.name.value)
+                merge(
+                    self.visit(
+                        schema,
+                        selection.selection_set,
+                        fragment_type,
+                        fragments,
+                        memo,
+                        is_root,
+                    )
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                key = (selection.name.value, is_root)
+                hint = memo.get(key)
+                fragment = fragments.get(key[0])
+                if hint is None and fragment is not None:
+                    # fragments spread several times are walked once, and a
+                    # fragment spread within itself adds no hint
+                    memo[key] = (None, False)
+                    hint = memo[key] = self.visit(
+                        schema,
+                        fragment.selection_set,
+                        schema.get_type(fragment.type_condition.name.value),
+                        fragments,
+                        memo,
+                        is_root,
+                    )
+                if hint is not None:
+                    merge(hint)
+        return (min(max_ages) if max_ages else None), private
+
+    @staticmethod
+    def header(max_age: int, scope: str) -> str:
+        """Return the Cache-Control header of a policy."""
+        if max_age <= 0:
+            return "no-cache"
+        return "{}, max-age={}".format(scope.lower(), max_age)
@@ -0,0 +1,127 @@
+"""Compression of the responses, negotiated with Accept-Encoding."""
+
+import asyncio
+import gzip
+from concurrent.futures import Executor
+from functools import partial
+from typing import Dict, Optional, Tuple, cast
+
+from aiohttp.web import Response
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+def supports_brotli() -> bool:
+    """Return whether the brotli package is installed."""
+    return brotli is not None
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Return the quality values of the codings of an Accept-Encoding header."""
+    codings = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+class ResponseCompression:
+    """
+    Compression of the response bodies with brotli or gzip.
+
+    Brotli is preferred when the brotli package is installed and the client
+    accepts it. Bodies smaller than min_size are sent as is, and bodies of
+    at least executor_size bytes are compressed in an executor so that the
+    event loop is not blocked.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1024,
+        level: int = 6,
+        brotli_quality: int = 4,
+        executor_size: int = 65536,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Init.
+
+        :param min_size: minimum size of the compressed bodies, in bytes
+        :param level: gzip compression level, from 1 to 9
+        :param brotli_quality: brotli compression quality, from 0 to 11
+        :param executor_size: minimum size of the bodies compressed in the
+            executor, in bytes
+        :param executor: executor compressing large bodies, the default
+            executor of the loop when None
+        """
+        self.min_size = min_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.executor_size = executor_size
+        self.executor = executor
+        self.encodings: Tuple[str, ...] = (
+            ("br", "gzip") if supports_brotli() else ("gzip",)
+        )
+
+    def select_encoding(self, accept_encoding: str) -> Optional[str]:
+        """Return the preferred encoding accepted by a client, if any."""
+        if not accept_encoding:
+            return None
+        codings = parse_accept_encoding(accept_encoding)
+        default = codings.get("*", 0.0)
+        for encoding in self.encodings:
+            if codings.get(encoding, default) > 0:
+                return encoding
+        return None
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress a body."""
+        if encoding == "br":
+            return cast(bytes, brotli.compress(body, quality=self.brotli_quality))
+        return gzip.compress(body, compresslevel=self.level)
+
+    async def compress_response(
+        self, response: Response, accept_encoding: str
+    ) -> Response:
+        """Compress the body of a response, when large enough."""
+        body = response.body
+        if not isinstance(body, bytes) or "Content-Encoding" in response.headers:
+            return response
+        if len(body) < self.min_size:
+            return response
+        vary = response.headers.get("Vary")
+        if vary is None:
+            response.headers["Vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in (v.strip().lower() for v in vary.split(",")):
+            response.headers["Vary"] = vary + ", Accept-Encoding"
+        encoding = self.select_encoding(accept_encoding)
+        if encoding is None:
+            return response
+
+        if len(body) >= self.executor_size:
+            loop = asyncio.get_event_loop()
+            body = await loop.run_in_executor(
+                self.executor, partial(self.compress, body, encoding)
+            )
+        else:
+            body = self.compress(body, encoding)
+        response.body = body
+        response.headers["Content-Encoding"] = encoding
+        etag = response.headers.get("ETag")
+        if etag is not None and not etag.startswith("W/"):
+            # the encoded body differs from the one the strong ETag identifies
+            response.headers["ETag"] = "W/" + etag
+        return response
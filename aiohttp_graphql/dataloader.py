@@ -0,0 +1,113 @@
+"""Batching and caching of the loads made while resolving a request."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+BatchLoadFn = Callable[[List[Any]], Awaitable[List[Any]]]
+
+
+class DataLoader:
+    """
+    Batch the keys loaded during an event loop iteration into a single call.
+
+    Loaders are meant to live for a single request: loaded values are
+    memoized by key, so a loader shared between requests would serve stale
+    values.
+    """
+
+    def __init__(
+        self,
+        batch_load_fn: BatchLoadFn,
+        max_batch_size: Optional[int] = None,
+        cache: bool = True,
+    ):
+        """
+        Init.
+
+        :param batch_load_fn: coroutine function loading a list of keys, returning
+            the values in the same order, or exceptions for the keys that failed
+        :param max_batch_size: maximum number of keys passed to batch_load_fn
+        :param cache: whether the values are memoized by key
+        """
+        self.batch_load_fn = batch_load_fn
+        self.max_batch_size = max_batch_size
+        self.cache = cache
+        self._cache: Dict[Any, "asyncio.Future[Any]"] = {}
+        self._queue: List[Tuple[Any, "asyncio.Future[Any]"]] = []
+
+    def load(self, key: Any) -> "asyncio.Future[Any]":
+        """Return a future resolved with the value of a key."""
+        if self.cache:
+            future = self._cache.get(key)
+            if future is not None:
+                return future
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        if self.cache:
+            self._cache[key] = future
+
+        if not self._queue:
+            loop.call_soon(self.dispatch)
+        self._queue.append((key, future))
+        return future
+
+    async def load_many(self, keys: Iterable[Any]) -> List[Any]:
+        """Return the values of several keys."""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: Any, value: Any) -> None:
+        """Memoize the value of a key, unless it is already known."""
+        if not self.cache or key in self._cache:
+            return
+        future = asyncio.get_event_loop().create_future()
+        if isinstance(value, Exception):
+            future.set_exception(value)
+        else:
+            future.set_result(value)
+        self._cache[key] = future
+
+    def clear(self, key: Any) -> None:
+        """Forget the value of a key."""
+        self._cache.pop(key, None)
+
+    def clear_all(self) -> None:
+        """Forget the values of all the keys."""
+        self._cache.clear()
+
+    def dispatch(self) -> None:
+        """Load the queued keys, in batches of at most max_batch_size keys."""
+        queue, self._queue = self._queue, []
+        size = self.max_batch_size or len(queue)
+        for start in range(0, len(queue), size):
+            end = start + size
+            asyncio.ensure_future(self.load_batch(queue[start:end]))
+
+    async def load_batch(self, batch: List[Tuple[Any, "asyncio.Future[Any]"]]) -> None:
+        """Resolve the futures of a batch of keys."""
+        keys = [key for key, _ in batch]
+        try:
+            values = await self.batch_load_fn(keys)
+            if len(values) != len(keys):
+                raise TypeError(
+                    "batch_load_fn must return a list of {} values, got {}.".format(
+                        len(keys), len(values)
+                    )
+                )
+        except Exception as error:
+            for key, future in batch:
+                self.fail(key, future, error)
+            return
+
+        for (key, future), value in zip(batch, values):
+            if isinstance(value, Exception):
+                self.fail(key, future, value)
+            elif not future.done():
+                future.set_result(value)
+
+    def fail(self, key: Any, future: "asyncio.Future[Any]", error: Exception) -> None:
+        """Reject the future of a key, which is not memoized so it can be retried."""
+        if self._cache.get(key) is future:
+            del self._cache[key]
+        if not future.done():
+            future.set_exception(error)
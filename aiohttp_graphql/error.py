@@ -0,0 +1,28 @@
+"""Errors raised while handling GraphQL requests."""
+
+from typing import Any, Dict, Optional
+
+
+class HttpQueryError(Exception):
+    """A request error answered with an HTTP status instead of a GraphQL result."""
+
+    def __init__(
+        self,
+        status_code: int,
+        message: str,
+        headers: Optional[Dict[str, str]] = None,
+        extensions: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Init.
+
+        :param status_code: HTTP status of the response
+        :param message: error message
+        :param headers: extra HTTP headers of the response
+        :param extensions: extensions of the reported error
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.headers = headers
+        self.extensions = extensions
@@ -0,0 +1,222 @@
+"""Caching of the results of expensive resolvers."""
+
+import json
+import time
+from collections import OrderedDict
+from inspect import isawaitable
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, cast
+
+from graphql import GraphQLNamedType, GraphQLResolveInfo, IntValueNode
+from graphql.pyutils import AwaitableOrValue
+
+CACHED_DIRECTIVE = "cached"
+
+NOT_CACHED = object()
+
+
+class FieldCacheBackend:
+    """
+    Base class for field cache backends.
+
+    Both methods may return awaitables, for backends accessed over the
+    network.
+    """
+
+    def get(self, key: Hashable) -> AwaitableOrValue[Any]:
+        """Return the value cached for a key, or NOT_CACHED."""
+        raise NotImplementedError()
+
+    def put(self, key: Hashable, value: Any, ttl: float) -> AwaitableOrValue[None]:
+        """Cache a value for a key, for ttl seconds."""
+        raise NotImplementedError()
+
+
+class InMemoryFieldCacheBackend(FieldCacheBackend):
+    """Bounded LRU field cache kept in memory."""
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Init.
+
+        :param max_entries: maximum number of values kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached values."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Return the value cached for a key, or NOT_CACHED."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return NOT_CACHED
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return NOT_CACHED
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Cache a value for a key, for ttl seconds."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def get_cached_ttl(node: Any) -> Optional[float]:
+    """Return the ttl of the @cached directive of a field definition, if any."""
+    for directive in getattr(node, "directives", None) or ():
+        if directive.name.value != CACHED_DIRECTIVE:
+            continue
+        for argument in directive.arguments or ():
+            if argument.name.value == "ttl" and isinstance(
+                argument.value, IntValueNode
+            ):
+                return float(argument.value.value)
+    return None
+
+
+def default_parent_key(parent: Any) -> Hashable:
+    """Return the id of a parent object, if it has one."""
+    if isinstance(parent, dict):
+        return cast(Hashable, parent.get("id"))
+    return cast(Hashable, getattr(parent, "id", None))
+
+
+class FieldCacheMiddleware:
+    """
+    Middleware caching the results of resolvers for a TTL.
+
+    Cached fields are declared with a @cached(ttl: Int!) directive in the
+    schema SDL, or in a map of ttls keyed by "Type.field". Results are keyed by
+    type, field, arguments and, for fields of non-root types, the key of the
+    parent object, which is its id by default; fields whose parent has no key
+    are not cached. Mutation fields are never cached.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[FieldCacheBackend] = None,
+        fields: Optional[Dict[str, float]] = None,
+        scope_key: Optional[Callable[[Any], Hashable]] = None,
+        parent_key: Callable[[Any], Hashable] = default_parent_key,
+    ):
+        """
+        Init.
+
+        :param backend: backend storing the results, in memory by default
+        :param fields: ttls of the cached fields, keyed by "Type.field"
+        :param scope_key: function returning a key from the context, caching
+            results separately by user or tenant
+        :param parent_key: function returning the key of a parent object
+        """
+        self.backend = backend if backend is not None else InMemoryFieldCacheBackend()
+        self.fields = fields or {}
+        self.scope_key = scope_key
+        self.parent_key = parent_key
+        self._ttls: Dict[Tuple[str, str], Optional[float]] = {}
+
+    def get_ttl(
+        self, parent_type: GraphQLNamedType, field_name: str
+    ) -> Optional[float]:
+        """Return the ttl of a field, None when it is not cached."""
+        try:
+            return self._ttls[parent_type.name, field_name]
+        except KeyError:
+            pass
+        ttl = self.fields.get("{}.{}".format(parent_type.name, field_name))
+        if ttl is None:
+            field = getattr(parent_type, "fields", {}).get(field_name)
+            ttl = get_cached_ttl(field.ast_node) if field is not None else None
+        self._ttls[parent_type.name, field_name] = ttl
+        return ttl
+
+    def get_key(
+        self, root: Any, info: GraphQLResolveInfo, args: Dict[str, Any]
+    ) -> Optional[Hashable]:
+        """Return the key of the result of a field, None when not cacheable."""
+        parent_type = info.parent_type
+        if parent_type is info.schema.mutation_type:
+            return None
+        parent = None
+        if parent_type is not info.schema.query_type:
+            parent = self.parent_key(root)
+            if parent is None:
+                return None
+        return (
+            parent_type.name,
+            info.field_name,
+            json.dumps(args, sort_keys=True, default=str),
+            parent,
+            self.scope_key(info.context) if self.scope_key else None,
+        )
+
+    def resolve(
+        self,
+        next_: Callable[..., Any],
+        root: Any,
+        info: GraphQLResolveInfo,
+        **args: Any
+    ) -> Any:
+        """Resolve a field, from the cache when possible."""
+        ttl = self.get_ttl(info.parent_type, info.field_name)
+        if ttl is None:
+            return next_(root, info, **args)
+        key = self.get_key(root, info, args)
+        if key is None:
+            return next_(root, info, **args)
+
+        cached = self.backend.get(key)
+        if isawaitable(cached):
+            return self.resolve_async(cached, key, ttl, next_, root, info, args)
+        if cached is not NOT_CACHED:
+            return cached
+        return self.store(key, ttl, next_(root, info, **args))
+
+    async def resolve_async(
+        self,
+        cached: Any,
+        key: Hashable,
+        ttl: float,
+        next_: Callable[..., Any],
+        root: Any,
+        info: GraphQLResolveInfo,
+        args: Dict[str, Any],
+    ) -> Any:
+        """Resolve a field, from a cache backend returning awaitables."""
+        cached = await cached
+        if cached is not NOT_CACHED:
+            return cached
+        result = self.store(key, ttl, next_(root, info, **args))
+        if isawaitable(result):
+            result = await result
+        return result
+
+    def store(self, key: Hashable, ttl: float, result: Any) -> Any:
+        """Cache the result of a resolver, returning it."""
+        if isawaitable(result):
+            return self.store_async(key, ttl, result)
+        stored = self.backend.put(key, result, ttl)
+        if isawaitable(stored):
+            return self.return_stored(cast(Awaitable[None], stored), result)
+        return result
+
+    async def store_async(self, key: Hashable, ttl: float, result: Any) -> Any:
+        """Cache the awaited result of a resolver, returning it."""
+        value = await result
+        stored = self.backend.put(key, value, ttl)
+        if isawaitable(stored):
+            await cast(Awaitable[None], stored)
+        return value
+
+    async def return_stored(self, stored: Awaitable[None], result: Any) -> Any:
+        """Return a result once it is stored."""
+        await stored
+        return result
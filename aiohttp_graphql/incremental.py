@@ -0,0 +1,71 @@
+"""Incremental delivery of results deferred or streamed with @defer and @stream."""
+
+from typing import Any, Dict
+
+from aiohttp.web import Request, StreamResponse
+
+try:
+    from graphql.execution import (  # type: ignore
+        ExperimentalIncrementalExecutionResults as IncrementalResults,
+        experimental_execute_incrementally,
+    )
+except ImportError:  # pragma: no cover
+    IncrementalResults = None
+    experimental_execute_incrementally = None
+
+
+MULTIPART_BOUNDARY = "-"
+PART_HEADER = b"\r\n---\r\nContent-Type: application/json; charset=utf-8\r\n\r\n"
+TERMINATOR = b"\r\n-----\r\n"
+
+
+def supports_incremental_delivery() -> bool:
+    """Return whether the installed graphql-core executes @defer and @stream."""
+    return experimental_execute_incrementally is not None
+
+
+def is_incremental_results(result: Any) -> bool:
+    """Return whether an execution returned results delivered incrementally."""
+    return IncrementalResults is not None and isinstance(result, IncrementalResults)
+
+
+async def close_incremental_results(results: Any) -> None:
+    """Stop the execution of the results not delivered yet."""
+    await results.subsequent_results.aclose()
+
+
+async def write_multipart_response(
+    request: Request, results: Any, encode: Any
+) -> StreamResponse:
+    """
+    Write incremental results as the parts of a multipart/mixed response.
+
+    :param request: aiohttp Request
+    :param results: initial result and iterator of the subsequent ones
+    :param encode: JSON encoder of each payload
+    :return: aiohttp StreamResponse
+    """
+    response = StreamResponse(
+        headers={
+            "Content-Type": 'multipart/mixed; boundary="{}"'.format(MULTIPART_BOUNDARY)
+        }
+    )
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+
+    async def write_part(payload: Dict[str, Any]) -> None:
+        encoded = encode(payload)
+        if isinstance(encoded, str):
+            encoded = encoded.encode("utf-8")
+        await response.write(PART_HEADER + encoded)
+
+    try:
+        await write_part(results.initial_result.formatted)
+        async for result in results.subsequent_results:
+            await write_part(result.formatted)
+    finally:
+        await close_incremental_results(results)
+
+    await response.write(TERMINATOR)
+    await response.write_eof()
+    return response
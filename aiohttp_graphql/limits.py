@@ -0,0 +1,85 @@
+"""Admission control for the GraphQL view."""
+
+import asyncio
+from collections import deque
+from typing import Deque, Optional
+
+from .error import HttpQueryError
+
+
+class ConcurrencyLimiter:
+    """
+    Bounded number of operations executed at once, with a bounded wait queue.
+
+    Operations arriving while the queue is full, or waiting longer than
+    queue_timeout, are rejected with a 503 response rather than delaying
+    every other operation.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int = 0,
+        queue_timeout: Optional[float] = None,
+        retry_after: int = 1,
+    ):
+        """
+        Init.
+
+        :param max_in_flight: maximum number of operations executed at once
+        :param max_queue: maximum number of operations waiting for their turn
+        :param queue_timeout: maximum time an operation waits, in seconds
+        :param retry_after: Retry-After header of the rejections, in seconds
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.rejected = 0
+        self._waiters: "Deque[asyncio.Future[None]]" = deque()
+
+    @property
+    def queued(self) -> int:
+        """Return the number of operations waiting for their turn."""
+        return len(self._waiters)
+
+    def overloaded(self) -> HttpQueryError:
+        """Return the error rejecting an operation."""
+        self.rejected += 1
+        return HttpQueryError(
+            503,
+            "The server is overloaded, retry later.",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    async def acquire(self) -> None:
+        """Wait for a slot, raising HttpQueryError when saturated."""
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self.overloaded()
+
+        future = asyncio.get_event_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except BaseException as error:
+            if future.cancelled():
+                self._waiters.remove(future)
+            else:
+                # the slot was handed over as the wait got interrupted
+                self.release()
+            if isinstance(error, asyncio.TimeoutError):
+                raise self.overloaded()
+            raise
+
+    def release(self) -> None:
+        """Hand the slot over to the next operation waiting, if any."""
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
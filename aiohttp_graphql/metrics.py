@@ -0,0 +1,335 @@
+"""Metrics of the GraphQL view, exposed in the Prometheus text format."""
+
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from aiohttp.web import Request, Response
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+OTHER_OPERATIONS = "__other__"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Sample = Tuple[str, Dict[str, str], Any]
+Metric = Tuple[str, str, str, List[Sample]]
+
+
+class Histogram:
+    """Histogram of durations, in seconds."""
+
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Init.
+
+        :param buckets: sorted upper bounds of the buckets
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Count a value in its bucket."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        """Return the number of values observed."""
+        return sum(self.counts)
+
+    def samples(self) -> Iterator[Tuple[str, float]]:
+        """Return the cumulative counts of the buckets, keyed by le."""
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield "{:g}".format(bound), total
+        yield "+Inf", total + self.counts[-1]
+
+
+def escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    """Format the labels of a sample."""
+    if not labels:
+        return ""
+    return "{{{}}}".format(
+        ",".join(
+            '{}="{}"'.format(name, escape(value)) for name, value in labels.items()
+        )
+    )
+
+
+class GraphQLMetrics:
+    """
+    Metrics of a GraphQL view, served by a text endpoint for Prometheus.
+
+    Counts and histograms are updated without locks: they are only written
+    from the event loop, apart from the rare observations of operations run
+    in an executor. Gauges of the view, such as the hits of its caches and
+    the state of its limiters, are read when the endpoint is scraped.
+    """
+
+    def __init__(
+        self,
+        url: str = "/metrics",
+        namespace: str = "graphql",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        max_operations: int = 100,
+    ):
+        """
+        Init.
+
+        :param url: metrics URL
+        :param namespace: prefix of the metric names
+        :param buckets: upper bounds of the buckets of the duration histograms,
+            in seconds
+        :param max_operations: maximum number of operation names labelling the
+            metrics, further operations being counted as __other__
+        """
+        self.url = url
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self.max_operations = max_operations
+        self.views: List[Any] = []
+        self.in_flight = 0
+        self.requests = Histogram(self.buckets)
+        self.operations: Dict[str, Histogram] = {}
+        self.phases: Dict[str, Histogram] = {}
+        self.errors: Dict[str, int] = {}
+
+    def register(self, view: Any) -> None:
+        """Report the gauges of a GraphQL view."""
+        self.views.append(view)
+
+    def observe_request(self, duration: float) -> None:
+        """Observe the duration of a request."""
+        self.requests.observe(duration)
+
+    def observe_operation(self, operation_name: Optional[str], duration: float) -> None:
+        """Observe the duration of an operation."""
+        name = operation_name or ""
+        histogram = self.operations.get(name)
+        if histogram is None:
+            if len(self.operations) >= self.max_operations:
+                name = OTHER_OPERATIONS
+                histogram = self.operations.get(name)
+            if histogram is None:
+                histogram = self.operations[name] = Histogram(self.buckets)
+        histogram.observe(duration)
+
+    def observe_phase(self, phase: str, duration: float) -> None:
+        """Observe the duration of a phase: parse, validate, execute or encode."""
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = Histogram(self.buckets)
+        histogram.observe(duration)
+
+    def observe_errors(self, errors: Optional[Iterable[Any]]) -> None:
+        """Count errors by type, using the type of their original error."""
+        for error in errors or ():
+            original_error = getattr(error, "original_error", None)
+            name = type(original_error or error).__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def time_phase(self, phase: str) -> "PhaseTimer":
+        """Return a context manager observing the duration of a phase."""
+        return PhaseTimer(self, phase)
+
+    def collect(self) -> Iterator[Metric]:
+        """
+        Return the metrics.
+
+        Each metric is a name, type, help text and list of sample suffixes and
+        labels with their values.
+        """
+        yield (
+            "requests_in_flight",
+            "gauge",
+            "Requests being handled.",
+            [("", {}, self.in_flight)],
+        )
+        yield (
+            "request_duration_seconds",
+            "histogram",
+            "Duration of the requests.",
+            list(self.histogram_samples(self.requests, {})),
+        )
+        yield (
+            "operation_duration_seconds",
+            "histogram",
+            "Duration of the operations, by operation name.",
+            [
+                sample
+                for name, histogram in sorted(self.operations.items())
+                for sample in self.histogram_samples(histogram, {"operation": name})
+            ],
+        )
+        yield (
+            "phase_duration_seconds",
+            "histogram",
+            "Duration of the phases of the operations.",
+            [
+                sample
+                for phase, histogram in sorted(self.phases.items())
+                for sample in self.histogram_samples(histogram, {"phase": phase})
+            ],
+        )
+        yield (
+            "errors_total",
+            "counter",
+            "Errors, by type.",
+            [
+                ("", {"type": name}, count)
+                for name, count in sorted(self.errors.items())
+            ],
+        )
+        for metric in self.collect_views():
+            yield metric
+
+    def collect_views(self) -> Iterator[Metric]:
+        """Return the gauges of the registered views."""
+        samples: Dict[Tuple[str, str, str], List[Sample]] = {}
+
+        def add(name: str, kind: str, text: str, value: Any, **labels: str) -> None:
+            samples.setdefault((name, kind, text), []).append(("", labels, value))
+
+        for view in self.views:
+            for cache_name in ("document_cache", "response_cache"):
+                cache = getattr(view, cache_name, None)
+                if cache is not None:
+                    name = cache_name.replace("_", " ").capitalize()
+                    add(
+                        cache_name + "_hits_total",
+                        "counter",
+                        name + " hits.",
+                        cache.hits,
+                    )
+                    add(
+                        cache_name + "_misses_total",
+                        "counter",
+                        name + " misses.",
+                        cache.misses,
+                    )
+            add(
+                "execution_timeouts_total",
+                "counter",
+                "Operations timed out.",
+                view.execution_timeouts,
+            )
+            if view.executor is not None:
+                add(
+                    "executor_queue_depth",
+                    "gauge",
+                    "Operations waiting for the executor.",
+                    view.executor_queue_depth,
+                )
+                add(
+                    "executor_in_flight",
+                    "gauge",
+                    "Operations running in the executor.",
+                    view.executor_in_flight,
+                )
+            for limiter_name in ("limiter", "mutation_limiter"):
+                limiter = getattr(view, limiter_name, None)
+                if limiter is None:
+                    continue
+                add(
+                    "limiter_in_flight",
+                    "gauge",
+                    "Operations admitted by the limiters.",
+                    limiter.in_flight,
+                    limiter=limiter_name,
+                )
+                add(
+                    "limiter_queued",
+                    "gauge",
+                    "Operations waiting for the limiters.",
+                    limiter.queued,
+                    limiter=limiter_name,
+                )
+                add(
+                    "limiter_rejected_total",
+                    "counter",
+                    "Operations rejected by the limiters.",
+                    limiter.rejected,
+                    limiter=limiter_name,
+                )
+
+        for (name, kind, text), metric_samples in samples.items():
+            yield name, kind, text, metric_samples
+
+    @staticmethod
+    def histogram_samples(
+        histogram: Histogram, labels: Dict[str, str]
+    ) -> Iterator[Sample]:
+        """Return the samples of a histogram."""
+        for bound, count in histogram.samples():
+            yield "_bucket", dict(labels, le=bound), count
+        yield "_sum", labels, histogram.sum
+        yield "_count", labels, histogram.count
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text format."""
+        lines = []
+        for name, kind, text, samples in self.collect():
+            name = "{}_{}".format(self.namespace, name) if self.namespace else name
+            lines.append("# HELP {} {}".format(name, text))
+            lines.append("# TYPE {} {}".format(name, kind))
+            for suffix, labels, value in samples:
+                lines.append(
+                    "{}{}{} {}".format(name, suffix, format_labels(labels), value)
+                )
+        return "\n".join(lines) + "\n"
+
+    async def view(self, request: Request) -> Response:
+        """Return an aiohttp view."""
+        return Response(
+            body=self.render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+
+class PhaseTimer:
+    """Context manager observing the duration of a phase."""
+
+    __slots__ = ("metrics", "phase", "start")
+
+    def __init__(self, metrics: GraphQLMetrics, phase: str):
+        """
+        Init.
+
+        :param metrics: metrics observing the duration
+        :param phase: name of the phase
+        """
+        self.metrics = metrics
+        self.phase = phase
+        self.start = 0.0
+
+    def __enter__(self) -> "PhaseTimer":
+        """Start timing the phase."""
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Observe the duration of the phase."""
+        self.metrics.observe_phase(self.phase, perf_counter() - self.start)
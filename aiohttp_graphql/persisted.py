@@ -0,0 +1,123 @@
+"""Persisted queries for the GraphQL view."""
+
+import json
+from collections import OrderedDict
+from hashlib import sha256
+from typing import Callable, Dict, List, Mapping, Optional
+
+from graphql import GraphQLError, GraphQLSchema, parse, validate
+
+from .cache import CachedDocument
+
+
+def query_hash(query: str) -> str:
+    """Return the hex SHA-256 hash identifying a persisted query."""
+    return sha256(query.encode("utf-8")).hexdigest()
+
+
+class PersistedQueryStore:
+    """Base class for persisted query stores."""
+
+    async def get(self, sha256_hash: str) -> Optional[str]:
+        """Return the query registered for a hash, if any."""
+        raise NotImplementedError()
+
+    async def put(self, sha256_hash: str, query: str) -> None:
+        """Register the query for a hash."""
+        raise NotImplementedError()
+
+
+class InMemoryPersistedQueryStore(PersistedQueryStore):
+    """Bounded LRU persisted query store kept in memory."""
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Init.
+
+        :param max_entries: maximum number of queries kept
+        """
+        self.max_entries = max_entries
+        self._queries: "OrderedDict[str, str]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of registered queries."""
+        return len(self._queries)
+
+    async def get(self, sha256_hash: str) -> Optional[str]:
+        """Return the query registered for a hash, if any."""
+        query = self._queries.get(sha256_hash)
+        if query is not None:
+            self._queries.move_to_end(sha256_hash)
+        return query
+
+    async def put(self, sha256_hash: str, query: str) -> None:
+        """Register the query for a hash."""
+        self._queries[sha256_hash] = query
+        self._queries.move_to_end(sha256_hash)
+        while len(self._queries) > self.max_entries:
+            self._queries.popitem(last=False)
+
+
+class QueryAllowlist:
+    """Trusted operations registered ahead of time, keyed by their id."""
+
+    def __init__(self, queries: Mapping[str, str]):
+        """
+        Init.
+
+        :param queries: mapping of operation ids to query texts
+        """
+        self.queries = dict(queries)
+        self._documents: Dict[str, CachedDocument] = {}
+        self._documents_by_query: Dict[str, CachedDocument] = {}
+
+    @classmethod
+    def from_file(cls, path: str) -> "QueryAllowlist":
+        """Load a JSON manifest mapping operation ids to query texts."""
+        with open(path, "r") as manifest:
+            return cls(json.load(manifest))
+
+    def __len__(self) -> int:
+        """Return the number of trusted operations."""
+        return len(self.queries)
+
+    def prepare(
+        self,
+        schema: GraphQLSchema,
+        validate_document: Optional[
+            Callable[[CachedDocument], List[GraphQLError]]
+        ] = None,
+    ) -> None:
+        """
+        Parse and validate every trusted operation against a schema.
+
+        Syntax errors are raised right away, validation errors are kept and
+        reported when the operation is requested.
+
+        :param schema: schema of the operations
+        :param validate_document: function validating a document and storing
+            the outcome in it, such as the one of the view applying its
+            limits, instead of the specified rules
+        """
+        self._documents = {}
+        self._documents_by_query = {}
+        for document_id, query in self.queries.items():
+            cached = self._documents_by_query.get(query)
+            if cached is None:
+                cached = CachedDocument(parse(query))
+                if validate_document is not None:
+                    validate_document(cached)
+                else:
+                    cached.set_validation_errors(
+                        schema, validate(schema, cached.document)
+                    )
+                self._documents_by_query[query] = cached
+            self._documents[document_id] = cached
+
+    def get(self, document_id: str) -> Optional[CachedDocument]:
+        """Return the compiled document for an operation id, if trusted."""
+        return self._documents.get(document_id)
+
+    def get_by_query(self, query: str) -> Optional[CachedDocument]:
+        """Return the compiled document for a query text, if trusted."""
+        return self._documents_by_query.get(query)
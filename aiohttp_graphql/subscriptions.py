@@ -0,0 +1,432 @@
+"""GraphQL subscriptions over WebSocket and Server-Sent Events."""
+
+import asyncio
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    cast,
+)
+
+from aiohttp import WSMsgType
+from aiohttp.web import Request, StreamResponse, WebSocketResponse
+
+from graphql import (
+    ExecutionResult,
+    GraphQLError,
+    OperationType,
+    get_operation_ast,
+    subscribe,
+)
+
+from .error import HttpQueryError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import GraphQLView  # noqa: F401
+
+
+GRAPHQL_TRANSPORT_WS = "graphql-transport-ws"
+
+
+class OperationErrors(Exception):
+    """Errors preventing an operation from being executed."""
+
+    def __init__(self, errors: List[GraphQLError]):
+        """
+        Init.
+
+        :param errors: request or validation errors
+        """
+        super().__init__(errors)
+        self.errors = errors
+
+
+async def start_operation(
+    view: "GraphQLView",
+    data: Dict[str, Any],
+    context: Any,
+    allow_mutations: bool = True,
+) -> AsyncIterator[ExecutionResult]:
+    """
+    Start an operation, returning an iterator of its results.
+
+    Subscriptions yield a result per event and other operations a single
+    result. Operations go through the same checks and limiters as the ones
+    sent over HTTP: subscriptions are admitted by the limiter while their
+    source is created, and other operations while they are executed.
+
+    Errors preventing the execution are raised as OperationErrors, and
+    requests rejected by the view as HttpQueryError.
+    """
+    query = await view.load_query(data)
+    cached = view.get_allowlisted_document(query, data.get("documentId"))
+    if cached is None:
+        if not query:
+            raise OperationErrors([GraphQLError("Must provide query string.")])
+        try:
+            cached = view.parse_document(query)
+        except GraphQLError as error:
+            raise OperationErrors([error])
+
+    errors = view.get_schema_validation_errors() or view.validate_document(cached)
+    if errors:
+        raise OperationErrors(errors)
+
+    document = cached.document
+    operation_name = data.get("operationName")
+    variables = data.get("variables") or {}
+    op = get_operation_ast(document, operation_name)
+
+    if op is not None and op.operation == OperationType.SUBSCRIPTION:
+        limiter = view.get_limiter(op)
+        if limiter is not None:
+            await limiter.acquire()
+        try:
+            source = await subscribe(
+                view.schema,
+                document,
+                view.root_value,
+                context,
+                variables,
+                operation_name,
+            )
+        finally:
+            if limiter is not None:
+                limiter.release()
+        if isinstance(source, ExecutionResult):
+            raise OperationErrors(source.errors or [])
+        return source
+
+    if not allow_mutations and op is not None:
+        if op.operation == OperationType.MUTATION:
+            raise OperationErrors(
+                [
+                    GraphQLError(
+                        "Can only perform a mutation operation from a POST request."
+                    )
+                ]
+            )
+
+    result = await view.execute_operation(
+        document, op, variables, operation_name, context
+    )
+
+    async def execute() -> AsyncIterator[ExecutionResult]:
+        yield result
+
+    return execute()
+
+
+async def close_results(results: AsyncIterator[ExecutionResult]) -> None:
+    """Close an iterator of results, stopping the source of a subscription."""
+    await cast(AsyncGenerator[ExecutionResult, None], results).aclose()
+
+
+def source_error(error: Exception) -> ExecutionResult:
+    """Return the result reporting an error raised by the source of results."""
+    if not isinstance(error, GraphQLError):
+        error = GraphQLError(str(error), original_error=error)
+    return ExecutionResult(data=None, errors=[error])
+
+
+class GraphQLTransportWSHandler:
+    """
+    A GraphQL over WebSocket connection using the graphql-transport-ws protocol.
+
+    Each operation runs in its own task, which awaits every message it sends.
+    A slow consumer therefore stops the source of its subscriptions from being
+    iterated until the socket is drained.
+    """
+
+    def __init__(
+        self,
+        view: "GraphQLView",
+        request: Request,
+        keep_alive: Optional[float] = 12.0,
+        connection_init_wait_timeout: float = 3.0,
+    ):
+        """
+        Init.
+
+        :param view: GraphQL view running the operations
+        :param request: aiohttp Request upgraded to a WebSocket
+        :param keep_alive: interval between server pings, in seconds
+        :param connection_init_wait_timeout: time allowed for connection_init
+        """
+        self.view = view
+        self.request = request
+        self.keep_alive = keep_alive
+        self.connection_init_wait_timeout = connection_init_wait_timeout
+        self.ws = WebSocketResponse(protocols=(GRAPHQL_TRANSPORT_WS,))
+        self.connection_init_received = False
+        self.connection_acknowledged = False
+        self.connection_params: Any = None
+        self.operations: Dict[str, "asyncio.Future[None]"] = {}
+        self.closing: "Optional[asyncio.Future[bool]]" = None
+
+    async def handle(self) -> WebSocketResponse:
+        """Serve the connection until it is closed."""
+        await self.ws.prepare(self.request)
+        if self.ws.ws_protocol != GRAPHQL_TRANSPORT_WS:
+            await self.ws.close(code=4406, message=b"Subprotocol not acceptable")
+            return self.ws
+
+        timers = [asyncio.ensure_future(self.wait_for_connection_init())]
+        if self.keep_alive:
+            timers.append(asyncio.ensure_future(self.ping()))
+
+        try:
+            async for message in self.ws:
+                if message.type == WSMsgType.TEXT:
+                    await self.on_message(message.data)
+                else:
+                    await self.close(4400, "Invalid message received")
+        finally:
+            tasks = timers + list(self.operations.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.operations.clear()
+            if self.closing is not None:
+                await self.closing
+
+        return self.ws
+
+    async def on_message(self, data: str) -> None:
+        """Handle a message sent by the client."""
+        try:
+            message = self.view.json_loads(data)
+            message_type = message["type"]
+        except (ValueError, KeyError, TypeError):
+            await self.close(4400, "Invalid message received")
+            return
+
+        if message_type == "connection_init":
+            if self.connection_init_received:
+                await self.close(4429, "Too many initialisation requests")
+                return
+            self.connection_init_received = True
+            self.connection_params = message.get("payload")
+            await self.send({"type": "connection_ack"})
+            self.connection_acknowledged = True
+        elif message_type == "ping":
+            await self.send({"type": "pong"})
+        elif message_type == "pong":
+            pass
+        elif message_type == "subscribe":
+            if not self.connection_acknowledged:
+                await self.close(4401, "Unauthorized")
+                return
+            operation_id = message.get("id")
+            payload = message.get("payload")
+            if not isinstance(operation_id, str) or not isinstance(payload, dict):
+                await self.close(4400, "Invalid message received")
+                return
+            if operation_id in self.operations:
+                await self.close(
+                    4409, "Subscriber for {} already exists".format(operation_id)
+                )
+                return
+            self.operations[operation_id] = asyncio.ensure_future(
+                self.run_operation(operation_id, payload)
+            )
+        elif message_type == "complete":
+            task = self.operations.pop(message.get("id"), None)
+            if task is not None:
+                task.cancel()
+        else:
+            await self.close(4400, "Invalid message received")
+
+    async def run_operation(self, operation_id: str, payload: Dict[str, Any]) -> None:
+        """Run an operation, sending its results to the client."""
+        task = self.operations.get(operation_id)
+        context = self.view.get_context(self.request)
+        try:
+            try:
+                results = await start_operation(self.view, payload, context)
+            except (OperationErrors, HttpQueryError) as error:
+                if isinstance(error, HttpQueryError):
+                    errors = [GraphQLError(error.message, extensions=error.extensions)]
+                else:
+                    errors = error.errors
+                formatted = self.view.format_result(
+                    ExecutionResult(data=None, errors=errors), invalid=True
+                )
+                await self.send(
+                    {
+                        "id": operation_id,
+                        "type": "error",
+                        "payload": formatted["errors"],
+                    }
+                )
+                return
+
+            try:
+                async for result in results:
+                    await self.send(
+                        {
+                            "id": operation_id,
+                            "type": "next",
+                            "payload": self.view.format_result(result),
+                        }
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                # report the failure of the source, then complete the operation
+                await self.send(
+                    {
+                        "id": operation_id,
+                        "type": "next",
+                        "payload": self.view.format_result(source_error(error)),
+                    }
+                )
+            finally:
+                await close_results(results)
+        finally:
+            if self.operations.get(operation_id) is task:
+                del self.operations[operation_id]
+
+        await self.send({"id": operation_id, "type": "complete"})
+
+    async def wait_for_connection_init(self) -> None:
+        """Close the connection if it is not initialised in time."""
+        await asyncio.sleep(self.connection_init_wait_timeout)
+        if not self.connection_init_received:
+            await self.close(4408, "Connection initialisation timeout")
+
+    async def ping(self) -> None:
+        """Ping the client periodically to keep the connection alive."""
+        while not self.ws.closed:
+            await asyncio.sleep(cast(float, self.keep_alive))
+            await self.send({"type": "ping"})
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        """Send a message to the client, unless the connection is closed."""
+        if self.ws.closed:
+            return
+        encoded = self.view.json_encode(message)
+        await self.ws.send_str(
+            encoded.decode("utf-8") if isinstance(encoded, bytes) else encoded
+        )
+
+    async def close(self, code: int, reason: str) -> None:
+        """Close the connection."""
+        # timers closing the connection are cancelled once the socket stops
+        # being read, which must not interrupt the closing handshake
+        self.closing = asyncio.ensure_future(
+            self.ws.close(code=code, message=reason.encode("utf-8"))
+        )
+        await asyncio.shield(self.closing)
+
+
+class GraphQLEventStreamHandler:
+    """
+    An operation streamed as Server-Sent Events.
+
+    Results go through a bounded queue, so the source of a subscription stops
+    being iterated while the client is slow, and heartbeat comments are sent
+    while no result is available.
+    """
+
+    def __init__(
+        self,
+        view: "GraphQLView",
+        request: Request,
+        heartbeat: Optional[float] = 12.0,
+        queue_size: int = 16,
+    ):
+        """
+        Init.
+
+        :param view: GraphQL view running the operation
+        :param request: aiohttp Request
+        :param heartbeat: interval between heartbeat comments, in seconds
+        :param queue_size: maximum number of results waiting to be sent
+        """
+        self.view = view
+        self.request = request
+        self.heartbeat = heartbeat
+        self.queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=queue_size)
+
+    async def handle(self, data: Dict[str, Any], context: Any) -> StreamResponse:
+        """Run an operation, streaming its results."""
+        try:
+            results = await start_operation(
+                self.view,
+                data,
+                context,
+                allow_mutations=self.request.method.lower() == "post",
+            )
+        except OperationErrors as error:
+            return self.view.encode_response(
+                self.request,
+                ExecutionResult(data=None, errors=error.errors),
+                invalid=True,
+            )
+        except HttpQueryError as error:
+            return self.view.error_response(
+                error.message,
+                error.status_code,
+                headers=error.headers,
+                extensions=error.extensions,
+            )
+
+        response = StreamResponse(
+            headers={
+                "Content-Type": "text/event-stream; charset=utf-8",
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",
+            }
+        )
+        await response.prepare(self.request)
+
+        producer = asyncio.ensure_future(self.produce(results))
+        try:
+            while True:
+                try:
+                    # waiting on the queue rather than the results lets the
+                    # heartbeat time out without cancelling the source
+                    item = await asyncio.wait_for(self.queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    await response.write(b": heartbeat\n\n")
+                    continue
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    # the headers are sent: report the error as a last event
+                    item = source_error(item)
+                await response.write(
+                    self.encode_event("next", self.view.format_result(item))
+                )
+            await response.write(self.encode_event("complete"))
+            await response.write_eof()
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+        return response
+
+    async def produce(self, results: AsyncIterator[ExecutionResult]) -> None:
+        """Move the results and any source error to the queue, ending with None."""
+        try:
+            async for result in results:
+                await self.queue.put(result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            await self.queue.put(error)
+        finally:
+            await close_results(results)
+        await self.queue.put(None)
+
+    def encode_event(self, event: str, data: Optional[Dict[str, Any]] = None) -> bytes:
+        """Encode a Server-Sent Event."""
+        encoded = self.view.json_encode(data) if data is not None else ""
+        if isinstance(encoded, str):
+            encoded = encoded.encode("utf-8")
+        return b"event: " + event.encode("utf-8") + b"\ndata: " + encoded + b"\n\n"
@@ -0,0 +1,80 @@
+"""Execution timeouts for the GraphQL view."""
+
+import asyncio
+import time
+from inspect import isawaitable
+from typing import Any, Awaitable, Callable
+
+from graphql import GraphQLError, GraphQLResolveInfo
+
+
+class ExecutionTimeoutError(GraphQLError):
+    """Error of the fields not resolved before the deadline of an operation."""
+
+    def __init__(self, timeout: float):
+        """
+        Init.
+
+        :param timeout: time allowed for the execution, in seconds
+        """
+        super().__init__(
+            "Execution timed out after {:g} seconds.".format(timeout),
+            extensions={"code": "EXECUTION_TIMEOUT"},
+        )
+
+
+class ExecutionDeadline:
+    """
+    Middleware stopping the resolution of an operation past its deadline.
+
+    Resolvers awaited past the deadline are cancelled, and resolvers not
+    started yet are not called. Both fail with an ExecutionTimeoutError, so
+    the fields resolved in time are still returned as partial data.
+    """
+
+    def __init__(self, timeout: float):
+        """
+        Init.
+
+        :param timeout: time allowed for the execution, in seconds
+        """
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout
+
+    def resolve(
+        self,
+        next_: Callable[..., Any],
+        root: Any,
+        info: GraphQLResolveInfo,
+        **args: Any
+    ) -> Any:
+        """Resolve a field, unless the deadline has passed."""
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise ExecutionTimeoutError(self.timeout)
+        result = next_(root, info, **args)
+        if isawaitable(result):
+            return self.await_result(result, remaining)
+        return result
+
+    async def await_result(self, result: Awaitable[Any], remaining: float) -> Any:
+        """
+        Await the result of a resolver until the deadline.
+
+        Futures may be shared with other fields, such as the ones memoized by
+        a DataLoader, so only the wait for them is cancelled.
+        """
+        if asyncio.isfuture(result):
+            result = asyncio.shield(result)
+        try:
+            return await asyncio.wait_for(result, remaining)
+        except asyncio.TimeoutError:
+            raise ExecutionTimeoutError(self.timeout)
+
+
+def is_timed_out(errors: Any) -> bool:
+    """Return whether some errors of a result come from a timeout."""
+    return any(
+        isinstance(error.original_error, ExecutionTimeoutError)
+        for error in errors or ()
+    )
@@ -1,11 +1,16 @@
 """Tools for GraphQL."""
 
+import gzip
 import os
-from typing import Any, Dict, Optional
+from hashlib import sha1
+from typing import Any, Dict, Optional, TYPE_CHECKING
 
 from aiohttp.web import Request, Response
 
-from jinja2 import Template
+from .compression import parse_accept_encoding
+
+if TYPE_CHECKING:  # pragma: no cover
+    from jinja2 import Template
 
 
 class GraphQLTool:
@@ -35,15 +40,79 @@ class GraphQLTool:
         raise NotImplementedError()
 
 
-class GraphiQL(GraphQLTool):
-    """GraphiQL."""
+class ToolPage:
+    """Page of a tool, rendered for an endpoint and encoded once."""
+
+    __slots__ = ("endpoint", "body", "gzipped", "etag")
+
+    def __init__(self, endpoint: str, html: str):
+        """
+        Init.
+
+        :param endpoint: graphql endpoint the page was rendered for
+        :param html: rendered page
+        """
+        self.endpoint = endpoint
+        self.body = html.encode("utf-8")
+        self.gzipped = gzip.compress(self.body, compresslevel=9)
+        # weak, since it identifies both the plain and the gzipped bodies
+        self.etag = 'W/"{}"'.format(sha1(self.body).hexdigest())
+
+    def response(self, request: Request, max_age: int) -> Response:
+        """Return the page, gzipped or as a 304 when the request allows it."""
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": "public, max-age={}".format(max_age),
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            if "*" in tags or self.etag in tags or self.etag[2:] in tags:
+                return Response(status=304, headers=headers)
+
+        codings = parse_accept_encoding(request.headers.get("Accept-Encoding", ""))
+        if codings.get("gzip", codings.get("*", 0.0)) > 0:
+            headers["Content-Encoding"] = "gzip"
+            return self.html_response(self.gzipped, headers)
+        return self.html_response(self.body, headers)
+
+    def endpoint_response(self) -> Response:
+        """
+        Return the page served by the GraphQL endpoint.
+
+        The endpoint answers with the page or with JSON depending on the
+        Accept header, so the page is not cached there.
+        """
+        return self.html_response(
+            self.body, {"Cache-Control": "no-cache", "Vary": "Accept"}
+        )
+
+    @staticmethod
+    def html_response(body: bytes, headers: Dict[str, str]) -> Response:
+        """Construct an HTML response."""
+        return Response(
+            body=body, content_type="text/html", charset="utf-8", headers=headers
+        )
+
+
+class TemplateTool(GraphQLTool):
+    """
+    Base class for the tools rendering an HTML template.
+
+    The template is read on the first request, and the page is rendered
+    once for each endpoint the tool is attached to.
+    """
+
+    template_name = ""
 
     def __init__(
         self,
-        url: str = "/graphql/graphiql",
+        url: str,
         endpoint: str = "/graphql",
         *,
-        template: Optional[str] = None
+        template: Optional[str] = None,
+        max_age: int = 86400
     ):
         """
         Init.
@@ -51,14 +120,36 @@ class GraphiQL(GraphQLTool):
         :param url: tool URL
         :param endpoint: graphql endpoint to use
         :param template: custom HTML template
+        :param max_age: time the page may be cached by browsers, in seconds
         """
         super().__init__(url, endpoint)
-        if not template:
-            template = open(
-                os.path.join(os.path.dirname(__file__), "template_graphiql.html"), "r"
-            ).read()
-
-        self.template = Template(template)
+        self.template_source = template
+        self.max_age = max_age
+        self._template: Optional["Template"] = None
+        self._page: Optional[ToolPage] = None
+
+    @property
+    def template(self) -> "Template":
+        """Return the template, reading it on first use."""
+        if self._template is None:
+            from jinja2 import Template
+
+            source = self.template_source
+            if not source:
+                path = os.path.join(os.path.dirname(__file__), self.template_name)
+                with open(path, "r") as template_file:
+                    source = template_file.read()
+            self._template = Template(source)
+        return self._template
+
+    def get_page(self) -> ToolPage:
+        """Return the page rendered for the current endpoint."""
+        page = self._page
+        if page is None or page.endpoint != self.endpoint:
+            page = self._page = ToolPage(
+                self.endpoint, self.template.render(endpoint=self.endpoint)
+            )
+        return page
 
     async def render(
         self,
@@ -67,24 +158,25 @@ class GraphiQL(GraphQLTool):
         operation_name: Optional[str],
     ) -> Response:
         """Render the tool."""
-        return Response(
-            text=self.template.render(endpoint=self.endpoint), content_type="text/html"
-        )
+        return self.get_page().endpoint_response()
 
     async def view(self, request: Request) -> Response:
         """Return an aiohttp view."""
-        return await self.render(None, None, None)
+        return self.get_page().response(request, self.max_age)
 
 
-class GraphQLPlayground(GraphQLTool):
-    """GraphQL Playground."""
+class GraphiQL(TemplateTool):
+    """GraphiQL."""
+
+    template_name = "template_graphiql.html"
 
     def __init__(
         self,
-        url: str = "/graphql/playground",
+        url: str = "/graphql/graphiql",
         endpoint: str = "/graphql",
         *,
-        template: Optional[str] = None
+        template: Optional[str] = None,
+        max_age: int = 86400
     ):
         """
         Init.
@@ -92,40 +184,47 @@ class GraphQLPlayground(GraphQLTool):
         :param url: tool URL
         :param endpoint: graphql endpoint to use
         :param template: custom HTML template
+        :param max_age: time the page may be cached by browsers, in seconds
         """
-        super().__init__(url, endpoint)
-        if not template:
-            template = open(
-                os.path.join(os.path.dirname(__file__), "template_playground.html"), "r"
-            ).read()
+        super().__init__(url, endpoint, template=template, max_age=max_age)
 
-        self.template = Template(template)
 
-    async def render(
+class GraphQLPlayground(TemplateTool):
+    """GraphQL Playground."""
+
+    template_name = "template_playground.html"
+
+    def __init__(
         self,
-        query: Optional[str],
-        variables: Optional[Dict[str, Any]],
-        operation_name: Optional[str],
-    ) -> Response:
-        """Render the tool."""
-        return Response(
-            text=self.template.render(endpoint=self.endpoint), content_type="text/html"
-        )
+        url: str = "/graphql/playground",
+        endpoint: str = "/graphql",
+        *,
+        template: Optional[str] = None,
+        max_age: int = 86400
+    ):
+        """
+        Init.
 
-    async def view(self, request: Request) -> Response:
-        """Return an aiohttp view."""
-        return await self.render(None, None, None)
+        :param url: tool URL
+        :param endpoint: graphql endpoint to use
+        :param template: custom HTML template
+        :param max_age: time the page may be cached by browsers, in seconds
+        """
+        super().__init__(url, endpoint, template=template, max_age=max_age)
 
 
-class GraphQLVoyager(GraphQLTool):
+class GraphQLVoyager(TemplateTool):
     """GraphQL Voyager."""
 
+    template_name = "template_voyager.html"
+
     def __init__(
         self,
         url: str = "/graphql/voyager",
         endpoint: str = "/graphql",
         *,
-        template: Optional[str] = None
+        template: Optional[str] = None,
+        max_age: int = 86400
     ):
         """
         Init.
@@ -133,26 +232,6 @@ class GraphQLVoyager(GraphQLTool):
         :param url: tool URL
         :param endpoint: graphql endpoint to use
         :param template: custom HTML template
+        :param max_age: time the page may be cached by browsers, in seconds
         """
-        super().__init__(url, endpoint)
-        if not template:
-            template = open(
-                os.path.join(os.path.dirname(__file__), "template_voyager.html"), "r"
-            ).read()
-
-        self.template = Template(template)
-
-    async def render(
-        self,
-        query: Optional[str],
-        variables: Optional[Dict[str, Any]],
-        operation_name: Optional[str],
-    ) -> Response:
-        """Render the tool."""
-        return Response(
-            text=self.template.render(endpoint=self.endpoint), content_type="text/html"
-        )
-
-    async def view(self, request: Request) -> Response:
-        """Return an aiohttp view."""
-        return await self.render(None, None, None)
+        super().__init__(url, endpoint, template=template, max_age=max_age)
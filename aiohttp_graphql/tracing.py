@@ -0,0 +1,92 @@
+"""Tracing of the operations in the Apollo tracing format."""
+
+from datetime import datetime, timezone
+from inspect import isawaitable
+from time import perf_counter_ns
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from graphql import GraphQLResolveInfo
+
+TRACING_VERSION = 1
+
+
+def format_time(moment: datetime) -> str:
+    """Format a time as an RFC 3339 UTC timestamp."""
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class ApolloTracer:
+    """
+    Middleware timing the phases of an operation and each resolved field.
+
+    Offsets and durations are in nanoseconds, relative to the start of the
+    trace, as expected by the Apollo tracing format.
+    """
+
+    def __init__(self) -> None:
+        """Init."""
+        self.start_time = datetime.now(timezone.utc)
+        self.start = perf_counter_ns()
+        self.phases: Dict[str, Dict[str, int]] = {}
+        self.resolvers: List[Dict[str, Any]] = []
+
+    def start_phase(self, phase: str) -> None:
+        """Record the start of a phase, such as parsing or validation."""
+        self.phases[phase] = {"startOffset": perf_counter_ns() - self.start}
+
+    def end_phase(self, phase: str) -> None:
+        """Record the end of a phase."""
+        timing = self.phases[phase]
+        timing["duration"] = perf_counter_ns() - self.start - timing["startOffset"]
+
+    def resolve(
+        self,
+        next_: Callable[..., Any],
+        root: Any,
+        info: GraphQLResolveInfo,
+        **args: Any
+    ) -> Any:
+        """Resolve a field, recording its timing."""
+        start = perf_counter_ns()
+        result = next_(root, info, **args)
+        if isawaitable(result):
+            return self.await_result(result, info, start)
+        self.record(info, start)
+        return result
+
+    async def await_result(
+        self, result: Awaitable[Any], info: GraphQLResolveInfo, start: int
+    ) -> Any:
+        """Await the result of a resolver, recording its timing."""
+        try:
+            return await result
+        finally:
+            self.record(info, start)
+
+    def record(self, info: GraphQLResolveInfo, start: int) -> None:
+        """Record the timing of a resolved field."""
+        self.resolvers.append(
+            {
+                "path": info.path.as_list(),
+                "parentType": str(info.parent_type),
+                "fieldName": info.field_name,
+                "returnType": str(info.return_type),
+                "startOffset": start - self.start,
+                "duration": perf_counter_ns() - start,
+            }
+        )
+
+    def finish(self) -> Dict[str, Any]:
+        """Return the trace, in the Apollo tracing format."""
+        trace: Dict[str, Any] = {
+            "version": TRACING_VERSION,
+            "startTime": format_time(self.start_time),
+            "endTime": format_time(datetime.now(timezone.utc)),
+            "duration": perf_counter_ns() - self.start,
+        }
+        trace.update(self.phases)
+        trace["execution"] = {"resolvers": self.resolvers}
+        return trace
+
+
+TraceCallback = Callable[[Dict[str, Any]], Optional[Awaitable[None]]]
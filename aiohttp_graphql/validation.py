@@ -0,0 +1,335 @@
+"""Validation rules limiting the depth, aliases and cost of operations."""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Type
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLInterfaceType,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    OperationType,
+    SelectionSetNode,
+    ValueNode,
+    VariableNode,
+    get_named_type,
+)
+from graphql.language.visitor import SKIP
+from graphql.validation import ValidationContext, ValidationRule
+
+
+def is_introspection(field: FieldNode) -> bool:
+    """Return whether a field belongs to the introspection system."""
+    return field.name.value.startswith("__")
+
+
+def fragment_value(
+    name: str,
+    memo: Dict[str, int],
+    compute: Callable[[FragmentDefinitionNode], int],
+    context: ValidationContext,
+) -> int:
+    """
+    Return a value computed once for a fragment of a document.
+
+    Fragments spread several times are only walked once, and a fragment
+    spread within itself counts as 0 instead of recursing forever.
+    """
+    value = memo.get(name)
+    if value is None:
+        fragment = context.get_fragment(name)
+        memo[name] = 0
+        value = memo[name] = compute(fragment) if fragment is not None else 0
+    return value
+
+
+def selection_depth(
+    selection_set: Optional[SelectionSetNode],
+    context: ValidationContext,
+    memo: Optional[Dict[str, int]] = None,
+) -> int:
+    """
+    Return the nesting depth of the fields of a selection set.
+
+    :param memo: depths of the fragments of the document, filled as they
+        are computed
+    """
+    if selection_set is None:
+        return 0
+    memo = {} if memo is None else memo
+    depth = 0
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            if not is_introspection(selection):
+                depth = max(
+                    depth, 1 + selection_depth(selection.selection_set, context, memo)
+                )
+        elif isinstance(selection, InlineFragmentNode):
+            depth = max(depth, selection_depth(selection.selection_set, context, memo))
+        elif isinstance(selection, FragmentSpreadNode):
+            depth = max(
+                depth,
+                fragment_value(
+                    selection.name.value,
+                    memo,
+                    lambda fragment: selection_depth(
+                        fragment.selection_set, context, memo
+                    ),
+                    context,
+                ),
+            )
+    return depth
+
+
+def count_aliases(
+    selection_set: Optional[SelectionSetNode],
+    context: ValidationContext,
+    memo: Optional[Dict[str, int]] = None,
+) -> int:
+    """
+    Return the number of aliased fields of a selection set.
+
+    :param memo: alias counts of the fragments of the document, filled as
+        they are computed
+    """
+    if selection_set is None:
+        return 0
+    memo = {} if memo is None else memo
+    count = 0
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            if selection.alias is not None:
+                count += 1
+            count += count_aliases(selection.selection_set, context, memo)
+        elif isinstance(selection, InlineFragmentNode):
+            count += count_aliases(selection.selection_set, context, memo)
+        elif isinstance(selection, FragmentSpreadNode):
+            count += fragment_value(
+                selection.name.value,
+                memo,
+                lambda fragment: count_aliases(fragment.selection_set, context, memo),
+                context,
+            )
+    return count
+
+
+class CostModel:
+    """
+    Static estimate of the cost of executing an operation.
+
+    Each field costs its entry in field_costs, keyed by "Type.field", or
+    default_cost. The cost of a field and its subfields is multiplied by the
+    value of its first list argument, such as first or limit, so that lists
+    are charged for every item they may return. Variables count as their
+    default value, or default_list_size, keeping the cost of a document
+    independent of the variables it is executed with.
+    """
+
+    def __init__(
+        self,
+        field_costs: Optional[Dict[str, int]] = None,
+        default_cost: int = 1,
+        list_arguments: Iterable[str] = ("first", "last", "limit"),
+        default_list_size: int = 1,
+    ):
+        """
+        Init.
+
+        :param field_costs: costs of the fields, keyed by "Type.field"
+        :param default_cost: cost of the fields missing from field_costs
+        :param list_arguments: names of the arguments bounding list sizes
+        :param default_list_size: size of the lists bounded by a variable
+        """
+        self.field_costs = field_costs or {}
+        self.default_cost = default_cost
+        self.list_arguments = tuple(list_arguments)
+        self.default_list_size = default_list_size
+
+    def operation_cost(
+        self, operation: OperationDefinitionNode, context: ValidationContext
+    ) -> int:
+        """Return the cost of an operation."""
+        schema = context.schema
+        root_type = {
+            OperationType.QUERY: schema.query_type,
+            OperationType.MUTATION: schema.mutation_type,
+            OperationType.SUBSCRIPTION: schema.subscription_type,
+        }[operation.operation]
+        defaults = {
+            definition.variable.name.value: definition.default_value
+            for definition in operation.variable_definitions or ()
+        }
+        return self.selection_cost(
+            operation.selection_set, root_type, context, defaults, {}
+        )
+
+    def selection_cost(
+        self,
+        selection_set: Optional[SelectionSetNode],
+        parent_type: Optional[GraphQLNamedType],
+        context: ValidationContext,
+        defaults: Dict[str, Any],
+        memo: Dict[str, int],
+    ) -> int:
+        """
+        Return the cost of the fields of a selection set.
+
+        :param memo: costs of the fragments of the operation, filled as they
+            are computed
+        """
+        if selection_set is None:
+            return 0
+        schema = context.schema
+        cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                if is_introspection(selection):
+                    continue
+                field_type = None
+                if isinstance(parent_type, (GraphQLObjectType, GraphQLInterfaceType)):
+                    field = parent_type.fields.get(selection.name.value)
+                    if field is not None:
+                        field_type = get_named_type(field.type)
+                type_name = parent_type.name if parent_type else ""
+                field_cost = self.field_costs.get(
+                    "{}.{}".format(type_name, selection.name.value), self.default_cost
+                )
+                children = self.selection_cost(
+                    selection.selection_set, field_type, context, defaults, memo
+                )
+                cost += self.multiplier(selection, defaults) * (field_cost + children)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition is not None:
+                    fragment_type = schema.get_type(selection.type_condition.name.value)
+                cost += self.selection_cost(
+                    selection.selection_set, fragment_type, context, defaults, memo
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                cost += fragment_value(
+                    selection.name.value,
+                    memo,
+                    lambda fragment: self.selection_cost(
+                        fragment.selection_set,
+                        schema.get_type(fragment.type_condition.name.value),
+                        context,
+                        defaults,
+                        memo,
+                    ),
+                    context,
+                )
+        return cost
+
+    def multiplier(self, field: FieldNode, defaults: Dict[str, Any]) -> int:
+        """Return the number of items a field may return."""
+        for argument in field.arguments or ():
+            if argument.name.value not in self.list_arguments:
+                continue
+            value: Optional[ValueNode] = argument.value
+            if isinstance(value, VariableNode):
+                value = defaults.get(value.name.value)
+            if isinstance(value, IntValueNode):
+                return max(int(value.value), 0)
+            return self.default_list_size
+        return 1
+
+
+def max_depth_rule(max_depth: int) -> Type[ValidationRule]:
+    """Return a validation rule rejecting operations nested too deeply."""
+
+    class MaxDepthRule(ValidationRule):
+        def __init__(self, context: ValidationContext):
+            super().__init__(context)
+            self.fragment_depths: Dict[str, int] = {}
+
+        def enter_operation_definition(
+            self, node: OperationDefinitionNode, *_args: Any
+        ) -> Any:
+            depth = selection_depth(
+                node.selection_set, self.context, self.fragment_depths
+            )
+            if depth > max_depth:
+                self.report_error(
+                    GraphQLError(
+                        "Query depth of {} exceeds the maximum of {}.".format(
+                            depth, max_depth
+                        ),
+                        node,
+                    )
+                )
+            return SKIP
+
+    return MaxDepthRule
+
+
+def max_aliases_rule(max_aliases: int) -> Type[ValidationRule]:
+    """Return a validation rule rejecting operations with too many aliases."""
+
+    class MaxAliasesRule(ValidationRule):
+        def __init__(self, context: ValidationContext):
+            super().__init__(context)
+            self.fragment_aliases: Dict[str, int] = {}
+
+        def enter_operation_definition(
+            self, node: OperationDefinitionNode, *_args: Any
+        ) -> Any:
+            aliases = count_aliases(
+                node.selection_set, self.context, self.fragment_aliases
+            )
+            if aliases > max_aliases:
+                self.report_error(
+                    GraphQLError(
+                        "Query has {} aliases, exceeding the maximum of {}.".format(
+                            aliases, max_aliases
+                        ),
+                        node,
+                    )
+                )
+            return SKIP
+
+    return MaxAliasesRule
+
+
+def max_cost_rule(
+    max_cost: Optional[int],
+    cost_model: Optional[CostModel] = None,
+    on_cost: Optional[Callable[[int], None]] = None,
+) -> Type[ValidationRule]:
+    """
+    Return a validation rule rejecting operations costing too much.
+
+    :param max_cost: maximum cost of an operation, None to only compute it
+    :param cost_model: cost model of the operations
+    :param on_cost: callback receiving the cost of the costliest operation
+    """
+    model = cost_model or CostModel()
+
+    class MaxCostRule(ValidationRule):
+        cost = 0
+
+        def enter_operation_definition(
+            self, node: OperationDefinitionNode, *_args: Any
+        ) -> Any:
+            cost = model.operation_cost(node, self.context)
+            self.cost = max(self.cost, cost)
+            if max_cost is not None and cost > max_cost:
+                self.report_error(
+                    GraphQLError(
+                        "Query cost of {} exceeds the maximum of {}.".format(
+                            cost, max_cost
+                        ),
+                        node,
+                    )
+                )
+            return SKIP
+
+        def leave_document(self, *_args: Any) -> None:
+            if on_cost is not None:
+                on_cost(self.cost)
+
+    return MaxCostRule
@@ -3,10 +3,11 @@ import asyncio
 from graphql.type.definition import (
     GraphQLArgument,
     GraphQLField,
+    GraphQLList,
     GraphQLNonNull,
     GraphQLObjectType,
 )
-from graphql.type.scalars import GraphQLString
+from graphql.type.scalars import GraphQLInt, GraphQLString
 from graphql.type.schema import GraphQLSchema
 
 
@@ -18,6 +19,10 @@ def resolve_test(obj, info, **args):
     return "Hello %s" % (args.get("who") or "World")
 
 
+def resolve_items(obj, info, count):
+    return ["item %d" % i for i in range(count)]
+
+
 def resolve_request(obj, info, *args):
     return info.context["request"].query.get("q")
 
@@ -37,6 +42,11 @@ QueryRootType = GraphQLObjectType(
             args={"who": GraphQLArgument(GraphQLString)},
             resolve=resolve_test,
         ),
+        "items": GraphQLField(
+            type_=GraphQLList(GraphQLString),
+            args={"count": GraphQLArgument(GraphQLNonNull(GraphQLInt))},
+            resolve=resolve_items,
+        ),
     },
 )
 
@@ -0,0 +1,250 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import timeit
+
+from graphql import build_schema, validate_schema
+
+import pytest
+
+from aiohttp_graphql import GraphQLView
+from aiohttp_graphql.metrics import GraphQLMetrics
+from aiohttp_graphql.tools import GraphiQL
+from tests.schemas import Schema
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "benchmarks_baseline.json")
+
+# set to 1 to run the pipeline benchmarks, without the coverage of the
+# configured addopts, which distorts the timings:
+#   BENCHMARKS=1 pytest -o addopts="" tests/test_benchmarks.py
+RUN_BENCHMARKS = os.environ.get("BENCHMARKS") == "1"
+
+# set to 1 to store the results of the pipeline benchmarks as the new baseline
+UPDATE_BASELINE = os.environ.get("BENCHMARK_UPDATE_BASELINE") == "1"
+
+# fraction of the baseline requests per second a benchmark may lose
+TOLERANCE = float(os.environ.get("BENCHMARK_TOLERANCE", "0.5"))
+
+REQUESTS = 100
+CONCURRENCY = 10
+
+
+def best_of(func, number=20000, repeat=5):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def test_schema_validation_cache_per_request_savings():
+    view = GraphQLView(schema=Schema)
+    view.get_schema_validation_errors()
+
+    uncached = best_of(lambda: validate_schema(view.schema))
+    cached = best_of(view.get_schema_validation_errors)
+
+    print(
+        "\nschema validation per request: "
+        "uncached {:.3f}us, cached {:.3f}us".format(uncached * 1e6, cached * 1e6)
+    )
+    assert cached <= uncached
+
+
+def import_times(module):
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def test_import_time():
+    times = import_times("aiohttp_graphql")
+
+    own = sum(t[0] for name, t in times.items() if name.startswith("aiohttp_graphql"))
+    print(
+        "\nimport aiohttp_graphql: {:.1f}ms, {:.1f}ms in its own modules".format(
+            times["aiohttp_graphql"][1] / 1e3, own / 1e3
+        )
+    )
+    assert not {"jinja2", "graphene"} & set(times)
+
+
+BenchmarkSchema = build_schema(
+    """
+    type Node {
+      id: Int
+      name: String
+      children(count: Int!): [Node]
+    }
+
+    type Query {
+      hello: String
+      items(count: Int!): [String]
+      node: Node
+      thrower: String
+    }
+    """
+)
+
+
+class BenchmarkNode:
+    def __init__(self, id):
+        self.id = id
+        self.name = "node {}".format(id)
+
+    def children(self, info, count):
+        return [BenchmarkNode(self.id * count + i) for i in range(count)]
+
+
+class BenchmarkRoot:
+    def hello(self, info):
+        return "world"
+
+    def items(self, info, count):
+        return ["item {}".format(i) for i in range(count)]
+
+    def node(self, info):
+        return BenchmarkNode(1)
+
+    def thrower(self, info):
+        raise ValueError("Throws!")
+
+
+def post_json(payload):
+    return {
+        "method": "POST",
+        "path": "/graphql",
+        "data": json.dumps(payload),
+        "headers": {"content-type": "application/json"},
+    }
+
+
+SCENARIOS = {
+    "small": {"method": "GET", "path": "/graphql?query={hello}"},
+    "large": post_json({"query": "{ items(count: 2000) }"}),
+    "nested": post_json(
+        {
+            "query": "{ node { id children(count: 5) { id name children(count: 5) "
+            "{ id name children(count: 5) { id name } } } } }"
+        }
+    ),
+    "batched": post_json([{"query": "{ hello }"}] * 10),
+    "error": post_json({"query": "{ hello thrower }"}),
+    "tool": {"method": "GET", "path": "/graphql/graphiql"},
+}
+
+
+def percentile(values, fraction):
+    return values[int(round(fraction * (len(values) - 1)))]
+
+
+def phase_totals(metrics):
+    return {
+        phase: (histogram.sum, histogram.count)
+        for phase, histogram in metrics.phases.items()
+    }
+
+
+def load_baseline():
+    try:
+        with open(BASELINE_PATH) as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return {}
+
+
+def store_baseline(name, result):
+    baseline = load_baseline()
+    baseline[name] = result
+    with open(BASELINE_PATH, "w") as baseline_file:
+        json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write("\n")
+
+
+@pytest.mark.skipif(
+    not RUN_BENCHMARKS, reason="set BENCHMARKS=1 to run the pipeline benchmarks"
+)
+class TestRequestPipeline:
+    @pytest.fixture
+    def metrics(self):
+        return GraphQLMetrics()
+
+    @pytest.fixture
+    def view_kwargs(self, metrics):
+        return {
+            "schema": BenchmarkSchema,
+            "root_value": BenchmarkRoot(),
+            "batch": True,
+            "metrics": metrics,
+            "tools": [GraphiQL()],
+        }
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name", sorted(SCENARIOS))
+    async def test_requests_per_second(self, client, metrics, name):
+        scenario = SCENARIOS[name]
+
+        async def send():
+            response = await client.request(**scenario)
+            await response.read()
+            assert response.status in (200, 400)
+
+        for _ in range(CONCURRENCY):
+            await send()
+        before = phase_totals(metrics)
+
+        latencies = []
+
+        async def worker():
+            for _ in range(REQUESTS // CONCURRENCY):
+                start = time.perf_counter()
+                await send()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        rps = len(latencies) / elapsed
+        phases = []
+        for phase, (total, count) in sorted(phase_totals(metrics).items()):
+            total -= before.get(phase, (0.0, 0))[0]
+            count -= before.get(phase, (0.0, 0))[1]
+            if count:
+                phases.append("{} {:.3f}ms".format(phase, total / count * 1e3))
+        print(
+            "\n{}: {:.0f} rps, p50 {:.2f}ms, p99 {:.2f}ms; {}".format(
+                name,
+                rps,
+                percentile(latencies, 0.5) * 1e3,
+                percentile(latencies, 0.99) * 1e3,
+                ", ".join(phases) or "no operation",
+            )
+        )
+
+        if sys.gettrace() is not None:
+            pytest.fail(
+                "timings are distorted by coverage or a debugger, "
+                'run the benchmarks with -o addopts=""'
+            )
+        if UPDATE_BASELINE:
+            store_baseline(name, {"rps": round(rps)})
+            return
+        baseline = load_baseline().get(name)
+        if baseline is None:
+            pytest.skip("no baseline for {}".format(name))
+        assert rps >= baseline["rps"] * (
+            1 - TOLERANCE
+        ), "{} regressed to {:.0f} rps from a baseline of {} rps".format(
+            name, rps, baseline["rps"]
+        )
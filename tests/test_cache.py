@@ -0,0 +1,86 @@
+import time
+
+from graphql import parse
+
+from aiohttp_graphql.cache import CachedDocument, DocumentCache, ResponseCache
+from tests.schemas import AsyncSchema, Schema
+
+
+def test_document_cache_hits_and_misses():
+    cache = DocumentCache()
+    document = parse("{test}")
+
+    assert cache.get("{test}") is None
+    cache.put("{test}", document)
+
+    assert cache.get("{test}").document is document
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 0)
+
+
+def test_document_cache_evicts_least_recently_used_entry():
+    cache = DocumentCache(max_entries=2)
+    cache.put("{a}", parse("{a}"))
+    cache.put("{b}", parse("{b}"))
+    cache.get("{a}")
+    cache.put("{c}", parse("{c}"))
+
+    assert "{a}" in cache
+    assert "{b}" not in cache
+    assert "{c}" in cache
+    assert cache.evictions == 1
+
+
+def test_document_cache_bounds_total_bytes():
+    cache = DocumentCache(max_bytes=10)
+    cache.put("{aaaa}", parse("{aaaa}"))
+    cache.put("{bbbb}", parse("{bbbb}"))
+
+    assert len(cache) == 1
+    assert cache.total_bytes == 6
+    assert "{bbbb}" in cache
+
+    cache.put("{ abcdefghij }", parse("{ abcdefghij }"))
+    assert "{ abcdefghij }" not in cache
+    assert len(cache) == 1
+
+
+def test_cached_document_validation_is_tied_to_the_schema():
+    cached = CachedDocument(parse("{test}"))
+    assert cached.get_validation_errors(Schema) is None
+
+    cached.set_validation_errors(Schema, [])
+
+    assert cached.get_validation_errors(Schema) == []
+    assert cached.get_validation_errors(AsyncSchema) is None
+
+
+def test_response_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = ResponseCache(ttl=10)
+    cache.put("a", b"{}", '"a"')
+    cache.put("b", b"{}", '"b"', ttl=5)
+    cache.put("c", b"{}", '"c"', ttl=0)
+
+    assert cache.get("a").etag == '"a"'
+    assert cache.get("b").etag == '"b"'
+    assert cache.get("c") is None
+
+    now[0] = 106.0
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    now[0] = 110.0
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses, len(cache)) == (3, 3, 0)
+
+
+def test_response_cache_evicts_least_recently_used_entry():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", b"{}", '"a"')
+    cache.put("b", b"{}", '"b"')
+    cache.get("a")
+    cache.put("c", b"{}", '"c"')
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
@@ -0,0 +1,269 @@
+import json
+import time
+
+from graphql import build_schema, parse
+
+import pytest
+
+from aiohttp_graphql import GraphQLView
+from aiohttp_graphql.cache import CachedDocument, ResponseCache
+from aiohttp_graphql.cache_control import CacheControlPolicy
+
+HintedSchema = build_schema(
+    """
+    enum CacheControlScope { PUBLIC PRIVATE }
+
+    directive @cacheControl(
+      maxAge: Int
+      scope: CacheControlScope
+    ) on FIELD_DEFINITION | OBJECT | INTERFACE | UNION
+
+    type Post @cacheControl(maxAge: 240) {
+      title: String
+      votes: Int @cacheControl(maxAge: 30)
+      author: User
+    }
+
+    type User {
+      name: String
+      email: String @cacheControl(scope: PRIVATE)
+    }
+
+    type Query {
+      posts: [Post]
+      me: User
+      hello: String @cacheControl(maxAge: 60)
+      counter: Int
+    }
+    """
+)
+
+
+class Root:
+    def __init__(self):
+        self.calls = 0
+
+    def counter(self, info):
+        self.calls += 1
+        return self.calls
+
+    def hello(self, info):
+        return "world"
+
+    def posts(self, info):
+        return [{"title": "GraphQL", "votes": 3, "author": None}]
+
+    def me(self, info):
+        return {"name": "me", "email": "me@example.com"}
+
+
+def policy(query, **kwargs):
+    document = parse(query)
+    return CacheControlPolicy(**kwargs).get_policy(
+        HintedSchema, document, document.definitions[0]
+    )
+
+
+def test_policy_from_hints():
+    assert policy("{ hello }") == (60, "PUBLIC")
+    assert policy("{ posts { title } }") == (240, "PUBLIC")
+    assert policy("{ posts { title votes } }") == (30, "PUBLIC")
+    assert policy("{ hello posts { title } }") == (60, "PUBLIC")
+    assert policy("{ counter }") == (0, "PUBLIC")
+    assert policy("{ posts { author { name } } }") == (0, "PUBLIC")
+    assert policy("{ posts { author { name } } }", default_max_age=10) == (
+        10,
+        "PUBLIC",
+    )
+
+
+def test_policy_scope():
+    assert policy("{ hello me { name } }", default_max_age=10) == (10, "PUBLIC")
+    assert policy("{ hello me { email } }", default_max_age=10) == (10, "PRIVATE")
+    assert policy("{ hello }", scope="private") == (60, "PRIVATE")
+
+
+def test_policy_through_fragments():
+    query = """
+    query { ...Posts }
+    fragment Posts on Query { posts { ... on Post { votes } } }
+    """
+
+    assert policy(query) == (30, "PUBLIC")
+
+
+def test_policy_walks_each_fragment_once():
+    fragments = "".join(
+        "fragment F{} on Query {{ ...F{} ...F{} }}\n".format(i, i + 1, i + 1)
+        for i in range(40)
+    )
+    query = "{ ...F0 }\n" + fragments + "fragment F40 on Query { posts { votes } }"
+
+    start = time.perf_counter()
+    assert policy(query) == (30, "PUBLIC")
+    assert time.perf_counter() - start < 1
+
+
+def test_policy_of_fragment_cycles():
+    query = """
+    { ...A }
+    fragment A on Query { hello ...B }
+    fragment B on Query { ...A }
+    """
+
+    assert policy(query) == (60, "PUBLIC")
+
+
+def test_policy_stored_in_document():
+    view = GraphQLView(schema=HintedSchema, cache_control=CacheControlPolicy())
+    cached = CachedDocument(parse("query Hello { hello }"))
+    op = cached.document.definitions[0]
+
+    assert view.validate_document(cached) == []
+    assert view.get_cache_policy(cached, op) == (60, "PUBLIC")
+    assert cached.cache_policies == {"Hello": (60, "PUBLIC")}
+
+    cached.cache_policies["Hello"] = (1, "PUBLIC")
+    assert view.get_cache_policy(cached, op) == (1, "PUBLIC")
+
+
+def test_policy_without_hints():
+    assert policy("{ hello }", default_max_age=5, use_hints=False) == (5, "PUBLIC")
+
+
+def test_header():
+    assert CacheControlPolicy.header(60, "PUBLIC") == "public, max-age=60"
+    assert CacheControlPolicy.header(60, "PRIVATE") == "private, max-age=60"
+    assert CacheControlPolicy.header(0, "PUBLIC") == "no-cache"
+
+
+class TestHttpCaching:
+    @pytest.fixture
+    def root(self):
+        return Root()
+
+    @pytest.fixture
+    def view(self, root):
+        return GraphQLView(
+            schema=HintedSchema,
+            root_value=root,
+            etag=True,
+            cache_control=CacheControlPolicy(),
+            response_cache=ResponseCache(),
+        )
+
+    @pytest.fixture
+    def view_kwargs(self, view):
+        return {"instance": view}
+
+    @pytest.mark.asyncio
+    async def test_answers_if_none_match_with_304(self, client, url_builder):
+        response = await client.get(url_builder(query="{ hello }"))
+        etag = response.headers["ETag"]
+
+        assert response.status == 200
+        assert response.headers["Cache-Control"] == "public, max-age=60"
+        assert await response.json() == {"data": {"hello": "world"}}
+
+        response = await client.get(
+            url_builder(query="{ hello }"), headers={"If-None-Match": etag}
+        )
+        assert response.status == 304
+        assert response.headers["ETag"] == etag
+        assert response.headers["Cache-Control"] == "public, max-age=60"
+        assert await response.read() == b""
+
+        response = await client.get(
+            url_builder(query="{ hello }"), headers={"If-None-Match": '"other"'}
+        )
+        assert response.status == 200
+
+    @pytest.mark.asyncio
+    async def test_caches_public_responses(self, view, client, url_builder, root):
+        for _ in range(2):
+            response = await client.get(
+                url_builder(
+                    query="query ($skip: Boolean!) { hello @skip(if: $skip) }",
+                    variables=json.dumps({"skip": False}),
+                )
+            )
+            assert await response.json() == {"data": {"hello": "world"}}
+
+        assert (view.response_cache.hits, view.response_cache.misses) == (1, 1)
+
+        response = await client.get(
+            url_builder(
+                query="query ($skip: Boolean!) { hello @skip(if: $skip) }",
+                variables=json.dumps({"skip": True}),
+            )
+        )
+        assert view.response_cache.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_does_not_cache_uncacheable_responses(
+        self, view, client, url_builder, root
+    ):
+        for _ in range(2):
+            response = await client.get(url_builder(query="{ counter }"))
+            assert response.headers["Cache-Control"] == "no-cache"
+        assert await response.json() == {"data": {"counter": 2}}
+
+        response = await client.get(url_builder(query="{ hello me { email } }"))
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert len(view.response_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_does_not_cache_errors_or_mutations(self, view, client, url_builder):
+        response = await client.get(url_builder(query="{ unknown }"))
+        assert response.status == 400
+        assert "ETag" not in response.headers
+
+        response = await client.post(
+            url_builder(),
+            data=json.dumps({"query": "{ hello }"}),
+            headers={"content-type": "application/json"},
+        )
+        assert response.status == 200
+        assert "ETag" not in response.headers
+        assert len(view.response_cache) == 0
+
+
+class TestEtagOnly:
+    @pytest.fixture
+    def view_kwargs(self):
+        return {"schema": HintedSchema, "root_value": Root(), "etag": True}
+
+    @pytest.mark.asyncio
+    async def test_adds_etag(self, client, url_builder):
+        response = await client.get(url_builder(query="{ hello }"))
+
+        assert response.headers["ETag"].startswith('"')
+        assert "Cache-Control" not in response.headers
+
+        response = await client.get(
+            url_builder(query="{ hello }"),
+            headers={"If-None-Match": "W/" + response.headers["ETag"]},
+        )
+        assert response.status == 304
+
+
+class TestResponseCacheOnly:
+    @pytest.fixture
+    def view(self):
+        return GraphQLView(
+            schema=HintedSchema, root_value=Root(), response_cache=ResponseCache()
+        )
+
+    @pytest.fixture
+    def view_kwargs(self, view):
+        return {"instance": view}
+
+    @pytest.mark.asyncio
+    async def test_caches_responses(self, view, client, url_builder):
+        for _ in range(3):
+            response = await client.get(url_builder(query="{ hello }"))
+            assert await response.json() == {"data": {"hello": "world"}}
+            assert response.headers["ETag"].startswith('"')
+
+        assert len(view.response_cache) == 1
+        assert (view.response_cache.hits, view.response_cache.misses) == (2, 1)
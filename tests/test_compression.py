@@ -0,0 +1,144 @@
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from graphql import build_schema
+
+import pytest
+
+from aiohttp_graphql.compression import ResponseCompression, parse_accept_encoding
+
+LargeSchema = build_schema(
+    """
+    type Query {
+      items(count: Int!): [String]
+    }
+    """
+)
+
+
+class Root:
+    def items(self, info, count):
+        return ["item"] * count
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, deflate;q=0.5, br;q=0, *;q=x") == {
+        "gzip": 1.0,
+        "deflate": 0.5,
+        "br": 0.0,
+        "*": 0.0,
+    }
+
+
+def test_select_encoding():
+    compression = ResponseCompression()
+    compression.encodings = ("br", "gzip")
+
+    assert compression.select_encoding("gzip, br") == "br"
+    assert compression.select_encoding("gzip, br;q=0") == "gzip"
+    assert compression.select_encoding("*") == "br"
+    assert compression.select_encoding("identity") is None
+    assert compression.select_encoding("") is None
+
+
+class TestCompression:
+    @pytest.fixture
+    def executor(self):
+        executor = CountingExecutor()
+        yield executor
+        executor.shutdown()
+
+    @pytest.fixture
+    def view_kwargs(self, executor):
+        return {
+            "schema": LargeSchema,
+            "root_value": Root(),
+            "compression": ResponseCompression(
+                min_size=100, executor_size=10000, executor=executor
+            ),
+        }
+
+    @pytest.mark.asyncio
+    async def test_compresses_large_responses(self, client, url_builder, executor):
+        response = await client.get(
+            url_builder(query="{ items(count: 100) }"),
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert int(response.headers["Content-Length"]) < 100
+        assert await response.json() == {"data": {"items": ["item"] * 100}}
+        assert executor.submitted == 0
+
+    @pytest.mark.asyncio
+    async def test_compresses_in_executor(self, client, url_builder, executor):
+        response = await client.get(
+            url_builder(query="{ items(count: 2000) }"),
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert await response.json() == {"data": {"items": ["item"] * 2000}}
+        assert executor.submitted == 1
+
+    @pytest.mark.asyncio
+    async def test_skips_small_or_unaccepted_responses(self, client, url_builder):
+        response = await client.get(
+            url_builder(query="{ items(count: 1) }"),
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert "Content-Encoding" not in response.headers
+
+        response = await client.get(
+            url_builder(query="{ items(count: 100) }"),
+            headers={"Accept-Encoding": "identity"},
+        )
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Vary"] == "Accept-Encoding"
+
+    @pytest.mark.asyncio
+    async def test_accepts_gzip_request_bodies(self, client, url_builder):
+        body = gzip.compress(json.dumps({"query": "{ items(count: 1) }"}).encode())
+        response = await client.post(
+            url_builder(),
+            data=body,
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+
+        assert await response.json() == {"data": {"items": ["item"]}}
+
+
+class TestCompressionWithEtag:
+    @pytest.fixture
+    def view_kwargs(self):
+        return {
+            "schema": LargeSchema,
+            "root_value": Root(),
+            "etag": True,
+            "compression": ResponseCompression(min_size=100),
+        }
+
+    @pytest.mark.asyncio
+    async def test_weakens_etag(self, client, url_builder):
+        url = url_builder(query="{ items(count: 100) }")
+        response = await client.get(url, headers={"Accept-Encoding": "gzip"})
+        etag = response.headers["ETag"]
+
+        assert etag.startswith('W/"')
+
+        response = await client.get(
+            url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+        )
+        assert response.status == 304
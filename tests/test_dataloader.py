@@ -0,0 +1,163 @@
+import asyncio
+
+from graphql import (
+    GraphQLArgument,
+    GraphQLField,
+    GraphQLInt,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLSchema,
+    GraphQLString,
+)
+
+import pytest
+
+from aiohttp_graphql import GraphQLView
+from aiohttp_graphql.dataloader import DataLoader
+
+
+class Loads:
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, keys):
+        self.batches.append(keys)
+        return [
+            ValueError("No user %d" % key) if key < 0 else "user %d" % key
+            for key in keys
+        ]
+
+
+@pytest.fixture
+def loads():
+    return Loads()
+
+
+@pytest.mark.asyncio
+async def test_batches_loads_of_the_same_iteration(loads):
+    loader = DataLoader(loads)
+
+    values = await asyncio.gather(loader.load(1), loader.load(2), loader.load(3))
+
+    assert values == ["user 1", "user 2", "user 3"]
+    assert loads.batches == [[1, 2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_memoizes_loaded_values(loads):
+    loader = DataLoader(loads)
+
+    assert await loader.load_many([1, 2, 1]) == ["user 1", "user 2", "user 1"]
+    assert await loader.load(2) == "user 2"
+    assert loads.batches == [[1, 2]]
+
+    loader.clear(2)
+    assert await loader.load(2) == "user 2"
+    loader.clear_all()
+    assert await loader.load(1) == "user 1"
+    assert loads.batches == [[1, 2], [2], [1]]
+
+
+@pytest.mark.asyncio
+async def test_loads_every_key_without_cache(loads):
+    loader = DataLoader(loads, cache=False)
+
+    assert await loader.load_many([1, 1]) == ["user 1", "user 1"]
+    assert await loader.load(1) == "user 1"
+    assert loads.batches == [[1, 1], [1]]
+
+
+@pytest.mark.asyncio
+async def test_splits_batches_by_max_batch_size(loads):
+    loader = DataLoader(loads, max_batch_size=2)
+
+    await loader.load_many([1, 2, 3, 4, 5])
+
+    assert loads.batches == [[1, 2], [3, 4], [5]]
+
+
+@pytest.mark.asyncio
+async def test_primed_values_are_not_loaded(loads):
+    loader = DataLoader(loads)
+    loader.prime(1, "primed")
+    loader.prime(-1, ValueError("primed error"))
+
+    assert await loader.load(1) == "primed"
+    with pytest.raises(ValueError, match="primed error"):
+        await loader.load(-1)
+    assert loads.batches == []
+
+
+@pytest.mark.asyncio
+async def test_rejects_failed_keys_without_memoizing_them(loads):
+    loader = DataLoader(loads)
+
+    results = await asyncio.gather(
+        loader.load(1), loader.load(-1), return_exceptions=True
+    )
+
+    assert results[0] == "user 1"
+    assert str(results[1]) == "No user -1"
+    await asyncio.gather(loader.load(1), loader.load(-1), return_exceptions=True)
+    assert loads.batches == [[1, -1], [-1]]
+
+
+@pytest.mark.asyncio
+async def test_rejects_the_batch_when_loading_fails():
+    async def load(keys):
+        return keys[:1]
+
+    loader = DataLoader(load)
+
+    with pytest.raises(TypeError, match="must return a list of 2 values, got 1"):
+        await loader.load_many([1, 2])
+
+
+def resolve_user(obj, info, id):
+    return info.context["loaders"]["users"].load(id)
+
+
+UserSchema = GraphQLSchema(
+    query=GraphQLObjectType(
+        name="QueryRoot",
+        fields={
+            "user": GraphQLField(
+                GraphQLString,
+                args={"id": GraphQLArgument(GraphQLNonNull(GraphQLInt))},
+                resolve=resolve_user,
+            )
+        },
+    )
+)
+
+
+class TestViewLoaders:
+    @pytest.fixture
+    def view_kwargs(self, loads):
+        return {
+            "schema": UserSchema,
+            "asynchronous": True,
+            "loaders": {"users": lambda: DataLoader(loads)},
+        }
+
+    @pytest.mark.asyncio
+    async def test_creates_loaders_for_each_request(self, client, url_builder, loads):
+        query = "{ a: user(id: 1), b: user(id: 2), c: user(id: 1) }"
+
+        for _ in range(2):
+            response = await client.get(url_builder(query=query))
+            assert await response.json() == {
+                "data": {"a": "user 1", "b": "user 2", "c": "user 1"}
+            }
+
+        assert loads.batches == [[1, 2], [1, 2]]
+
+    def test_keeps_loaders_of_the_context(self, loads):
+        loaders = {"users": DataLoader(loads)}
+        view = GraphQLView(
+            schema=UserSchema,
+            context={"loaders": loaders},
+            loaders={"users": lambda: DataLoader(loads)},
+        )
+
+        assert view.get_context(None)["loaders"] is loaders
@@ -0,0 +1,210 @@
+import asyncio
+import time
+
+from graphql import build_schema
+
+import pytest
+
+from aiohttp_graphql.field_cache import (
+    NOT_CACHED,
+    FieldCacheBackend,
+    FieldCacheMiddleware,
+    InMemoryFieldCacheBackend,
+)
+
+CachedSchema = build_schema(
+    """
+    directive @cached(ttl: Int!) on FIELD_DEFINITION
+
+    type Product {
+      id: ID
+      price: Int @cached(ttl: 60)
+    }
+
+    type Query {
+      rates(currency: String): Int @cached(ttl: 60)
+      products: [Product]
+      me: String
+      greeting: String
+    }
+
+    type Mutation {
+      rates: Int @cached(ttl: 60)
+    }
+    """
+)
+
+
+class Root:
+    def __init__(self):
+        self.calls = []
+
+    def rates(self, info, currency="EUR"):
+        self.calls.append(("rates", currency))
+        return len(self.calls)
+
+    def products(self, info):
+        return [Product(1), Product(2), Product(None)]
+
+    def me(self, info):
+        self.calls.append(("me",))
+        return info.context["request"].headers.get("X-User")
+
+    async def greeting(self, info):
+        self.calls.append(("greeting",))
+        await asyncio.sleep(0)
+        return "hello"
+
+
+class Product:
+    def __init__(self, id):
+        self.id = id
+
+    def price(self, info):
+        info.root_value.calls.append(("price", self.id))
+        return 10
+
+
+@pytest.fixture
+def root():
+    return Root()
+
+
+class TestFieldCache:
+    @pytest.fixture
+    def view_kwargs(self, root):
+        return {
+            "schema": CachedSchema,
+            "root_value": root,
+            "middleware": [FieldCacheMiddleware(fields={"Query.me": 60})],
+        }
+
+    @pytest.mark.asyncio
+    async def test_caches_fields_declared_with_directive(
+        self, client, url_builder, root
+    ):
+        for _ in range(2):
+            response = await client.get(url_builder(query="{ rates }"))
+            assert await response.json() == {"data": {"rates": 1}}
+
+        response = await client.get(url_builder(query='{ rates(currency: "USD") }'))
+        assert await response.json() == {"data": {"rates": 2}}
+        assert root.calls == [("rates", "EUR"), ("rates", "USD")]
+
+    @pytest.mark.asyncio
+    async def test_caches_fields_by_parent(self, client, url_builder, root):
+        for _ in range(2):
+            response = await client.get(url_builder(query="{ products { price } }"))
+            assert await response.json() == {"data": {"products": [{"price": 10}] * 3}}
+
+        assert root.calls == [
+            ("price", 1),
+            ("price", 2),
+            ("price", None),
+            ("price", None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_does_not_cache_mutations(self, client, url_builder, root):
+        for _ in range(2):
+            await client.post(url_builder(), json={"query": "mutation { rates }"})
+
+        assert root.calls == [("rates", "EUR"), ("rates", "EUR")]
+
+    @pytest.mark.asyncio
+    async def test_caches_fields_of_the_config_map(self, client, url_builder, root):
+        for user in ("a", "b"):
+            response = await client.get(
+                url_builder(query="{ me }"), headers={"X-User": user}
+            )
+            assert await response.json() == {"data": {"me": "a"}}
+
+        assert root.calls == [("me",)]
+
+
+class TestScopedFieldCache:
+    @pytest.fixture
+    def view_kwargs(self, root):
+        return {
+            "schema": CachedSchema,
+            "root_value": root,
+            "middleware": [
+                FieldCacheMiddleware(
+                    fields={"Query.me": 60, "Query.greeting": 60},
+                    scope_key=lambda context: context["request"].headers.get("X-User"),
+                )
+            ],
+        }
+
+    @pytest.mark.asyncio
+    async def test_caches_by_scope(self, client, url_builder, root):
+        for user in ("a", "b", "a"):
+            response = await client.get(
+                url_builder(query="{ me }"), headers={"X-User": user}
+            )
+            assert await response.json() == {"data": {"me": user}}
+
+        assert root.calls == [("me",), ("me",)]
+
+    @pytest.mark.asyncio
+    async def test_caches_awaited_results(self, client, url_builder, root):
+        for _ in range(2):
+            response = await client.get(url_builder(query="{ greeting }"))
+            assert await response.json() == {"data": {"greeting": "hello"}}
+
+        assert root.calls == [("greeting",)]
+
+
+class AsyncBackend(FieldCacheBackend):
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key, NOT_CACHED)
+
+    async def put(self, key, value, ttl):
+        self.values[key] = value
+
+
+class TestAsyncBackend:
+    @pytest.fixture
+    def backend(self):
+        return AsyncBackend()
+
+    @pytest.fixture
+    def view_kwargs(self, root, backend):
+        return {
+            "schema": CachedSchema,
+            "root_value": root,
+            "asynchronous": True,
+            "middleware": [FieldCacheMiddleware(backend=backend)],
+        }
+
+    @pytest.mark.asyncio
+    async def test_awaits_the_backend(self, client, url_builder, root, backend):
+        for _ in range(2):
+            response = await client.get(url_builder(query="{ rates }"))
+            assert await response.json() == {"data": {"rates": 1}}
+
+        assert root.calls == [("rates", "EUR")]
+        assert list(backend.values.values()) == [1]
+
+
+def test_in_memory_backend_expires_and_evicts(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    backend = InMemoryFieldCacheBackend(max_entries=2)
+
+    backend.put("a", 1, 10)
+    backend.put("b", None, 20)
+    assert backend.get("a") == 1
+    assert backend.get("b") is None
+    assert backend.get("c") is NOT_CACHED
+
+    backend.put("c", 3, 10)
+    assert backend.get("a") is NOT_CACHED
+
+    now[0] = 115.0
+    assert backend.get("b") is None
+    assert backend.get("c") is NOT_CACHED
+    assert len(backend) == 1
@@ -1,10 +1,30 @@
+import asyncio
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode
 
 from aiohttp import FormData
 
+from graphql import (
+    GraphQLField,
+    GraphQLObjectType,
+    GraphQLSchema,
+    GraphQLString,
+    parse as graphql_parse,
+    validate as graphql_validate,
+)
+
 import pytest
 
+from aiohttp_graphql import GraphQLView
+from aiohttp_graphql.cache import DocumentCache
+from aiohttp_graphql.incremental import supports_incremental_delivery
+from aiohttp_graphql.persisted import (
+    InMemoryPersistedQueryStore,
+    QueryAllowlist,
+    query_hash,
+)
 from tests.schemas import AsyncSchema, Schema
 
 
@@ -387,19 +407,16 @@ async def test_handles_errors_caused_by_a_lack_of_query(client, base_url):
     }
 
 
-#
-# @pytest.mark.asyncio
-# async def test_handles_batch_correctly_if_is_disabled(client, base_url):
-#     response = await client.post(
-#         base_url,
-#         data='[]',
-#         headers={'content-type': 'application/json'},
-#     )
-#
-#     assert response.status == 400
-#     assert await response.json() == {
-#         'errors': [{'message': 'Batch GraphQL requests are not enabled.'}]
-#     }
+@pytest.mark.asyncio
+async def test_handles_batch_correctly_if_is_disabled(client, base_url):
+    response = await client.post(
+        base_url, data="[]", headers={"content-type": "application/json"}
+    )
+
+    assert response.status == 400
+    assert await response.json() == {
+        "errors": [{"message": "Batch GraphQL requests are not enabled."}]
+    }
 
 
 @pytest.mark.asyncio
@@ -502,77 +519,147 @@ async def test_post_multipart_data(client, base_url):
     assert await response.json() == {"data": {u"writeTest": {u"test": u"Hello World"}}}
 
 
-#
-# class TestBatchExecutor:
-#     @pytest.fixture
-#     def view_kwargs(self, view_kwargs):
-#         # pylint: disable=no-self-use
-#         # pylint: disable=redefined-outer-name
-#         view_kwargs.update(batch=True)
-#         return view_kwargs
-#
-#     @pytest.mark.asyncio
-#     async def test_batch_allows_post_with_json_encoding(self, client, base_url):
-#         response = await client.post(
-#             base_url,
-#             data=json.dumps([dict(id=1, query='{test}')]),
-#             headers={'content-type': 'application/json'}
-#         )
-#
-#         assert response.status == 200
-#         assert await response.json() == [{
-#             'data': {'test': "Hello World"},
-#         }]
-#
-#
-#     @pytest.mark.asyncio
-#     async def test_batch_supports_post_json_query_with_json_variables(
-#             self, client, base_url):
-#         response = await client.post(
-#             base_url,
-#             data=json.dumps([dict(
-#                 id=1,
-#                 query='query helloWho($who: String){ test(who: $who) }',
-#                 variables={'who': "Dolly"}
-#             )]),
-#             headers={'content-type': 'application/json'}
-#         )
-#
-#         assert response.status == 200
-#         assert await response.json() == [{
-#             'data': {'test': "Hello Dolly"},
-#         }]
-#
-#
-#     @pytest.mark.asyncio
-#     async def test_batch_allows_post_with_operation_name(
-#             self, client, base_url):
-#         response = await client.post(
-#             base_url,
-#             data=json.dumps([dict(
-#                 id=1,
-#                 query='''
-#                 query helloYou { test(who: "You"), ...shared }
-#                 query helloWorld { test(who: "World"), ...shared }
-#                 query helloDolly { test(who: "Dolly"), ...shared }
-#                 fragment shared on QueryRoot {
-#                   shared: test(who: "Everyone")
-#                 }
-#                 ''',
-#                 operationName='helloWorld'
-#             )]),
-#             headers={'content-type': 'application/json'}
-#         )
-#
-#         assert response.status == 200
-#         assert await response.json() == [{
-#             'data': {
-#                 'test': 'Hello World',
-#                 'shared': 'Hello Everyone'
-#             }
-#         }]
-#
-#
+class TestBatchExecutor:
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs):
+        view_kwargs.update(batch=True, max_batch_size=3)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_batch_allows_post_with_json_encoding(self, client, base_url):
+        response = await client.post(
+            base_url,
+            data=json.dumps([dict(id=1, query="{test}")]),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status == 200
+        assert await response.json() == [{"data": {"test": "Hello World"}}]
+
+    @pytest.mark.asyncio
+    async def test_batch_supports_post_json_query_with_json_variables(
+        self, client, base_url
+    ):
+        response = await client.post(
+            base_url,
+            data=json.dumps(
+                [
+                    dict(
+                        id=1,
+                        query="query helloWho($who: String){ test(who: $who) }",
+                        variables={"who": "Dolly"},
+                    )
+                ]
+            ),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status == 200
+        assert await response.json() == [{"data": {"test": "Hello Dolly"}}]
+
+    @pytest.mark.asyncio
+    async def test_batch_allows_post_with_operation_name(self, client, base_url):
+        response = await client.post(
+            base_url,
+            data=json.dumps(
+                [
+                    dict(
+                        id=1,
+                        query="""
+                query helloYou { test(who: "You"), ...shared }
+                query helloWorld { test(who: "World"), ...shared }
+                query helloDolly { test(who: "Dolly"), ...shared }
+                fragment shared on QueryRoot {
+                  shared: test(who: "Everyone")
+                }
+                """,
+                        operationName="helloWorld",
+                    )
+                ]
+            ),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status == 200
+        assert await response.json() == [
+            {"data": {"test": "Hello World", "shared": "Hello Everyone"}}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_reports_errors_per_operation(self, client, base_url):
+        response = await client.post(
+            base_url,
+            data=json.dumps(
+                [
+                    dict(query="{test}"),
+                    dict(query="syntaxerror"),
+                    dict(query="{test}", variables="who:You"),
+                ]
+            ),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status == 200
+        assert await response.json() == [
+            {"data": {"test": "Hello World"}},
+            {
+                "errors": [
+                    {
+                        "locations": [{"column": 1, "line": 1}],
+                        "message": "Syntax Error: Unexpected Name 'syntaxerror'.",
+                    }
+                ]
+            },
+            {"errors": [{"message": "Variables are invalid JSON."}]},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_rejects_too_many_operations(self, client, base_url):
+        response = await client.post(
+            base_url,
+            data=json.dumps([dict(query="{test}")] * 4),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [{"message": "Batch requests are limited to 3 operations."}]
+        }
+
+    @pytest.mark.asyncio
+    async def test_batch_rejects_empty_list(self, client, base_url):
+        response = await client.post(
+            base_url, data="[]", headers={"content-type": "application/json"}
+        )
+
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [{"message": "Received an empty list in the batch request."}]
+        }
+
+
+class TestAsyncBatchExecutor:
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs):
+        view_kwargs.update(schema=AsyncSchema, asynchronous=True, batch=True)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_batch_keeps_order_of_concurrent_operations(self, client, base_url):
+        response = await client.post(
+            base_url,
+            data=json.dumps([dict(query="{b}"), dict(query="{a}"), dict(query="{c}")]),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status == 200
+        assert await response.json() == [
+            {"data": {"b": "hey2"}},
+            {"data": {"a": "hey"}},
+            {"data": {"c": "hey3"}},
+        ]
+
+
 class TestAsyncSchema:
     @pytest.fixture
     def view_kwargs(self, view_kwargs):
@@ -605,3 +692,672 @@ async def test_preflight_incorrect_request(client, base_url):
     )
 
     assert response.status == 400
+
+
+class TestSchemaValidationCache:
+    @pytest.fixture
+    def view(self):
+        return GraphQLView(schema=Schema, asynchronous=False)
+
+    @pytest.fixture
+    def view_kwargs(self, view):
+        return {"instance": view}
+
+    @pytest.fixture
+    def validate_schema_calls(self, monkeypatch):
+        import aiohttp_graphql
+
+        calls = []
+        validate_schema = aiohttp_graphql.validate_schema
+
+        def counting_validate_schema(schema):
+            calls.append(schema)
+            return validate_schema(schema)
+
+        monkeypatch.setattr(
+            aiohttp_graphql, "validate_schema", counting_validate_schema
+        )
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_schema_validated_once(
+        self, client, url_builder, validate_schema_calls
+    ):
+        for _ in range(3):
+            response = await client.get(url_builder(query="{test}"))
+            assert response.status == 200
+
+        assert validate_schema_calls == [Schema]
+
+    @pytest.mark.asyncio
+    async def test_schema_revalidated_when_replaced(
+        self, view, client, url_builder, validate_schema_calls
+    ):
+        response = await client.get(url_builder(query="{test}"))
+        assert response.status == 200
+
+        view.schema = AsyncSchema
+        response = await client.get(url_builder(query="{c}"))
+
+        assert response.status == 200
+        assert await response.json() == {"data": {"c": "hey3"}}
+        assert validate_schema_calls == [Schema, AsyncSchema]
+
+
+class TestDocumentCache:
+    @pytest.fixture
+    def document_cache(self):
+        return DocumentCache(max_entries=10)
+
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs, document_cache):
+        view_kwargs.update(document_cache=document_cache)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_parses_each_query_once(
+        self, client, url_builder, document_cache, monkeypatch
+    ):
+        import aiohttp_graphql
+
+        calls = []
+        parse = aiohttp_graphql.parse
+
+        def counting_parse(source):
+            calls.append(source)
+            return parse(source)
+
+        monkeypatch.setattr(aiohttp_graphql, "parse", counting_parse)
+
+        for who in ("Dolly", "You"):
+            response = await client.get(
+                url_builder(
+                    query="query helloWho($who: String) { test(who: $who) }",
+                    variables=json.dumps({"who": who}),
+                )
+            )
+            assert response.status == 200
+            assert await response.json() == {"data": {"test": "Hello %s" % who}}
+
+        assert len(calls) == 1
+        assert (document_cache.hits, document_cache.misses) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_syntax_errors_are_not_cached(
+        self, client, url_builder, document_cache
+    ):
+        response = await client.get(url_builder(query="syntaxerror"))
+
+        assert response.status == 400
+        assert len(document_cache) == 0
+
+
+class TestValidationCache:
+    @pytest.fixture
+    def view(self):
+        return GraphQLView(
+            schema=Schema, asynchronous=False, document_cache=DocumentCache()
+        )
+
+    @pytest.fixture
+    def view_kwargs(self, view):
+        return {"instance": view}
+
+    @pytest.fixture
+    def validate_calls(self, monkeypatch):
+        import aiohttp_graphql
+
+        calls = []
+        validate = aiohttp_graphql.validate
+
+        def counting_validate(schema, document):
+            calls.append(schema)
+            return validate(schema, document)
+
+        monkeypatch.setattr(aiohttp_graphql, "validate", counting_validate)
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_validation_errors_are_cached(
+        self, client, url_builder, validate_calls
+    ):
+        for _ in range(2):
+            response = await client.get(url_builder(query="{ test, unknownOne }"))
+            assert response.status == 400
+            assert await response.json() == {
+                "errors": [
+                    {
+                        "message": "Cannot query field 'unknownOne' on type 'QueryRoot'.",
+                        "locations": [{"line": 1, "column": 9}],
+                    }
+                ]
+            }
+
+        assert validate_calls == [Schema]
+
+    @pytest.mark.asyncio
+    async def test_validation_is_redone_when_schema_replaced(
+        self, view, client, url_builder, validate_calls
+    ):
+        response = await client.get(url_builder(query="{c}"))
+        assert response.status == 400
+
+        view.schema = AsyncSchema
+        for _ in range(2):
+            response = await client.get(url_builder(query="{c}"))
+            assert response.status == 200
+            assert await response.json() == {"data": {"c": "hey3"}}
+
+        assert validate_calls == [Schema, AsyncSchema]
+
+
+class TestPersistedQueries:
+    query = "query helloWho($who: String) { test(who: $who) }"
+
+    @pytest.fixture
+    def store(self):
+        return InMemoryPersistedQueryStore()
+
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs, store):
+        view_kwargs.update(persisted_queries=store)
+        return view_kwargs
+
+    def extensions(self, sha256_hash=None):
+        return {
+            "persistedQuery": {
+                "version": 1,
+                "sha256Hash": sha256_hash or query_hash(self.query),
+            }
+        }
+
+    @pytest.mark.asyncio
+    async def test_unknown_hash_is_not_found(self, client, url_builder):
+        response = await client.get(
+            url_builder(extensions=json.dumps(self.extensions()))
+        )
+
+        assert response.status == 200
+        assert await response.json() == {
+            "errors": [
+                {
+                    "message": "PersistedQueryNotFound",
+                    "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+                }
+            ]
+        }
+
+    @pytest.mark.asyncio
+    async def test_registers_query_and_runs_it_by_hash(
+        self, client, base_url, url_builder, store
+    ):
+        response = await client.post(
+            base_url,
+            data=json.dumps(
+                dict(
+                    query=self.query,
+                    variables={"who": "Dolly"},
+                    extensions=self.extensions(),
+                )
+            ),
+            headers={"content-type": "application/json"},
+        )
+        assert response.status == 200
+        assert await response.json() == {"data": {"test": "Hello Dolly"}}
+        assert len(store) == 1
+
+        response = await client.get(
+            url_builder(
+                variables=json.dumps({"who": "You"}),
+                extensions=json.dumps(self.extensions()),
+            )
+        )
+        assert response.status == 200
+        assert await response.json() == {"data": {"test": "Hello You"}}
+
+    @pytest.mark.asyncio
+    async def test_rejects_mismatched_hash(self, client, base_url, store):
+        response = await client.post(
+            base_url,
+            data=json.dumps(dict(query=self.query, extensions=self.extensions("abc"))),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [
+                {
+                    "message": "Provided sha256Hash does not match query.",
+                    "extensions": {"code": "INVALID_PERSISTED_QUERY"},
+                }
+            ]
+        }
+        assert len(store) == 0
+
+    @pytest.mark.asyncio
+    async def test_handles_poorly_formed_extensions(self, client, url_builder):
+        response = await client.get(url_builder(query="{test}", extensions="{"))
+
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [{"message": "Extensions are invalid JSON."}]
+        }
+
+    @pytest.mark.asyncio
+    async def test_rejects_extensions_not_an_object(self, client, url_builder):
+        response = await client.get(url_builder(query="{test}", extensions="[]"))
+
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [{"message": "Extensions must be a JSON object."}]
+        }
+
+
+class TestAllowlist:
+    @pytest.fixture
+    def allowlist(self, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(
+            json.dumps(
+                {
+                    "hello": "query helloWho($who: String) { test(who: $who) }",
+                    "invalid": "{ unknownOne }",
+                }
+            )
+        )
+        return QueryAllowlist.from_file(str(manifest))
+
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs, allowlist):
+        view_kwargs.update(allowlist=allowlist, allowlist_only=True)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_runs_operation_by_id(self, client, base_url, monkeypatch):
+        import aiohttp_graphql
+
+        monkeypatch.setattr(aiohttp_graphql, "parse", None)
+        monkeypatch.setattr(aiohttp_graphql, "validate", None)
+        response = await client.post(
+            base_url,
+            data=json.dumps(dict(documentId="hello", variables={"who": "Dolly"})),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status == 200
+        assert await response.json() == {"data": {"test": "Hello Dolly"}}
+
+    @pytest.mark.asyncio
+    async def test_runs_operation_by_id_with_get(self, client, url_builder):
+        response = await client.get(url_builder(documentId="hello"))
+
+        assert response.status == 200
+        assert await response.json() == {"data": {"test": "Hello World"}}
+
+    @pytest.mark.asyncio
+    async def test_reports_validation_errors_found_at_startup(
+        self, client, url_builder
+    ):
+        response = await client.get(url_builder(documentId="invalid"))
+
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [
+                {
+                    "message": "Cannot query field 'unknownOne' on type 'QueryRoot'.",
+                    "locations": [{"line": 1, "column": 3}],
+                }
+            ]
+        }
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_document_id(self, client, url_builder):
+        response = await client.get(url_builder(documentId="unknown"))
+
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [{"message": "Unknown document id."}]
+        }
+
+    @pytest.mark.asyncio
+    async def test_rejects_queries_not_in_allowlist(self, client, url_builder):
+        response = await client.get(url_builder(query="{test}"))
+
+        assert response.status == 403
+        assert await response.json() == {
+            "errors": [{"message": "Query is not in the allowlist."}]
+        }
+
+    @pytest.mark.asyncio
+    async def test_accepts_allowlisted_query_text(self, client, url_builder):
+        response = await client.get(
+            url_builder(query="query helloWho($who: String) { test(who: $who) }")
+        )
+
+        assert response.status == 200
+        assert await response.json() == {"data": {"test": "Hello World"}}
+
+
+class TestJsonCodec:
+    @pytest.fixture
+    def calls(self):
+        return []
+
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs, calls):
+        def json_loads(data):
+            calls.append("loads")
+            return json.loads(data)
+
+        def json_dumps(obj):
+            calls.append("dumps")
+            return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+        view_kwargs.update(json_loads=json_loads, json_dumps=json_dumps)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_uses_custom_codec(self, client, base_url, calls):
+        response = await client.post(
+            base_url,
+            data=json.dumps(dict(query="{test}")),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status == 200
+        assert response.content_type == "application/json"
+        assert await response.text() == '{"data":{"test":"Hello World"}}'
+        assert calls == ["loads", "loads", "dumps"]
+
+    @pytest.mark.asyncio
+    async def test_pretty_printing_uses_stdlib(self, client, url_builder, calls):
+        response = await client.get(url_builder(query="{test}", pretty="1"))
+
+        assert await response.text() == (
+            "{\n" '  "data": {\n' '    "test": "Hello World"\n' "  }\n" "}"
+        )
+        assert "dumps" not in calls
+
+    @pytest.mark.asyncio
+    async def test_handles_incomplete_json_bodies(self, client, base_url):
+        response = await client.post(
+            base_url, data='{"query":', headers={"content-type": "application/json"}
+        )
+
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [{"message": "POST body sent invalid JSON."}]
+        }
+
+
+class TestOrjsonCodec:
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs):
+        orjson = pytest.importorskip("orjson")
+        view_kwargs.update(json_loads=orjson.loads, json_dumps=orjson.dumps)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_orjson(self, client, url_builder):
+        response = await client.get(
+            url_builder(
+                query="query helloWho($who: String) { test(who: $who) }",
+                variables=json.dumps({"who": "Dolly"}),
+            )
+        )
+
+        assert response.status == 200
+        assert await response.text() == '{"data":{"test":"Hello Dolly"}}'
+
+    @pytest.mark.asyncio
+    async def test_orjson_invalid_variables(self, client, url_builder):
+        response = await client.get(url_builder(query="{test}", variables="who:You"))
+
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [{"message": "Variables are invalid JSON."}]
+        }
+
+
+class TestStreamResponse:
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs):
+        view_kwargs.update(stream=True, stream_chunk_size=64, stream_list_chunk_size=7)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_streams_large_results(self, client, url_builder):
+        response = await client.get(url_builder(query="{test, items(count: 50)}"))
+
+        assert response.status == 200
+        assert response.headers["Transfer-Encoding"] == "chunked"
+        assert await response.text() == json.dumps(
+            {
+                "data": {
+                    "test": "Hello World",
+                    "items": ["item %d" % i for i in range(50)],
+                }
+            },
+            separators=(",", ":"),
+        )
+
+    @pytest.mark.asyncio
+    async def test_streams_errors(self, client, url_builder):
+        response = await client.get(url_builder(query="{thrower}"))
+
+        assert response.status == 200
+        assert await response.json() == {
+            "data": None,
+            "errors": [
+                {
+                    "locations": [{"column": 2, "line": 1}],
+                    "message": "Throws!",
+                    "path": ["thrower"],
+                }
+            ],
+        }
+
+    @pytest.mark.asyncio
+    async def test_streams_invalid_results(self, client, url_builder):
+        response = await client.get(url_builder(query="{ items(count: 0) }"))
+
+        assert response.status == 200
+        assert await response.json() == {"data": {"items": []}}
+
+        response = await client.get(url_builder(query="syntaxerror"))
+
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [
+                {
+                    "locations": [{"column": 1, "line": 1}],
+                    "message": "Syntax Error: Unexpected Name 'syntaxerror'.",
+                }
+            ]
+        }
+
+
+ExecutorSchema = GraphQLSchema(
+    query=GraphQLObjectType(
+        name="QueryRoot",
+        fields={
+            "thread": GraphQLField(
+                GraphQLString, resolve=lambda obj, info: threading.get_ident()
+            ),
+            "wait": GraphQLField(
+                GraphQLString,
+                resolve=lambda obj, info: "done" if obj["event"].wait(5) else None,
+            ),
+        },
+    )
+)
+
+
+class TestExecutor:
+    @pytest.fixture
+    def executor(self):
+        executor = ThreadPoolExecutor(max_workers=4)
+        yield executor
+        executor.shutdown()
+
+    @pytest.fixture
+    def event(self):
+        event = threading.Event()
+        yield event
+        event.set()
+
+    @pytest.fixture
+    def view(self, executor, event):
+        return GraphQLView(
+            schema=ExecutorSchema,
+            asynchronous=False,
+            root_value={"event": event},
+            executor=executor,
+            executor_concurrency=2,
+        )
+
+    @pytest.fixture
+    def view_kwargs(self, view):
+        return {"instance": view}
+
+    @staticmethod
+    async def wait_until(condition):
+        for _ in range(500):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError("Condition not met")
+
+    @pytest.mark.asyncio
+    async def test_runs_operations_in_executor(self, client, url_builder, monkeypatch):
+        threads = []
+
+        def parse(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return graphql_parse(*args, **kwargs)
+
+        def validate(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return graphql_validate(*args, **kwargs)
+
+        monkeypatch.setattr("aiohttp_graphql.parse", parse)
+        monkeypatch.setattr("aiohttp_graphql.validate", validate)
+
+        response = await client.get(url_builder(query="{thread}"))
+
+        assert response.status == 200
+        threads.append((await response.json())["data"]["thread"])
+        assert len(threads) == 3
+        assert threading.get_ident() not in threads
+
+    @pytest.mark.asyncio
+    async def test_does_not_block_event_loop(self, view, client, url_builder, event):
+        waiting = asyncio.ensure_future(client.get(url_builder(query="{wait}")))
+        await self.wait_until(lambda: view.executor_in_flight == 1)
+
+        response = await client.get(url_builder(query="{thread}"))
+        assert response.status == 200
+        assert not waiting.done()
+
+        event.set()
+        response = await waiting
+        assert await response.json() == {"data": {"wait": "done"}}
+        assert view.executor_in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency(self, view, client, url_builder, event):
+        waiting = [
+            asyncio.ensure_future(client.get(url_builder(query="{wait}")))
+            for _ in range(3)
+        ]
+        await self.wait_until(
+            lambda: view.executor_in_flight == 2 and view.executor_queue_depth == 1
+        )
+
+        event.set()
+        for response in await asyncio.gather(*waiting):
+            assert await response.json() == {"data": {"wait": "done"}}
+        assert view.executor_in_flight == 0
+        assert view.executor_queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_reports_errors(self, client, url_builder):
+        response = await client.get(url_builder(query="syntaxerror"))
+        assert response.status == 400
+
+        response = await client.get(url_builder(query="mutation { thread }"))
+        assert response.status == 405
+        assert response.headers["Allow"] == "POST"
+
+
+class TestSizeLimits:
+    @pytest.fixture
+    def view_kwargs(self):
+        return {"schema": Schema, "max_body_size": 100, "max_query_length": 20}
+
+    @pytest.mark.asyncio
+    async def test_rejects_large_bodies(self, client, url_builder):
+        response = await client.post(
+            url_builder(),
+            data=json.dumps({"query": "{test}", "variables": {"a": "x" * 100}}),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status == 413
+        assert await response.json() == {
+            "errors": [{"message": "Request bodies are limited to 100 bytes."}]
+        }
+
+    @pytest.mark.asyncio
+    async def test_rejects_large_chunked_bodies(self, client, url_builder):
+        async def chunks():
+            yield b'{"query": "{test}", "variables": {"a": "'
+            for _ in range(10):
+                yield b"x" * 10
+            yield b'"}}'
+
+        response = await client.post(
+            url_builder(), data=chunks(), headers={"content-type": "application/json"},
+        )
+
+        assert response.status == 413
+
+    @pytest.mark.asyncio
+    async def test_parses_bodies_within_limits(self, client, url_builder):
+        response = await client.post(
+            url_builder(),
+            data=json.dumps({"query": "{test}"}).encode(),
+            headers={"content-type": "application/json"},
+        )
+        assert await response.json() == {"data": {"test": "Hello World"}}
+
+        response = await client.post(
+            url_builder(),
+            data="{test}",
+            headers={"content-type": "application/graphql"},
+        )
+        assert await response.json() == {"data": {"test": "Hello World"}}
+
+    @pytest.mark.asyncio
+    async def test_rejects_long_queries(self, client, url_builder):
+        query = "{test test test test}"
+        response = await client.get(url_builder(query=query))
+
+        assert response.status == 413
+        assert await response.json() == {
+            "errors": [{"message": "Queries are limited to 20 characters."}]
+        }
+
+        response = await client.post(
+            url_builder(), data=query, headers={"content-type": "application/graphql"},
+        )
+        assert response.status == 413
+
+
+@pytest.mark.skipif(
+    supports_incremental_delivery(),
+    reason="graphql-core supports incremental delivery",
+)
+def test_rejects_unsupported_incremental_delivery():
+    with pytest.raises(ValueError, match="experimental_execute_incrementally"):
+        GraphQLView(schema=Schema, incremental=True)
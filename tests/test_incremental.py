@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+import pytest
+
+from aiohttp_graphql.incremental import supports_incremental_delivery
+
+pytestmark = pytest.mark.skipif(
+    not supports_incremental_delivery(),
+    reason="graphql-core does not support incremental delivery",
+)
+
+if supports_incremental_delivery():
+    from graphql import (
+        GraphQLDeferDirective,
+        GraphQLField,
+        GraphQLList,
+        GraphQLObjectType,
+        GraphQLSchema,
+        GraphQLStreamDirective,
+        GraphQLString,
+        specified_directives,
+    )
+
+    async def resolve_slow(*_args):
+        await asyncio.sleep(0.01)
+        return "slow"
+
+    async def resolve_items(*_args):
+        for item in ("a", "b"):
+            await asyncio.sleep(0.001)
+            yield item
+
+    IncrementalSchema = GraphQLSchema(
+        query=GraphQLObjectType(
+            "Query",
+            {
+                "fast": GraphQLField(GraphQLString, resolve=lambda *_: "fast"),
+                "slow": GraphQLField(GraphQLString, resolve=resolve_slow),
+                "items": GraphQLField(
+                    GraphQLList(GraphQLString), resolve=resolve_items
+                ),
+            },
+        ),
+        directives=[
+            *specified_directives,
+            GraphQLDeferDirective,
+            GraphQLStreamDirective,
+        ],
+    )
+
+
+MULTIPART = {"accept": "multipart/mixed"}
+
+
+def parse_parts(body):
+    assert body.endswith("\r\n-----\r\n")
+    parts = body[: -len("\r\n-----\r\n")].split("\r\n---\r\n")[1:]
+    payloads = []
+    for part in parts:
+        headers, payload = part.split("\r\n\r\n", 1)
+        assert headers == "Content-Type: application/json; charset=utf-8"
+        payloads.append(json.loads(payload))
+    return payloads
+
+
+@pytest.fixture
+def view_kwargs():
+    return {"schema": IncrementalSchema, "incremental": True}
+
+
+@pytest.mark.asyncio
+async def test_defer(client, url_builder):
+    response = await client.get(
+        url_builder(query="{ fast ... @defer { slow } }"), headers=MULTIPART
+    )
+
+    assert response.status == 200
+    assert response.content_type == "multipart/mixed"
+    payloads = parse_parts(await response.text())
+    assert payloads[0] == {"data": {"fast": "fast"}, "hasNext": True}
+    assert payloads[-1]["hasNext"] is False
+    assert [
+        incremental["data"]
+        for payload in payloads[1:]
+        for incremental in payload.get("incremental", [])
+    ] == [{"slow": "slow"}]
+
+
+@pytest.mark.asyncio
+async def test_stream(client, url_builder):
+    response = await client.get(
+        url_builder(query="{ items @stream(initialCount: 1) }"), headers=MULTIPART
+    )
+
+    assert response.status == 200
+    payloads = parse_parts(await response.text())
+    assert payloads[0] == {"data": {"items": ["a"]}, "hasNext": True}
+    assert [
+        item
+        for payload in payloads[1:]
+        for incremental in payload.get("incremental", [])
+        for item in incremental["items"]
+    ] == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_results_without_defer_are_not_multipart(client, url_builder):
+    response = await client.get(url_builder(query="{ fast }"), headers=MULTIPART)
+
+    assert response.status == 200
+    assert await response.json() == {"data": {"fast": "fast"}}
+
+
+@pytest.mark.asyncio
+async def test_defer_requires_multipart(client, url_builder):
+    response = await client.get(url_builder(query="{ fast ... @defer { slow } }"))
+
+    assert response.status == 400
+    assert await response.json() == {
+        "errors": [
+            {
+                "message": "Deferred and streamed results are only delivered "
+                "to clients accepting multipart/mixed."
+            }
+        ]
+    }
@@ -0,0 +1,204 @@
+import asyncio
+import json
+
+from graphql import GraphQLField, GraphQLObjectType, GraphQLSchema, GraphQLString
+
+import pytest
+
+from aiohttp_graphql import GraphQLView
+from aiohttp_graphql.error import HttpQueryError
+from aiohttp_graphql.limits import ConcurrencyLimiter
+
+
+@pytest.mark.asyncio
+async def test_admits_operations_up_to_the_limit():
+    limiter = ConcurrencyLimiter(2)
+
+    await limiter.acquire()
+    await limiter.acquire()
+    with pytest.raises(HttpQueryError) as exc_info:
+        await limiter.acquire()
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "1"}
+    assert (limiter.in_flight, limiter.rejected) == (2, 1)
+
+    limiter.release()
+    await limiter.acquire()
+    assert limiter.in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_queues_operations_in_order():
+    limiter = ConcurrencyLimiter(1, max_queue=2)
+    admitted = []
+
+    async def run(name):
+        await limiter.acquire()
+        admitted.append(name)
+
+    await limiter.acquire()
+    waiting = [asyncio.ensure_future(run(name)) for name in ("a", "b", "c")]
+    await asyncio.sleep(0)
+
+    assert limiter.queued == 2
+    assert waiting[2].done()
+    with pytest.raises(HttpQueryError):
+        waiting[2].result()
+
+    limiter.release()
+    await asyncio.sleep(0)
+    assert admitted == ["a"]
+    limiter.release()
+    await asyncio.sleep(0)
+    assert admitted == ["a", "b"]
+    assert (limiter.in_flight, limiter.queued) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_rejects_operations_waiting_too_long():
+    limiter = ConcurrencyLimiter(1, max_queue=1, queue_timeout=0.01, retry_after=5)
+    await limiter.acquire()
+
+    with pytest.raises(HttpQueryError) as exc_info:
+        await limiter.acquire()
+
+    assert exc_info.value.headers == {"Retry-After": "5"}
+    assert (limiter.in_flight, limiter.queued, limiter.rejected) == (1, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_operations_leave_the_queue():
+    limiter = ConcurrencyLimiter(1, max_queue=1)
+    await limiter.acquire()
+
+    waiting = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+
+    assert limiter.queued == 0
+    limiter.release()
+    assert limiter.in_flight == 0
+
+
+async def resolve_wait(obj, info):
+    await obj["event"].wait()
+    return "done"
+
+
+WaitType = GraphQLObjectType(
+    name="Wait", fields={"wait": GraphQLField(GraphQLString, resolve=resolve_wait)}
+)
+WaitSchema = GraphQLSchema(query=WaitType, mutation=WaitType)
+
+
+class TestViewLimits:
+    @pytest.fixture
+    def event(self):
+        return asyncio.Event()
+
+    @pytest.fixture
+    def view(self, event):
+        return GraphQLView(
+            schema=WaitSchema,
+            asynchronous=True,
+            root_value={"event": event},
+            limiter=ConcurrencyLimiter(1, max_queue=1),
+            mutation_limiter=ConcurrencyLimiter(1),
+            batch=True,
+        )
+
+    @pytest.fixture
+    def view_kwargs(self, view):
+        return {"instance": view}
+
+    @pytest.mark.asyncio
+    async def test_sheds_load_when_saturated(self, view, client, url_builder, event):
+        waiting = [
+            asyncio.ensure_future(client.get(url_builder(query="{wait}")))
+            for _ in range(2)
+        ]
+        while view.limiter.queued < 1:
+            await asyncio.sleep(0.01)
+
+        response = await client.get(url_builder(query="{wait}"))
+        assert response.status == 503
+        assert response.headers["Retry-After"] == "1"
+        assert await response.json() == {
+            "errors": [{"message": "The server is overloaded, retry later."}]
+        }
+
+        waiting.append(
+            asyncio.ensure_future(
+                client.post(
+                    url_builder(),
+                    data=json.dumps({"query": "mutation {wait}"}),
+                    headers={"content-type": "application/json"},
+                )
+            )
+        )
+        while view.mutation_limiter.in_flight < 1:
+            await asyncio.sleep(0.01)
+
+        event.set()
+        for response in await asyncio.gather(*waiting):
+            assert await response.json() == {"data": {"wait": "done"}}
+        assert view.limiter.in_flight == 0
+        assert view.mutation_limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_does_not_limit_invalid_operations(self, view, client, url_builder):
+        await view.limiter.acquire()
+
+        response = await client.get(url_builder(query="{unknown}"))
+        assert response.status == 400
+        assert view.limiter.queued == 0
+        view.limiter.release()
+
+    @pytest.mark.asyncio
+    async def test_sheds_batches_when_saturated(self, view, client, url_builder):
+        await view.limiter.acquire()
+        waiting = asyncio.ensure_future(client.get(url_builder(query="{wait}")))
+        while view.limiter.queued < 1:
+            await asyncio.sleep(0.01)
+
+        response = await client.post(
+            url_builder(),
+            data=json.dumps([{"query": "{wait}"}, {"query": "{unknown}"}]),
+            headers={"content-type": "application/json"},
+        )
+        assert response.status == 503
+        assert response.headers["Retry-After"] == "1"
+        assert await response.json() == {
+            "errors": [{"message": "The server is overloaded, retry later."}]
+        }
+
+        view.limiter.release()
+        view.root_value["event"].set()
+        assert (await waiting).status == 200
+
+    @pytest.mark.asyncio
+    async def test_admits_batches_as_one_operation(
+        self, view, client, url_builder, event
+    ):
+        event.set()
+        response = await client.post(
+            url_builder(),
+            data=json.dumps([{"query": "{wait}"}] * 3),
+            headers={"content-type": "application/json"},
+        )
+        assert response.status == 200
+        assert await response.json() == [{"data": {"wait": "done"}}] * 3
+
+        await view.mutation_limiter.acquire()
+        response = await client.post(
+            url_builder(),
+            data=json.dumps([{"query": "{wait}"}, {"query": "mutation {wait}"}]),
+            headers={"content-type": "application/json"},
+        )
+        assert response.status == 503
+        view.mutation_limiter.release()
+
+        assert view.limiter.in_flight == 0
+        assert view.mutation_limiter.in_flight == 0
@@ -0,0 +1,119 @@
+import json
+
+from graphql import build_schema
+
+import pytest
+
+from aiohttp_graphql.cache import DocumentCache
+from aiohttp_graphql.limits import ConcurrencyLimiter
+from aiohttp_graphql.metrics import GraphQLMetrics, Histogram
+
+MetricsSchema = build_schema(
+    """
+    type Query {
+      hello: String
+      fail: String
+    }
+    """
+)
+
+
+class Root:
+    def hello(self, info):
+        return "world"
+
+    def fail(self, info):
+        raise ValueError("failed")
+
+
+def test_histogram_buckets():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert list(histogram.samples()) == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(2.65)
+
+
+def test_operation_labels_are_bounded():
+    metrics = GraphQLMetrics(max_operations=2)
+    for name in ("A", "B", "C", "D", "A"):
+        metrics.observe_operation(name, 0.01)
+
+    assert {name: h.count for name, h in metrics.operations.items()} == {
+        "A": 2,
+        "B": 1,
+        "__other__": 2,
+    }
+
+
+def test_render_escapes_labels():
+    metrics = GraphQLMetrics(namespace="")
+    metrics.observe_operation('say "hi"', 0.01)
+
+    assert 'operation_duration_seconds_count{operation="say \\"hi\\""} 1' in (
+        metrics.render()
+    )
+
+
+class TestMetricsEndpoint:
+    @pytest.fixture
+    def metrics(self):
+        return GraphQLMetrics(buckets=(0.5, 60.0))
+
+    @pytest.fixture
+    def view_kwargs(self, metrics):
+        return {
+            "schema": MetricsSchema,
+            "root_value": Root(),
+            "metrics": metrics,
+            "document_cache": DocumentCache(),
+            "limiter": ConcurrencyLimiter(4),
+            "batch": True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_serves_metrics(self, client, url_builder, metrics):
+        for _ in range(2):
+            await client.get(url_builder(query="query Hello { hello }"))
+        await client.get(url_builder(query="{ fail }"))
+        await client.get(url_builder(query="{ unknown }"))
+        await client.get(url_builder(query="{"))
+
+        response = await client.get("/metrics")
+        text = await response.text()
+
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        lines = text.splitlines()
+        assert "# TYPE graphql_request_duration_seconds histogram" in lines
+        assert "graphql_request_duration_seconds_count 5" in lines
+        assert "graphql_requests_in_flight 0" in lines
+        assert 'graphql_operation_duration_seconds_count{operation="Hello"} 2' in lines
+        assert 'graphql_operation_duration_seconds_count{operation=""} 3' in lines
+        assert 'graphql_phase_duration_seconds_count{phase="parse"} 4' in lines
+        assert 'graphql_phase_duration_seconds_count{phase="validate"} 4' in lines
+        assert 'graphql_phase_duration_seconds_count{phase="execute"} 3' in lines
+        assert 'graphql_phase_duration_seconds_count{phase="encode"} 5' in lines
+        assert 'graphql_phase_duration_seconds_bucket{phase="execute",le="60"} 3' in (
+            lines
+        )
+        assert 'graphql_errors_total{type="ValueError"} 1' in lines
+        assert 'graphql_errors_total{type="GraphQLError"} 1' in lines
+        assert 'graphql_errors_total{type="GraphQLSyntaxError"} 1' in lines
+        assert "graphql_document_cache_hits_total 1" in lines
+        assert "graphql_document_cache_misses_total 4" in lines
+        assert 'graphql_limiter_rejected_total{limiter="limiter"} 0' in lines
+        assert "graphql_execution_timeouts_total 0" in lines
+
+    @pytest.mark.asyncio
+    async def test_times_batch_encoding(self, client, url_builder, metrics):
+        response = await client.post(
+            url_builder(),
+            data=json.dumps([{"query": "{ hello }"}, {"query": "{ fail }"}]),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status == 200
+        assert metrics.phases["execute"].count == 2
+        assert metrics.phases["encode"].count == 1
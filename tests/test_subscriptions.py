@@ -0,0 +1,445 @@
+import asyncio
+import json
+
+from aiohttp import WSMsgType
+from graphql import GraphQLField, GraphQLObjectType, GraphQLSchema, GraphQLString
+
+import pytest
+
+from aiohttp_graphql.limits import ConcurrencyLimiter
+from tests.schemas import Schema
+
+
+PROTOCOLS = ("graphql-transport-ws",)
+
+closed_sources = []
+
+
+async def subscribe_forever(*args):
+    try:
+        while True:
+            await asyncio.sleep(0.001)
+            yield "tick"
+    finally:
+        closed_sources.append("forever")
+
+
+async def subscribe_failing(*args):
+    yield "tick"
+    raise ValueError("Source failed.")
+
+
+ForeverSchema = GraphQLSchema(
+    query=GraphQLObjectType(
+        "Query", {"test": GraphQLField(GraphQLString, resolve=lambda *_: "test")}
+    ),
+    subscription=GraphQLObjectType(
+        "Subscription",
+        {
+            "forever": GraphQLField(
+                GraphQLString,
+                resolve=lambda event, _info: event,
+                subscribe=subscribe_forever,
+            ),
+            "failing": GraphQLField(
+                GraphQLString,
+                resolve=lambda event, _info: event,
+                subscribe=subscribe_failing,
+            ),
+        },
+    ),
+)
+
+
+@pytest.fixture
+def view_kwargs():
+    return {"schema": Schema, "subscriptions": True, "keep_alive": None}
+
+
+async def connect(client, base_url):
+    ws = await client.ws_connect(base_url, protocols=PROTOCOLS)
+    await ws.send_json({"type": "connection_init"})
+    assert await ws.receive_json() == {"type": "connection_ack"}
+    return ws
+
+
+async def wait_closed(ws):
+    await ws.close()
+    # let the server finish the closing handshake it started
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_subscription(client, base_url):
+    ws = await connect(client, base_url)
+    await ws.send_json(
+        {
+            "id": "1",
+            "type": "subscribe",
+            "payload": {"query": "subscription { subscriptionsTest }"},
+        }
+    )
+
+    for letter in "abcdefghijkl":
+        assert await ws.receive_json() == {
+            "id": "1",
+            "type": "next",
+            "payload": {"data": {"subscriptionsTest": letter}},
+        }
+    assert await ws.receive_json() == {"id": "1", "type": "complete"}
+    await ws.close()
+
+
+@pytest.mark.asyncio
+async def test_query_over_websocket(client, base_url):
+    ws = await connect(client, base_url)
+    await ws.send_json(
+        {
+            "id": "1",
+            "type": "subscribe",
+            "payload": {
+                "query": "query helloWho($who: String) { test(who: $who) }",
+                "variables": {"who": "Dolly"},
+            },
+        }
+    )
+
+    assert await ws.receive_json() == {
+        "id": "1",
+        "type": "next",
+        "payload": {"data": {"test": "Hello Dolly"}},
+    }
+    assert await ws.receive_json() == {"id": "1", "type": "complete"}
+    await ws.close()
+
+
+@pytest.mark.asyncio
+async def test_validation_errors(client, base_url):
+    ws = await connect(client, base_url)
+    await ws.send_json(
+        {"id": "1", "type": "subscribe", "payload": {"query": "{ unknownOne }"}}
+    )
+
+    assert await ws.receive_json() == {
+        "id": "1",
+        "type": "error",
+        "payload": [
+            {
+                "message": "Cannot query field 'unknownOne' on type 'QueryRoot'.",
+                "locations": [{"line": 1, "column": 3}],
+            }
+        ],
+    }
+    await ws.close()
+
+
+@pytest.mark.asyncio
+async def test_ping_pong(client, base_url):
+    ws = await connect(client, base_url)
+    await ws.send_json({"type": "ping"})
+
+    assert await ws.receive_json() == {"type": "pong"}
+    await ws.close()
+
+
+@pytest.mark.asyncio
+async def test_subscribe_before_init_is_unauthorized(client, base_url):
+    ws = await client.ws_connect(base_url, protocols=PROTOCOLS)
+    await ws.send_json({"id": "1", "type": "subscribe", "payload": {"query": "{test}"}})
+
+    message = await ws.receive()
+    assert message.type == WSMsgType.CLOSE
+    assert message.data == 4401
+    await wait_closed(ws)
+
+
+@pytest.mark.asyncio
+async def test_invalid_message_closes_connection(client, base_url):
+    ws = await connect(client, base_url)
+    await ws.send_str("{")
+
+    message = await ws.receive()
+    assert message.type == WSMsgType.CLOSE
+    assert message.data == 4400
+    await wait_closed(ws)
+
+
+class TestConnectionTimers:
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs):
+        view_kwargs.update(keep_alive=0.01, connection_init_wait_timeout=0.05)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_connection_init_timeout(self, client, base_url):
+        ws = await client.ws_connect(base_url, protocols=PROTOCOLS)
+
+        while True:
+            message = await ws.receive()
+            if message.type != WSMsgType.TEXT:
+                break
+        assert message.type == WSMsgType.CLOSE
+        assert message.data == 4408
+
+    @pytest.mark.asyncio
+    async def test_keep_alive(self, client, base_url):
+        ws = await connect(client, base_url)
+
+        assert await ws.receive_json() == {"type": "ping"}
+        await ws.close()
+
+
+class TestCancellation:
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs):
+        view_kwargs.update(schema=ForeverSchema)
+        return view_kwargs
+
+    async def subscribe(self, client, base_url):
+        closed_sources.clear()
+        ws = await connect(client, base_url)
+        await ws.send_json(
+            {
+                "id": "1",
+                "type": "subscribe",
+                "payload": {"query": "subscription { forever }"},
+            }
+        )
+        assert await ws.receive_json() == {
+            "id": "1",
+            "type": "next",
+            "payload": {"data": {"forever": "tick"}},
+        }
+        return ws
+
+    async def wait_for_close(self):
+        for _ in range(100):
+            if closed_sources:
+                break
+            await asyncio.sleep(0.01)
+
+    @pytest.mark.asyncio
+    async def test_complete_closes_source(self, client, base_url):
+        ws = await self.subscribe(client, base_url)
+        await ws.send_json({"id": "1", "type": "complete"})
+        await self.wait_for_close()
+
+        assert closed_sources == ["forever"]
+        await ws.close()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_source(self, client, base_url):
+        ws = await self.subscribe(client, base_url)
+        await ws.close()
+        await self.wait_for_close()
+
+        assert closed_sources == ["forever"]
+
+
+class TestSourceErrors:
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs):
+        view_kwargs.update(schema=ForeverSchema)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_source_error_completes_operation(self, client, base_url):
+        ws = await connect(client, base_url)
+        await ws.send_json(
+            {
+                "id": "1",
+                "type": "subscribe",
+                "payload": {"query": "subscription { failing }"},
+            }
+        )
+
+        assert await ws.receive_json() == {
+            "id": "1",
+            "type": "next",
+            "payload": {"data": {"failing": "tick"}},
+        }
+        assert await ws.receive_json() == {
+            "id": "1",
+            "type": "next",
+            "payload": {"data": None, "errors": [{"message": "Source failed."}]},
+        }
+        assert await ws.receive_json() == {"id": "1", "type": "complete"}
+        await ws.close()
+
+
+def parse_events(text):
+    events = []
+    for block in text.split("\n\n"):
+        if not block or block.startswith(":"):
+            continue
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"] or "null")))
+    return events
+
+
+class TestEventStream:
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs):
+        view_kwargs.update(sse=True, sse_heartbeat=0.0005)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_subscription(self, client, url_builder):
+        response = await client.get(
+            url_builder(query="subscription { subscriptionsTest }"),
+            headers={"accept": "text/event-stream"},
+        )
+
+        assert response.status == 200
+        assert response.content_type == "text/event-stream"
+        text = await response.text()
+        assert ": heartbeat\n\n" in text
+        assert parse_events(text) == [
+            ("next", {"data": {"subscriptionsTest": letter}})
+            for letter in "abcdefghijkl"
+        ] + [("complete", None)]
+
+    @pytest.mark.asyncio
+    async def test_query(self, client, base_url):
+        response = await client.post(
+            base_url,
+            data=json.dumps(
+                dict(
+                    query="query helloWho($who: String){ test(who: $who) }",
+                    variables={"who": "Dolly"},
+                )
+            ),
+            headers={
+                "content-type": "application/json",
+                "accept": "text/event-stream",
+            },
+        )
+
+        assert response.status == 200
+        assert parse_events(await response.text()) == [
+            ("next", {"data": {"test": "Hello Dolly"}}),
+            ("complete", None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_validation_errors(self, client, url_builder):
+        response = await client.get(
+            url_builder(query="{ unknownOne }"),
+            headers={"accept": "text/event-stream"},
+        )
+
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [
+                {
+                    "message": "Cannot query field 'unknownOne' on type 'QueryRoot'.",
+                    "locations": [{"line": 1, "column": 3}],
+                }
+            ]
+        }
+
+    @pytest.mark.asyncio
+    async def test_mutation_via_get(self, client, url_builder):
+        response = await client.get(
+            url_builder(query="mutation TestMutation { writeTest { test } }"),
+            headers={"accept": "text/event-stream"},
+        )
+
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [
+                {
+                    "message": "Can only perform a mutation operation from a POST request."
+                }
+            ]
+        }
+
+
+class TestEventStreamCancellation:
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs):
+        view_kwargs.update(schema=ForeverSchema, sse=True)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_source(self, client, url_builder):
+        closed_sources.clear()
+        response = await client.get(
+            url_builder(query="subscription { forever }"),
+            headers={"accept": "text/event-stream"},
+        )
+        assert await response.content.readline() == b"event: next\n"
+        response.close()
+
+        for _ in range(100):
+            if closed_sources:
+                break
+            await asyncio.sleep(0.01)
+        assert closed_sources == ["forever"]
+
+
+class TestAdmission:
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs):
+        view_kwargs.update(sse=True, limiter=ConcurrencyLimiter(0), max_query_length=40)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_websocket_operations_are_limited(self, client, base_url):
+        ws = await connect(client, base_url)
+        for query in ("{ test }", "subscription { subscriptionsTest }"):
+            await ws.send_json(
+                {"id": "1", "type": "subscribe", "payload": {"query": query}}
+            )
+            assert await ws.receive_json() == {
+                "id": "1",
+                "type": "error",
+                "payload": [{"message": "The server is overloaded, retry later."}],
+            }
+        await ws.close()
+
+    @pytest.mark.asyncio
+    async def test_event_stream_operations_are_limited(self, client, url_builder):
+        for query in ("{ test }", "subscription { subscriptionsTest }"):
+            response = await client.get(
+                url_builder(query=query), headers={"accept": "text/event-stream"}
+            )
+
+            assert response.status == 503
+            assert response.headers["Retry-After"] == "1"
+            assert await response.json() == {
+                "errors": [{"message": "The server is overloaded, retry later."}]
+            }
+
+    @pytest.mark.asyncio
+    async def test_event_stream_query_length(self, client, url_builder):
+        response = await client.get(
+            url_builder(query="{ test(who: " + '"' + "x" * 40 + '"' + ") }"),
+            headers={"accept": "text/event-stream"},
+        )
+
+        assert response.status == 413
+        assert await response.json() == {
+            "errors": [{"message": "Queries are limited to 40 characters."}]
+        }
+
+
+class TestEventStreamSourceErrors:
+    @pytest.fixture
+    def view_kwargs(self, view_kwargs):
+        view_kwargs.update(schema=ForeverSchema, sse=True)
+        return view_kwargs
+
+    @pytest.mark.asyncio
+    async def test_source_error_completes_stream(self, client, url_builder):
+        response = await client.get(
+            url_builder(query="subscription { failing }"),
+            headers={"accept": "text/event-stream"},
+        )
+
+        assert response.status == 200
+        assert parse_events(await response.text()) == [
+            ("next", {"data": {"failing": "tick"}}),
+            ("next", {"data": None, "errors": [{"message": "Source failed."}]}),
+            ("complete", None),
+        ]
@@ -0,0 +1,171 @@
+import asyncio
+import time
+
+from graphql import GraphQLField, GraphQLObjectType, GraphQLSchema, GraphQLString
+from graphql.execution import MiddlewareManager
+
+import pytest
+
+from aiohttp_graphql import GraphQLView, extend_middleware
+from aiohttp_graphql.dataloader import DataLoader
+from aiohttp_graphql.timeout import ExecutionDeadline
+
+
+class Resolvers:
+    def __init__(self):
+        self.cancelled = []
+        self.called = []
+
+    async def fast(self, obj, info):
+        return "fast"
+
+    async def slow(self, obj, info):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            self.cancelled.append(info.field_name)
+            raise
+        return "slow"
+
+    def blocking(self, obj, info):
+        time.sleep(0.1)
+        return "blocking"
+
+    def after(self, obj, info):
+        self.called.append(info.field_name)
+        return "after"
+
+
+@pytest.fixture
+def resolvers():
+    return Resolvers()
+
+
+@pytest.fixture
+def schema(resolvers):
+    return GraphQLSchema(
+        query=GraphQLObjectType(
+            name="QueryRoot",
+            fields={
+                name: GraphQLField(GraphQLString, resolve=getattr(resolvers, name))
+                for name in ("fast", "slow", "blocking", "after")
+            },
+        )
+    )
+
+
+@pytest.fixture
+def view(schema):
+    return GraphQLView(
+        schema=schema,
+        asynchronous=True,
+        execution_timeout=0.05,
+        operation_timeouts={"Patient": 10},
+    )
+
+
+@pytest.fixture
+def view_kwargs(view):
+    return {"instance": view}
+
+
+@pytest.mark.asyncio
+async def test_returns_partial_data_on_timeout(view, client, url_builder, resolvers):
+    response = await client.get(url_builder(query="{ fast slow }"))
+
+    assert response.status == 200
+    assert await response.json() == {
+        "data": {"fast": "fast", "slow": None},
+        "errors": [
+            {
+                "message": "Execution timed out after 0.05 seconds.",
+                "locations": [{"line": 1, "column": 8}],
+                "path": ["slow"],
+                "extensions": {"code": "EXECUTION_TIMEOUT"},
+            }
+        ],
+    }
+    assert resolvers.cancelled == ["slow"]
+    assert view.execution_timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_does_not_call_resolvers_past_the_deadline(
+    view, client, url_builder, resolvers
+):
+    response = await client.get(url_builder(query="{ blocking after }"))
+
+    assert await response.json() == {
+        "data": {"blocking": "blocking", "after": None},
+        "errors": [
+            {
+                "message": "Execution timed out after 0.05 seconds.",
+                "locations": [{"line": 1, "column": 12}],
+                "path": ["after"],
+                "extensions": {"code": "EXECUTION_TIMEOUT"},
+            }
+        ],
+    }
+    assert resolvers.called == []
+    assert view.execution_timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_overrides_timeout_by_operation_name(view, client, url_builder):
+    response = await client.get(url_builder(query="query Patient { blocking after }"))
+
+    assert await response.json() == {"data": {"blocking": "blocking", "after": "after"}}
+    assert view.execution_timeouts == 0
+
+
+def test_deadline_runs_after_other_middleware():
+    deadline = ExecutionDeadline(1)
+
+    assert extend_middleware(None, [deadline]) == [deadline]
+    assert extend_middleware([len], [deadline]) == [len, deadline]
+    manager = extend_middleware(MiddlewareManager(len), [deadline])
+    assert manager.middlewares == (len, deadline)
+
+
+class TestDataLoader:
+    @pytest.fixture
+    def view_kwargs(self):
+        async def load(keys):
+            await asyncio.sleep(0.2)
+            return keys
+
+        def resolve(obj, info):
+            return info.context["loaders"]["values"].load("value")
+
+        schema = GraphQLSchema(
+            query=GraphQLObjectType(
+                name="QueryRoot",
+                fields={
+                    name: GraphQLField(GraphQLString, resolve=resolve)
+                    for name in ("a", "b")
+                },
+            )
+        )
+        return {
+            "schema": schema,
+            "execution_timeout": 0.05,
+            "loaders": {"values": lambda: DataLoader(load)},
+        }
+
+    @pytest.mark.asyncio
+    async def test_times_out_fields_sharing_a_load(self, client, url_builder):
+        response = await client.get(url_builder(query="{ a b }"))
+
+        assert response.status == 200
+        assert await response.json() == {
+            "data": {"a": None, "b": None},
+            "errors": [
+                {
+                    "message": "Execution timed out after 0.05 seconds.",
+                    "locations": [{"line": 1, "column": column}],
+                    "path": [name],
+                    "extensions": {"code": "EXECUTION_TIMEOUT"},
+                }
+                for name, column in (("a", 3), ("b", 5))
+            ],
+        }
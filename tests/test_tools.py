@@ -0,0 +1,112 @@
+import gzip
+
+import pytest
+
+from aiohttp_graphql.compression import ResponseCompression
+from aiohttp_graphql.tools import GraphiQL, GraphQLPlayground, GraphQLVoyager
+from tests.schemas import Schema
+
+
+@pytest.fixture
+def tools():
+    return [
+        GraphiQL(),
+        GraphQLPlayground(url="/playground"),
+        GraphQLVoyager(template="<p>{{ endpoint }}</p>", max_age=60),
+    ]
+
+
+@pytest.fixture
+def view_kwargs(tools):
+    return {"schema": Schema, "route_path": "/api", "tools": tools}
+
+
+def test_templates_are_read_lazily(monkeypatch):
+    def fail(*args):
+        raise AssertionError("template read")
+
+    monkeypatch.setattr("builtins.open", fail)
+
+    tool = GraphiQL()
+
+    assert tool.template_source is None
+
+
+@pytest.mark.asyncio
+async def test_serves_rendered_page(client, tools):
+    response = await client.get("/graphql/voyager")
+
+    assert response.status == 200
+    assert response.content_type == "text/html"
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+    assert response.headers["ETag"].startswith('W/"')
+    assert await response.text() == "<p>/api</p>"
+    assert tools[2].get_page() is tools[2].get_page()
+
+
+@pytest.mark.asyncio
+async def test_renders_page_for_endpoint(client, tools):
+    response = await client.get("/playground", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Cache-Control"] == "public, max-age=86400"
+    assert "/api" in await response.text()
+
+    tools[1].endpoint = "/other"
+    assert "/other" in tools[1].get_page().body.decode()
+
+
+@pytest.mark.asyncio
+async def test_serves_gzipped_page(client, tools):
+    response = await client.get(
+        "/graphql/graphiql", headers={"Accept-Encoding": "gzip"}
+    )
+    page = tools[0].get_page()
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert int(response.headers["Content-Length"]) == len(page.gzipped)
+    assert gzip.decompress(page.gzipped) == page.body
+    assert await response.read() == page.body
+
+    response = await client.get(
+        "/graphql/graphiql", headers={"Accept-Encoding": "identity"}
+    )
+    assert "Content-Encoding" not in response.headers
+    assert await response.read() == tools[0].get_page().body
+
+
+@pytest.mark.asyncio
+async def test_answers_if_none_match_with_304(client):
+    response = await client.get("/graphql/graphiql")
+    etag = response.headers["ETag"]
+
+    response = await client.get("/graphql/graphiql", headers={"If-None-Match": etag})
+    assert response.status == 304
+    assert response.headers["ETag"] == etag
+
+    response = await client.get(
+        "/graphql/graphiql", headers={"If-None-Match": etag[2:]}
+    )
+    assert response.status == 304
+
+
+class TestEndpointTool:
+    @pytest.fixture
+    def view_kwargs(self):
+        return {
+            "schema": Schema,
+            "tool": GraphiQL(),
+            "compression": ResponseCompression(min_size=10),
+        }
+
+    @pytest.mark.asyncio
+    async def test_endpoint_page_is_not_cached(self, client):
+        response = await client.get(
+            "/graphql", headers={"Accept": "*/*", "Accept-Encoding": "gzip"}
+        )
+
+        assert response.status == 200
+        assert response.content_type == "text/html"
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert response.headers.getall("Vary") == ["Accept, Accept-Encoding"]
+        assert "ETag" not in response.headers
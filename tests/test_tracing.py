@@ -0,0 +1,119 @@
+import asyncio
+
+from graphql import build_schema
+from graphql.execution import MiddlewareManager
+
+import pytest
+
+from aiohttp_graphql import GraphQLView, extend_middleware
+
+TracedSchema = build_schema(
+    """
+    type Item {
+      name: String
+    }
+
+    type Query {
+      hello: String
+      items: [Item]
+      slow: String
+    }
+    """
+)
+
+
+class Root:
+    def hello(self, info):
+        return "world"
+
+    def items(self, info):
+        return [{"name": "a"}, {"name": "b"}]
+
+    async def slow(self, info):
+        await asyncio.sleep(0.01)
+        return "slow"
+
+
+class TestTracing:
+    @pytest.fixture
+    def view_kwargs(self):
+        return {"schema": TracedSchema, "root_value": Root(), "tracing": True}
+
+    @pytest.mark.asyncio
+    async def test_returns_trace_in_extensions(self, client, url_builder):
+        response = await client.get(url_builder(query="{ hello items { name } }"))
+        body = await response.json()
+        trace = body["extensions"]["tracing"]
+
+        assert body["data"] == {
+            "hello": "world",
+            "items": [{"name": "a"}, {"name": "b"}],
+        }
+        assert trace["version"] == 1
+        assert trace["startTime"].endswith("Z")
+        assert trace["duration"] >= trace["validation"]["duration"]
+        assert trace["parsing"]["startOffset"] <= trace["validation"]["startOffset"]
+        resolvers = trace["execution"]["resolvers"]
+        assert [resolver["path"] for resolver in resolvers] == [
+            ["hello"],
+            ["items"],
+            ["items", 0, "name"],
+            ["items", 1, "name"],
+        ]
+        assert resolvers[2] == {
+            "path": ["items", 0, "name"],
+            "parentType": "Item",
+            "fieldName": "name",
+            "returnType": "String",
+            "startOffset": resolvers[2]["startOffset"],
+            "duration": resolvers[2]["duration"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_times_async_resolvers(self, client, url_builder):
+        response = await client.get(url_builder(query="{ slow }"))
+        trace = (await response.json())["extensions"]["tracing"]
+
+        (resolver,) = trace["execution"]["resolvers"]
+        assert resolver["duration"] >= 10_000_000
+        assert trace["duration"] >= resolver["startOffset"] + resolver["duration"]
+
+    @pytest.mark.asyncio
+    async def test_no_trace_for_invalid_operations(self, client, url_builder):
+        response = await client.get(url_builder(query="{ unknown }"))
+
+        assert "extensions" not in await response.json()
+
+
+class TestTraceCallback:
+    @pytest.fixture
+    def traces(self):
+        return []
+
+    @pytest.fixture
+    def view_kwargs(self, traces):
+        async def on_trace(trace):
+            traces.append(trace)
+
+        return {"schema": TracedSchema, "root_value": Root(), "on_trace": on_trace}
+
+    @pytest.mark.asyncio
+    async def test_passes_trace_to_callback(self, client, url_builder, traces):
+        response = await client.get(url_builder(query="{ hello }"))
+
+        assert await response.json() == {"data": {"hello": "world"}}
+        (trace,) = traces
+        assert trace["execution"]["resolvers"][0]["path"] == ["hello"]
+
+
+def test_tracing_is_disabled_by_default():
+    view = GraphQLView(schema=TracedSchema)
+
+    assert not view.tracing and view.on_trace is None
+
+
+def test_extend_middleware():
+    assert extend_middleware(None, []) is None
+    assert extend_middleware(None, [len]) == [len]
+    assert extend_middleware([str], [len]) == [str, len]
+    assert extend_middleware(MiddlewareManager(str), [len]).middlewares == (str, len)
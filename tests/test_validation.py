@@ -0,0 +1,253 @@
+import time
+
+from graphql import build_schema, parse, specified_rules, validate
+
+import pytest
+
+from aiohttp_graphql import GraphQLView
+from aiohttp_graphql.cache import DocumentCache
+from aiohttp_graphql.persisted import QueryAllowlist
+from aiohttp_graphql.validation import (
+    CostModel,
+    max_aliases_rule,
+    max_cost_rule,
+    max_depth_rule,
+)
+
+UserSchema = build_schema(
+    """
+    type User {
+      name: String
+      friends(first: Int): [User]
+    }
+
+    type Query {
+      user: User
+      users(limit: Int): [User]
+    }
+    """
+)
+
+
+def check(query, rule):
+    return [
+        error.message
+        for error in validate(UserSchema, parse(query), list(specified_rules) + [rule])
+    ]
+
+
+def cost(query, cost_model=None):
+    costs = []
+    validate(
+        UserSchema, parse(query), [max_cost_rule(None, cost_model, costs.append)],
+    )
+    return costs[0]
+
+
+def test_limits_depth():
+    rule = max_depth_rule(3)
+
+    assert check("{ user { friends { name } } }", rule) == []
+    assert check("{ user { friends { friends { name } } } }", rule) == [
+        "Query depth of 4 exceeds the maximum of 3."
+    ]
+
+
+def test_limits_depth_through_fragments():
+    query = """
+    { user { ...Friends } }
+    fragment Friends on User { friends { ... on User { friends { name } } } }
+    """
+
+    assert check(query, max_depth_rule(3)) == [
+        "Query depth of 4 exceeds the maximum of 3."
+    ]
+
+
+def test_ignores_introspection_depth():
+    query = "{ __schema { types { fields { type { ofType { name } } } } } }"
+
+    assert check(query, max_depth_rule(1)) == []
+
+
+def test_limits_aliases():
+    rule = max_aliases_rule(2)
+
+    assert check("{ a: user { name } b: user { name } }", rule) == []
+    assert check("{ a: user { n: name } b: user { name } c: user { name } }", rule) == [
+        "Query has 4 aliases, exceeding the maximum of 2."
+    ]
+
+
+def test_computes_cost():
+    assert cost("{ user { name } }") == 2
+    assert cost("{ users(limit: 10) { name } }") == 20
+    assert cost("{ users(limit: 10) { friends(first: 5) { name } } }") == 110
+    assert cost("query ($n: Int = 3) { users(limit: $n) { name } }") == 6
+    assert cost("query ($n: Int) { users(limit: $n) { name } }") == 2
+    assert cost("{ a: user { name } b: user { name } }") == 4
+    assert cost("{ __typename user { __typename } }") == 1
+
+
+def test_computes_cost_with_cost_model():
+    cost_model = CostModel(
+        field_costs={"Query.users": 5, "User.name": 0}, default_list_size=50
+    )
+
+    assert cost("{ users(limit: 10) { name } }", cost_model) == 50
+    assert cost("query ($n: Int) { users(limit: $n) { name } }", cost_model) == 250
+
+
+def test_computes_cost_of_the_costliest_operation():
+    query = """
+    query cheap { user { name } }
+    query costly { users(limit: 10) { ...Name } }
+    fragment Name on User { name }
+    """
+
+    assert cost(query) == 20
+
+
+def test_limits_cost():
+    rule = max_cost_rule(100)
+
+    assert check("{ users(limit: 50) { name } }", rule) == []
+    assert check("{ users(limit: 51) { name } }", rule) == [
+        "Query cost of 102 exceeds the maximum of 100."
+    ]
+
+
+def test_fragments_spread_repeatedly_are_walked_once():
+    fragments = ["fragment F0 on User { name }"]
+    for i in range(1, 40):
+        fragments.append(
+            "fragment F{} on User {{ a: friends {{ ...F{} }} "
+            "b: friends {{ ...F{} }} }}".format(i, i - 1, i - 1)
+        )
+    query = "{ user { ...F39 } }\n" + "\n".join(fragments)
+    document = parse(query)
+
+    start = time.perf_counter()
+    errors = validate(
+        UserSchema,
+        document,
+        [max_depth_rule(10), max_aliases_rule(10), max_cost_rule(10)],
+    )
+
+    assert time.perf_counter() - start < 1
+    assert [error.message for error in errors] == [
+        "Query depth of 41 exceeds the maximum of 10.",
+        "Query has {} aliases, exceeding the maximum of 10.".format(2 ** 40 - 2),
+        "Query cost of {} exceeds the maximum of 10.".format(2 ** 40 + 2 ** 39 - 1),
+    ]
+
+
+def test_fragment_cycles_terminate():
+    query = """
+    { user { ...A } }
+    fragment A on User { friends { ...B } }
+    fragment B on User { friends { ...A } }
+    """
+
+    assert cost(query) == 3
+
+
+class TestViewLimits:
+    @pytest.fixture
+    def view(self):
+        return GraphQLView(
+            schema=UserSchema,
+            root_value={"users": lambda info, limit: []},
+            document_cache=DocumentCache(),
+            max_depth=3,
+            max_aliases=2,
+            max_cost=100,
+        )
+
+    @pytest.fixture
+    def view_kwargs(self, view):
+        return {"instance": view}
+
+    @pytest.mark.asyncio
+    async def test_rejects_operations_over_the_limits(self, client, url_builder):
+        response = await client.get(
+            url_builder(query="{ user { friends { friends { name } } } }")
+        )
+        assert response.status == 400
+        assert await response.json() == {
+            "errors": [
+                {
+                    "message": "Query depth of 4 exceeds the maximum of 3.",
+                    "locations": [{"line": 1, "column": 1}],
+                }
+            ]
+        }
+
+        response = await client.get(
+            url_builder(query="{ users(limit: 1000) { name } }")
+        )
+        assert response.status == 400
+        assert (await response.json())["errors"][0]["message"] == (
+            "Query cost of 2000 exceeds the maximum of 100."
+        )
+
+    @pytest.mark.asyncio
+    async def test_caches_the_cost_with_the_document(self, view, client, url_builder):
+        query = "{ users(limit: 10) { name } }"
+        response = await client.get(url_builder(query=query))
+
+        assert response.status == 200
+        assert await response.json() == {"data": {"users": []}}
+        assert view.document_cache.get(query).cost == 20
+
+
+def test_views_sharing_a_document_cache_apply_their_own_limits():
+    cache = DocumentCache()
+    unlimited = GraphQLView(schema=UserSchema, document_cache=cache)
+    limited = GraphQLView(schema=UserSchema, document_cache=cache, max_depth=1)
+    cached = unlimited.parse_document("{ user { name } }")
+
+    assert unlimited.validate_document(cached) == []
+    assert [error.message for error in limited.validate_document(cached)] == [
+        "Query depth of 2 exceeds the maximum of 1."
+    ]
+    assert unlimited.validate_document(cached) == []
+    assert cached.get_validation_errors(unlimited.validation_key) == []
+
+
+class TestAllowlistLimits:
+    @pytest.fixture
+    def view(self):
+        return GraphQLView(
+            schema=UserSchema,
+            root_value={"users": lambda info, limit: []},
+            allowlist=QueryAllowlist(
+                {
+                    "deep": "{ user { friends { friends { name } } } }",
+                    "cheap": "{ users(limit: 10) { name } }",
+                }
+            ),
+            max_depth=3,
+            max_cost=100,
+        )
+
+    @pytest.fixture
+    def view_kwargs(self, view):
+        return {"instance": view}
+
+    def test_applies_limits_when_preparing(self, view):
+        assert view.allowlist.get("cheap").cost == 20
+
+    @pytest.mark.asyncio
+    async def test_rejects_allowlisted_operations_over_the_limits(
+        self, client, url_builder
+    ):
+        response = await client.get(url_builder(documentId="deep"))
+
+        assert response.status == 400
+        assert (await response.json())["errors"][0]["message"] == (
+            "Query depth of 4 exceeds the maximum of 3."
+        )
+
+        response = await client.get(url_builder(documentId="cheap"))
+        assert await response.json() == {"data": {"users": []}}